@@ -0,0 +1,317 @@
+"""
+Pipeline de assets das imagens do img_coliseum
+O jogo decodificava os PNG/JPG em tamanho original e os redimensionava a cada
+execução. Este módulo gera, uma vez, as imagens já preparadas no tamanho usado
+pelo jogo (bolas redimensionadas com smoothscale e recortadas em círculo, com
+o atlas de rotação do giro; fundo e título redimensionados) como pixels brutos
+em .assets/, com um manifesto. O jogo carrega esses arquivos por mmap, sem
+decodificar nem redimensionar.
+
+Sem manifesto, ou com a origem alterada desde a geração (tamanho/mtime), a
+imagem é decodificada e preparada pelas mesmas funções (resultado idêntico) e
+gravada em .assets/ para as próximas execuções.
+
+Uso (na raiz do projeto, depois de adicionar ou trocar imagens):
+    python MarbleGames/assets.py
+
+Estrutura:
+    .assets/manifesto.json  -> imagens geradas e lista de times por pasta
+    .assets/<tipo>_<origem>_<hash do caminho>_<largura>x<altura>.<rgba|rgb>
+    (o atlas guarda os quadros girados um embaixo do outro)
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+
+import numpy as np
+import pygame
+
+PASTA_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASTA_ASSETS = os.environ.get("TOKAI_ASSETS", os.path.join(PASTA_PROJETO, ".assets"))
+VERSAO_MANIFESTO = 2  # Mudou a preparação do atlas: invalida as imagens geradas antes
+EXTENSOES_IMAGENS = (".png", ".jpg", ".jpeg")  # Imagens dos times aceitas na pasta
+SUPERAMOSTRAGEM = 4  # Resolução (x diâmetro) em que os quadros do atlas são girados
+VERSAO_PREPARACAO = 1  # Aumentar ao mudar as funções de preparação (máscara, filtros...)
+
+_manifesto = None  # Lido uma vez por processo
+
+
+def caminho_relativo(caminho):
+    """Caminho relativo à raiz do projeto (chave do manifesto)"""
+    return os.path.relpath(os.path.abspath(caminho), PASTA_PROJETO)
+
+
+def assinatura(caminho):
+    """(tamanho, mtime) de um arquivo ou pasta: detecta origens alteradas depois da geração"""
+    stat = os.stat(caminho)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+# ==================== PREPARAÇÃO DAS IMAGENS ====================
+
+def com_alpha(imagem):
+    """Imagem em 32 bits com alpha por pixel (smoothscale e as máscaras precisam)"""
+    if not imagem.get_flags() & pygame.SRCALPHA:
+        # Imagem sem alpha por pixel (ex.: JPG): cópia opaca em uma superfície com alpha
+        copia = pygame.Surface(imagem.get_size(), pygame.SRCALPHA, 32)
+        copia.blit(imagem, (0, 0))
+        return copia
+    if imagem.get_bitsize() != 32:
+        return imagem.convert(32, pygame.SRCALPHA)
+    return imagem
+
+
+def preparar_bola(imagem, raio):
+    """Redimensiona para o diâmetro da bola (smoothscale) e torna transparente o que fica fora do círculo"""
+    bola = pygame.transform.smoothscale(com_alpha(imagem), (raio * 2, raio * 2))
+
+    # Máscara circular pelo centro de cada pixel
+    centros = np.arange(raio * 2) + 0.5 - raio
+    fora = centros[:, None] ** 2 + centros[None, :] ** 2 > raio ** 2
+    alpha = pygame.surfarray.pixels_alpha(bola)
+    alpha[fora] = 0
+    del alpha  # Libera o lock da superfície
+    return bola
+
+
+def preparar_atlas(imagem, tamanho):
+    """
+    Atlas de rotação da bola: `quadros` ângulos em sentido horário, um embaixo do outro
+    tamanho: (raio, quadros); cada quadro é 2*raio x 2*raio, o quadro 0 é a imagem sem giro
+    A imagem é levada a um quadrado de SUPERAMOSTRAGEM vezes o diâmetro (como em
+    preparar_bola, que também a deixa quadrada), girada nessa resolução (o rotate do
+    pygame não filtra) e reduzida com smoothscale em preparar_bola. Girar a imagem
+    já quadrada mantém a forma em todos os quadros
+    """
+    raio, quadros = tamanho
+    lado = raio * 2
+    imagem = pygame.transform.smoothscale(com_alpha(imagem), (lado * SUPERAMOSTRAGEM, lado * SUPERAMOSTRAGEM))
+    atlas = pygame.Surface((lado, lado * quadros), pygame.SRCALPHA, 32)
+    for quadro in range(quadros):
+        girada = pygame.transform.rotate(imagem, -360 * quadro / quadros)
+        # O rotate aumenta a superfície: recorta o centro no tamanho original
+        recorte = imagem.get_rect(center=girada.get_rect().center)
+        atlas.blit(preparar_bola(girada.subsurface(recorte), raio), (0, quadro * lado))
+    return atlas
+
+
+def preparar_fundo(imagem, tamanho):
+    """Redimensiona o plano de fundo para o tamanho da tela (largura, altura)"""
+    return pygame.transform.scale(imagem, tuple(tamanho))
+
+
+def preparar_titulo(imagem, largura_maxima):
+    """Reduz o título para a largura máxima mantendo a proporção (imagens menores ficam como estão)"""
+    if largura_maxima and imagem.get_width() > largura_maxima:
+        nova_altura = int((imagem.get_height() * largura_maxima) / imagem.get_width())
+        imagem = pygame.transform.scale(imagem, (largura_maxima, nova_altura))
+    return imagem
+
+
+PREPARACOES = {"bola": preparar_bola, "atlas": preparar_atlas, "fundo": preparar_fundo, "titulo": preparar_titulo}
+
+
+# ==================== MANIFESTO E CARREGAMENTO ====================
+
+def parametros_preparacao(tipo):
+    """Parâmetros que mudam os pixels preparados além da origem e do tamanho"""
+    if tipo == "atlas":
+        return [VERSAO_PREPARACAO, SUPERAMOSTRAGEM]
+    return [VERSAO_PREPARACAO]
+
+
+def chave_imagem(tipo, origem, tamanho):
+    """
+    Chave de uma imagem preparada no manifesto (tamanho: raio, (raio, quadros), (largura, altura) ou largura máxima)
+    Inclui os parâmetros da preparação: imagens geradas com outros parâmetros não são reaproveitadas
+    """
+    return json.dumps([tipo, origem, tamanho, parametros_preparacao(tipo)])
+
+
+def ler_manifesto():
+    """Manifesto de .assets/ (vazio se não foi gerado ou é de outra versão)"""
+    global _manifesto
+    if _manifesto is None:
+        _manifesto = {}
+        try:
+            with open(os.path.join(PASTA_ASSETS, "manifesto.json")) as arquivo:
+                manifesto = json.load(arquivo)
+            if manifesto.get("versao") == VERSAO_MANIFESTO:
+                _manifesto = manifesto
+        except (OSError, ValueError):
+            pass
+    return _manifesto
+
+
+def ler_gerada(item):
+    """Superfície de uma imagem gerada, lida por mmap (copiada: o arquivo é fechado em seguida)"""
+    with open(os.path.join(PASTA_ASSETS, item["arquivo"]), "rb") as arquivo:
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            superficie = pygame.image.frombuffer(mapa, (item["largura"], item["altura"]), item["modo"])
+            pronta = converter(superficie)
+            del superficie  # Solta a referência ao mmap antes de fechá-lo
+    return pronta
+
+
+def converter(superficie):
+    """Converte para o formato de pixels da tela (blit sem conversão); sem tela, faz uma cópia"""
+    if pygame.display.get_surface() is None:
+        return superficie.copy()
+    if superficie.get_flags() & pygame.SRCALPHA:
+        return superficie.convert_alpha()
+    return superficie.convert()
+
+
+def carregar_imagem(caminho, tipo, tamanho):
+    """
+    Imagem pronta para blit: a gerada em .assets/ se estiver atualizada, senão
+    decodificada, preparada na hora (mesmo resultado) e gravada em .assets/
+    tipo: "bola" (tamanho = raio), "atlas" ((raio, quadros)), "fundo" ((largura, altura))
+    ou "titulo" (largura máxima)
+    """
+    chave = chave_imagem(tipo, caminho_relativo(caminho), tamanho)
+    item = ler_manifesto().get("imagens", {}).get(chave)
+    if item and item["assinatura"] == assinatura(caminho):
+        try:
+            return ler_gerada(item)
+        except (OSError, ValueError):
+            pass  # Arquivo gerado ausente ou truncado: prepara a partir da origem
+    imagem = PREPARACOES[tipo](pygame.image.load(caminho), tamanho)
+    try:
+        adicionar_ao_manifesto(chave, gravar_preparada(tipo, caminho, imagem))
+    except OSError as e:
+        print(f"⚠️ Não foi possível gravar {caminho} em {PASTA_ASSETS}: {e}")
+    return converter(imagem)
+
+
+def carregar_atlas(caminho, raio, quadros):
+    """Quadros girados da bola (lista de superfícies 2*raio x 2*raio, sentido horário)"""
+    atlas = carregar_imagem(caminho, "atlas", (raio, quadros))
+    lado = raio * 2
+    return [atlas.subsurface((0, quadro * lado, lado, lado)) for quadro in range(quadros)]
+
+
+def listar_imagens(pasta):
+    """
+    Imagens de times da pasta em ordem alfabética (caminhos com o prefixo `pasta`)
+    Usa a lista do manifesto enquanto a pasta não mudar; senão, uma listagem da pasta
+    """
+    times = ler_manifesto().get("times", {}).get(caminho_relativo(pasta))
+    try:
+        if times and times["assinatura"] == assinatura(pasta):
+            nomes = times["imagens"]
+        else:
+            nomes = sorted(nome for nome in os.listdir(pasta)
+                           if nome.endswith(EXTENSOES_IMAGENS) and not nome.startswith("."))
+    except OSError:
+        return []
+    return [os.path.join(pasta, nome) for nome in nomes]
+
+
+# ==================== GERAÇÃO ====================
+
+def escrever_atomico(caminho, escrever):
+    """Escreve em um temporário e troca de nome: outro processo lê o arquivo antigo ou o novo, nunca pela metade"""
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as arquivo:
+        escrever(arquivo)
+    os.replace(temporario, caminho)
+
+
+def gravar_preparada(tipo, caminho, imagem):
+    """Grava os pixels de uma imagem preparada em .assets/ e retorna o item do manifesto"""
+    os.makedirs(PASTA_ASSETS, exist_ok=True)
+    modo = "RGBA" if imagem.get_flags() & pygame.SRCALPHA else "RGB"
+    largura, altura = imagem.get_size()
+    # O hash do caminho separa imagens de mesmo nome em pastas diferentes
+    hash_caminho = hashlib.sha1(caminho_relativo(caminho).encode()).hexdigest()[:8]
+    arquivo = f"{tipo}_{os.path.basename(caminho)}_{hash_caminho}_{largura}x{altura}.{modo.lower()}"
+    escrever_atomico(os.path.join(PASTA_ASSETS, arquivo),
+                     lambda saida: saida.write(pygame.image.tobytes(imagem, modo)))
+    return {"arquivo": arquivo, "largura": largura, "altura": altura, "modo": modo,
+            "assinatura": assinatura(caminho)}
+
+
+def gravar_manifesto(manifesto):
+    """Grava o manifesto em .assets/ e passa a usá-lo neste processo"""
+    global _manifesto
+    escrever_atomico(os.path.join(PASTA_ASSETS, "manifesto.json"),
+                     lambda arquivo: arquivo.write(json.dumps(manifesto, indent=2).encode()))
+    _manifesto = manifesto
+
+
+def adicionar_ao_manifesto(chave, item):
+    """
+    Acrescenta uma imagem gerada na hora ao manifesto em disco
+    Relê o manifesto antes: outro processo pode ter acrescentado imagens (se duas
+    escritas se cruzarem, a imagem perdida só é gerada de novo na próxima execução)
+    """
+    global _manifesto
+    _manifesto = None
+    manifesto = ler_manifesto() or {"versao": VERSAO_MANIFESTO, "imagens": {}, "times": {}}
+    manifesto["imagens"][chave] = item
+    gravar_manifesto(manifesto)
+
+
+def construir(especificacoes, pastas_times):
+    """
+    Gera as imagens e o manifesto em .assets/ (substitui a geração anterior)
+    especificacoes: lista de (tipo, caminho da origem, tamanho)
+    pastas_times: pastas cuja lista de imagens vai para o manifesto
+    """
+    os.makedirs(PASTA_ASSETS, exist_ok=True)
+    for nome in os.listdir(PASTA_ASSETS):
+        if nome.endswith((".rgba", ".rgb")):
+            os.remove(os.path.join(PASTA_ASSETS, nome))
+
+    manifesto = {"versao": VERSAO_MANIFESTO, "imagens": {}, "times": {}}
+    for pasta in pastas_times:
+        if os.path.isdir(pasta):
+            manifesto["times"][caminho_relativo(pasta)] = {
+                "assinatura": assinatura(pasta),
+                "imagens": [os.path.basename(caminho) for caminho in listar_imagens(pasta)],
+            }
+    for tipo, caminho, tamanho in especificacoes:
+        if not os.path.exists(caminho):
+            print(f"⚠️ Origem não encontrada: {caminho}")
+            continue
+        imagem = PREPARACOES[tipo](pygame.image.load(caminho), tamanho)
+        item = gravar_preparada(tipo, caminho, imagem)
+        manifesto["imagens"][chave_imagem(tipo, caminho_relativo(caminho), tamanho)] = item
+        print(f"  {item['arquivo']}")
+
+    gravar_manifesto(manifesto)
+    return manifesto
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera as imagens preparadas do img_coliseum em .assets/')
+    parser.add_argument('--raio', type=int, action='append',
+                        help='Raio das bolas a gerar (repetível; padrão: RAIO_BOLA do jogo)')
+    args = parser.parse_args()
+
+    import img_coliseum as jogo
+
+    pasta_times = os.path.join(PASTA_PROJETO, jogo.PASTA_IMAGENS)
+    especificacoes = []
+    for caminho in listar_imagens(pasta_times):
+        for raio in args.raio or [jogo.RAIO_BOLA]:
+            especificacoes.append(("bola", caminho, raio))
+            if jogo.USAR_GIRO:
+                especificacoes.append(("atlas", caminho, (raio, jogo.QUADROS_GIRO)))
+    if jogo.USAR_PLANO_FUNDO:
+        especificacoes.append(("fundo", os.path.join(PASTA_PROJETO, jogo.CAMINHO_PLANO_FUNDO),
+                               (jogo.LARGURA, jogo.ALTURA)))
+    if jogo.USAR_TITULO:
+        especificacoes.append(("titulo", os.path.join(PASTA_PROJETO, jogo.CAMINHO_TITULO), jogo.LARGURA - 40))
+
+    print(f"Gerando {len(especificacoes)} imagens em {PASTA_ASSETS}...")
+    manifesto = construir(especificacoes, [pasta_times])
+    print(f"✅ Manifesto com {len(manifesto['imagens'])} imagens")
+
+
+if __name__ == "__main__":
+    main()
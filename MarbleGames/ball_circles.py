@@ -1,12 +1,18 @@
+import render_mode  # Antes do pygame: configura o driver SDL do modo headless
 import pygame
 import math
 import sys
 import random
 import os
 import time
+import frame_sink
+import physics
+import replay
+import ring_pool
+import simulation
+import sprite_cache
 
 finalizar_gravacao = False
-game_start_time = None
 
 def random_color():
     return (random.randint(80, 255), random.randint(80, 255), random.randint(80, 255))
@@ -14,22 +20,20 @@ def random_color():
 def random_confirm():
     return random.choice([True, False])
 
-# Inicialização do Pygame
-pygame.init()
-
 # ==================== CONFIGURAÇÕES DA JANELA ====================
 LARGURA = 480  # Largura da janela
 ALTURA = 854    # Altura da janela
-TELA = pygame.display.set_mode((LARGURA, ALTURA))
-pygame.display.set_caption("Efeito Interativo de Bolas - Sistema de Cores")
+TELA = None            # Criada por iniciar_tela() (o modo simulação não abre janela)
+DESTINO_FRAMES = None  # Criado por iniciar_tela(); None = gravação por captura de tela
 
 # ==================== SISTEMA DE CORES (CONFIGURÁVEIS) ====================
 # Configurações de randomização
-RANDOMIZAR_COR_BOLA = random_confirm()        # True = cor aleatória, False = cor específica
-RANDOMIZAR_COR_CONTORNO = random_confirm()    # True = cor aleatória, False = cor específica/lista
+# (sorteadas por sortear_configuracao() no início da partida)
+RANDOMIZAR_COR_BOLA = None        # True = cor aleatória, False = cor específica
+RANDOMIZAR_COR_CONTORNO = None    # True = cor aleatória, False = cor específica/lista
 
 # Cor específica da bola (usada quando RANDOMIZAR_COR_BOLA = False)
-COR_BOLA = random_color()  # Vermelho - cor padrão da bola
+COR_BOLA = None  # Vermelho - cor padrão da bola (sorteada)
 
 # Cores específicas dos contornos (usadas quando RANDOMIZAR_COR_CONTORNO = False)
 # Pode ser uma cor única ou uma lista de cores para alternar
@@ -76,75 +80,42 @@ INTERVALO_CRIACAO = 2                # Intervalo em frames para criar novos cont
 # ==================== TIMER CONFIGURATION ====================
 GAME_DURATION = 30  # 30 seconds
 
-class Bola:
-    """Classe que representa uma bola no jogo"""
+def iniciar_tela():
+    """Inicializa o pygame, a janela (ou a tela headless) e o destino de frames"""
+    global TELA, DESTINO_FRAMES
+    pygame.init()
+    TELA = pygame.display.set_mode((LARGURA, ALTURA))
+    pygame.display.set_caption("Efeito Interativo de Bolas - Sistema de Cores")
+    DESTINO_FRAMES = frame_sink.criar_destino_frames(LARGURA, ALTURA)  # None = gravação por captura de tela
+
+def sortear_configuracao():
+    """
+    Sorteia as configurações aleatórias do jogo (randomização e cor da bola)
+    Chamada depois da semente, antes da partida: mesma ordem de sorteios da
+    antiga inicialização do módulo, então a mesma semente gera a mesma partida
+    """
+    global RANDOMIZAR_COR_BOLA, RANDOMIZAR_COR_CONTORNO, COR_BOLA
+    RANDOMIZAR_COR_BOLA = random_confirm()
+    RANDOMIZAR_COR_CONTORNO = random_confirm()
+    COR_BOLA = random_color()
+
+def criar_sistema_bolas(capacidade=1):
+    """Cria o núcleo de física das bolas com as constantes deste jogo"""
+    return physics.SistemaBolas(capacidade, LARGURA, ALTURA, GRAVIDADE, FORCA_QUIQUE,
+                                ACELERACAO_QUIQUE, VELOCIDADE_MAXIMA)
+
+class Bola(physics.BolaSistema):
+    """Classe que representa uma bola no jogo (a física fica no SistemaBolas)"""
     
-    def __init__(self, x, y, cor):
+    def __init__(self, sistema, x, y, cor):
         """
         Inicializa uma bola
-        x, y: posição inicial da bola
+        sistema: SistemaBolas que guarda posição, velocidade e quiques da bola
+        x, y: posição inicial da bola (velocidade inicial zero)
         cor: cor da bola (RGB)
         """
-        self.x = x
-        self.y = y
-        self.vx = 0  # Velocidade horizontal inicial
-        self.vy = 0  # Velocidade vertical inicial
-        self.raio = RAIO_BOLA
+        super().__init__(sistema, x, y, RAIO_BOLA)
         self.cor = cor
-        self.quiques = 0  # Contador de quiques para acelerar
-    
-    def atualizar(self):
-        """Atualiza a posição da bola aplicando física"""
-        # Aplica gravidade à velocidade vertical
-        self.vy += GRAVIDADE
-        
-        # Limita a velocidade máxima para evitar bolas muito rápidas
-        velocidade_atual = math.sqrt(self.vx**2 + self.vy**2)
-        if velocidade_atual > VELOCIDADE_MAXIMA:
-            fator_limitacao = VELOCIDADE_MAXIMA / velocidade_atual
-            self.vx *= fator_limitacao
-            self.vy *= fator_limitacao
-        
-        # Atualiza a posição baseada na velocidade
-        self.x += self.vx
-        self.y += self.vy
-        
-        # Verifica colisão com as bordas da tela
-        self._colisao_bordas()
-    
-    def _colisao_bordas(self):
-        """Verifica e resolve colisões com as bordas da tela"""
-        # Borda esquerda
-        if self.x - self.raio <= 0:
-            self.x = self.raio
-            self.vx = -self.vx * FORCA_QUIQUE
-            self._acelerar_apos_quique()
-        
-        # Borda direita
-        elif self.x + self.raio >= LARGURA:
-            self.x = LARGURA - self.raio
-            self.vx = -self.vx * FORCA_QUIQUE
-            self._acelerar_apos_quique()
-        
-        # Borda superior
-        if self.y - self.raio <= 0:
-            self.y = self.raio
-            self.vy = -self.vy * FORCA_QUIQUE
-            self._acelerar_apos_quique()
-        
-        # Borda inferior
-        elif self.y + self.raio >= ALTURA:
-            self.y = ALTURA - self.raio
-            self.vy = -self.vy * FORCA_QUIQUE
-            self._acelerar_apos_quique()
-    
-    def _acelerar_apos_quique(self):
-        """Acelera a bola após um quique"""
-        self.quiques += 1
-        # Aplica aceleração gradual, mas limitada
-        if self.quiques <= 15:  # Limita a quantidade de acelerações
-            self.vx *= ACELERACAO_QUIQUE
-            self.vy *= ACELERACAO_QUIQUE
     
     def colisao_com_contorno(self, contorno):
         """
@@ -189,55 +160,33 @@ class Bola:
         """Desenha a bola na tela"""
         pygame.draw.circle(tela, self.cor, (int(self.x), int(self.y)), self.raio)
 
-class Contorno:
-    """Classe que representa um contorno circular móvel e colorido"""
-    
-    def __init__(self, x, y, raio_inicial, cor):
-        """
-        Inicializa um contorno
-        x, y: posição inicial do contorno
-        raio_inicial: raio inicial do contorno
-        cor: cor do contorno (RGB)
-        """
-        self.x = x
-        self.y = y
-        self.raio = raio_inicial
-        self.raio_inicial = raio_inicial
-        self.ativo = True
-        self.alpha = 255
-        self.destruido = False
-        self.cor = cor
-    
-    def atualizar(self):
-        """Atualiza o contorno (diminuição de tamanho apenas)"""
-        if self.ativo and not self.destruido:
-            # Diminui o raio gradualmente
-            self.raio -= VELOCIDADE_DIMINUICAO
-            
-            # Se o raio ficou muito pequeno, desativa o contorno
-            if self.raio <= RAIO_MINIMO_CONTORNO:
-                self.ativo = False
-        
-        # Se foi destruído, aplica efeito fade
-        if self.destruido:
-            self.alpha -= 15  # Velocidade do fade
-            if self.alpha <= 0:
-                self.ativo = False
+# Anéis dos contornos em fade já desenhados, por (raio, espessura, cor)
+SPRITES_CONTORNO = sprite_cache.CacheSprites()
 
+def criar_pool_contornos():
+    """
+    Cria o pool de contornos com as constantes deste jogo
+    A capacidade sai das constantes atuais (simulate e o sweep podem trocá-las)
+    """
+    capacidade = ring_pool.capacidade_necessaria(QUANTIDADE_CONTORNOS_SIMULTANEOS, INTERVALO_CRIACAO)
+    return ring_pool.PoolContornos(capacidade, RAIO_MINIMO_CONTORNO, VELOCIDADE_DIMINUICAO,
+                                   classe_contorno=Contorno)
+
+class Contorno(ring_pool.ContornoPool):
+    """
+    Contorno circular colorido; os dados (posição, raio, alpha, cor) ficam no
+    PoolContornos, que também faz a diminuição e o fade em lote
+    """
     
-    def destruir(self):
-        """Marca o contorno para ser destruído com efeito fade"""
-        self.destruido = True
+    __slots__ = ()
     
     def desenhar(self, tela):
         """Desenha o contorno na tela com sua cor específica"""
         if self.ativo and self.raio > 0:
             if self.destruido:
-                # Desenha com transparência se está sendo destruído
-                superficie_temp = pygame.Surface((self.raio * 2 + 20, self.raio * 2 + 20), pygame.SRCALPHA)
-                pygame.draw.circle(superficie_temp, (*self.cor, max(0, self.alpha)), 
-                                 (self.raio + 10, self.raio + 10), int(self.raio), ESPESSURA_CONTORNO)
-                tela.blit(superficie_temp, (self.x - self.raio - 10, self.y - self.raio - 10))
+                # Desenha com transparência se está sendo destruído (sprite do cache, alpha no blit)
+                SPRITES_CONTORNO.desenhar_anel(tela, self.x, self.y, self.raio, ESPESSURA_CONTORNO,
+                                               self.cor, max(0, int(self.alpha)))
             else:
                 # Desenha normalmente com sua cor
                 pygame.draw.circle(tela, self.cor, (int(self.x), int(self.y)), int(self.raio), ESPESSURA_CONTORNO)
@@ -274,29 +223,28 @@ class GeradorContornos:
     def atualizar(self, contornos):
         """
         Atualiza o gerador e cria novos contornos quando necessário
-        contornos: lista atual de contornos
+        contornos: PoolContornos do jogo
+        Retorna o contorno criado neste frame (ou None)
         """
         self.contador_frames += 1
         
         # Verifica se é hora de criar um novo contorno
         if self.contador_frames >= INTERVALO_CRIACAO:
-            # Conta quantos contornos ativos existem
-            contornos_ativos = [c for c in contornos if c.ativo and not c.destruido]
-            
-            # Se há menos contornos que o máximo, cria um novo
-            if len(contornos_ativos) < QUANTIDADE_CONTORNOS_SIMULTANEOS:
+            # Se há menos contornos vivos que o máximo, cria um novo (contagem O(1) do pool)
+            if contornos.quantidade_vivos < QUANTIDADE_CONTORNOS_SIMULTANEOS:
                 # Obtém a cor do contorno
                 cor_contorno = self._obter_cor_contorno()
                 
-                # Cria novo contorno no centro
-                novo_contorno = Contorno(self.centro_x, self.centro_y, self.proximo_raio, cor_contorno)
-                contornos.append(novo_contorno)
+                # Cria novo contorno no centro (reaproveita um slot livre do pool)
+                novo_contorno = contornos.criar(self.centro_x, self.centro_y, self.proximo_raio, cor=cor_contorno)
                 
                 # Incrementa o raio para o próximo contorno
                 self.proximo_raio += 40
                 
                 # Reseta o contador
                 self.contador_frames = 0
+                return novo_contorno
+        return None
 
 def obter_cor_bola():
     """
@@ -310,13 +258,14 @@ def obter_cor_bola():
         # Cor específica
         return COR_BOLA
 
-def check_timer():
-    """Verifica se o timer de 30 segundos terminou"""
-    global game_start_time, finalizar_gravacao
-    if game_start_time is None:
-        return False
+def check_timer(relogio):
+    """
+    Verifica se o timer de 30 segundos terminou
+    relogio: RelogioJogo do loop principal (conta frames no modo rápido)
+    """
+    global finalizar_gravacao
     
-    elapsed_time = time.time() - game_start_time
+    elapsed_time = relogio.tempo_decorrido()
     seconds_passed = int(elapsed_time)
     print(f"Tempo decorrido: {seconds_passed} segundos")
     
@@ -325,34 +274,125 @@ def check_timer():
         return True
     return False
 
-def main():
-    """Função principal do jogo"""
-    global game_start_time, finalizar_gravacao
+class Partida:
+    """
+    Estado e regras de uma partida (bola, contornos, gerador e colisões), sem desenho
+    Usada pelo main, que desenha cada frame, e pelo simulate, que só registra os eventos
+    """
     
-    # Inicializa o timer
-    game_start_time = time.time()
-    print("Jogo iniciado! Timer de 30 segundos começou.")
+    def __init__(self, linha_do_tempo=None):
+        """linha_do_tempo: LinhaDoTempo que recebe os eventos (None = não registra)"""
+        self.linha_do_tempo = linha_do_tempo
+        self.frame = 0
+        self.contornos_destruidos = 0
+        
+        # Inicializa o pool de contornos (vazio)
+        self.contornos = criar_pool_contornos()
+        
+        # Cria o gerador de contornos infinitos
+        self.gerador = GeradorContornos()
+        
+        # Calcula o centro da tela para posicionar a bola
+        centro_x = LARGURA // 2 + 30
+        centro_y = ALTURA // 2
+        
+        # Cria UMA ÚNICA bola no centro da tela
+        self.sistema_bolas = criar_sistema_bolas()
+        cor_bola = obter_cor_bola()
+        self.bola = Bola(self.sistema_bolas, centro_x, centro_y, cor_bola)
+        
+        # Dá uma pequena velocidade inicial para a bola se mover
+        self.bola.vx = random.uniform(-3, 3)
+        self.bola.vy = random.uniform(-3, 3)
+    
+    def registrar(self, tipo, entidades=(), x=None, y=None):
+        """Registra um evento do frame atual na linha do tempo (se houver)"""
+        if self.linha_do_tempo is not None:
+            self.linha_do_tempo.registrar(self.frame, tipo, entidades, x, y)
+    
+    def tempo_decorrido(self):
+        """Tempo de jogo em segundos (passo fixo: frames / FPS_JOGO)"""
+        return self.frame / render_mode.FPS_JOGO
+    
+    def avancar(self):
+        """Avança um frame: gerador de contornos e física em subpassos"""
+        bola = self.bola
+        
+        # Atualiza o gerador de contornos
+        novo_contorno = self.gerador.atualizar(self.contornos)
+        if novo_contorno is not None:
+            self.registrar("contorno_criado", (novo_contorno.ordem,), novo_contorno.x, novo_contorno.y)
+        
+        # Física em subpassos (TOKAI_SUBPASSOS): cada um avança PASSO_FISICA do frame,
+        # para mais precisão na trajetória sem aumentar o FPS
+        for _ in range(render_mode.SUBPASSOS):
+            # Atualiza a bola (gravidade, velocidade máxima e bordas em lote)
+            self.sistema_bolas.atualizar(render_mode.PASSO_FISICA)
+            
+            # Atualiza contornos (diminuição, fade e liberação dos slots em lote)
+            self.contornos.atualizar(render_mode.PASSO_FISICA)
+            
+            # Verifica colisões: o teste do anel é feito em lote para todos os contornos
+            # e só os contornos em contato são resolvidos, na ordem da lista
+            contornos_vivos = self.contornos.vivos()
+            # Bolas rápidas que atravessaram um contorno no passo voltam ao ponto de contato
+            corrigidas, t_contato = physics.corrigir_tunelamento(self.sistema_bolas, contornos_vivos,
+                                                                 ESPESSURA_CONTORNO)
+            for contorno in physics.contatos_em_ordem([bola], contornos_vivos, ESPESSURA_CONTORNO):
+                if bola.colisao_com_contorno(contorno):
+                    contorno.destruir()
+                    self.contornos_destruidos += 1
+                    self.registrar("contorno_destruido", (bola.indice, contorno.ordem), bola.x, bola.y)
+            # ... e depois do quique andam o que faltava do passo
+            physics.avancar_restante(self.sistema_bolas, corrigidas, t_contato, render_mode.PASSO_FISICA)
+        
+        self.frame += 1
+
+def desenhar_partida(tela, partida):
+    """Desenha um frame da partida (fundo, contornos e bola)"""
+    # Limpa a tela com cor de fundo preta
+    tela.fill(COR_FUNDO)
+    
+    # Desenha todos os contornos
+    for contorno in partida.contornos.ativos():
+        contorno.desenhar(tela)
+    
+    # Desenha a bola
+    partida.bola.desenhar(tela)
+
+def criar_reproducao(gravacao):
+    """
+    Prepara o redesenho de um replay (replay.py) com o desenho do jogo, sem física
+    gravacao: replay.Replay desta partida (constantes do jogo já restauradas)
+    Retorna (desenhar_frame(tela, indice), reproduzir_tela); este jogo não tem telas fora da partida
+    """
+    partida = Partida()
     
-    # Inicializa o relógio para controlar FPS
-    clock = pygame.time.Clock()
+    def desenhar_frame(tela, indice):
+        gravacao.restaurar_bolas(indice, [partida.bola])
+        gravacao.restaurar_contornos(indice, partida.contornos)
+        desenhar_partida(tela, partida)
     
-    # Inicializa lista de contornos vazia
-    contornos = []
+    return desenhar_frame, None
+
+def main():
+    """Função principal do jogo"""
+    global finalizar_gravacao
     
-    # Cria o gerador de contornos infinitos
-    gerador = GeradorContornos()
+    iniciar_tela()
+    sortear_configuracao()
     
-    # Calcula o centro da tela para posicionar a bola
-    centro_x = LARGURA // 2 + 30
-    centro_y = ALTURA // 2
+    # Inicializa o relógio para controlar FPS (também é o timer do jogo)
+    relogio = render_mode.RelogioJogo()
+    print("Jogo iniciado! Timer de 30 segundos começou.")
     
-    # Cria UMA ÚNICA bola no centro da tela
-    cor_bola = obter_cor_bola()
-    bola = Bola(centro_x, centro_y, cor_bola)
+    # Cria a partida: bola no centro, pool de contornos vazio e gerador
+    partida = Partida()
+    bola = partida.bola
     
-    # Dá uma pequena velocidade inicial para a bola se mover
-    bola.vx = random.uniform(-3, 3)
-    bola.vy = random.uniform(-3, 3)
+    # Replay do estado de cada frame (TOKAI_REPLAY, execute.py --replay)
+    gravador = replay.criar_gravador(sys.modules[__name__], [bola], partida.contornos,
+                                     campos=("tempo", "contornos_destruidos"))
     
     print("Aplicativo iniciado com sistema de cores personalizado!")
     print(f"CONFIGURAÇÕES:")
@@ -367,13 +407,11 @@ def main():
             print(f"- Cor dos contornos: {CORES_CONTORNO}")
     print("Pressione ESC ou feche a janela para sair")
     
-    contornos_destruidos = 0
-    
     # Loop principal do jogo
     rodando = True
     while rodando:
         # Verifica o timer
-        if check_timer():
+        if check_timer(relogio):
             print("Tempo esgotado! Finalizando jogo...")
             rodando = False
             break
@@ -390,50 +428,52 @@ def main():
                     if RANDOMIZAR_COR_BOLA:
                         bola.cor = obter_cor_bola()
         
-        # Atualiza o gerador de contornos
-        gerador.atualizar(contornos)
-        
-        # Atualiza a bola
-        bola.atualizar()
-        
-        # Atualiza contornos e verifica colisões
-        contornos_restantes = []
-        for contorno in contornos:
-            contorno.atualizar()
-            
-            # Verifica colisão com a bola
-            if contorno.ativo and not contorno.destruido and bola.colisao_com_contorno(contorno):
-                contorno.destruir()
-                contornos_destruidos += 1
-            
-            # Mantém contornos que ainda estão ativos
-            if contorno.ativo:
-                contornos_restantes.append(contorno)
-        
-        # Atualiza lista de contornos
-        contornos = contornos_restantes
+        # Gerador de contornos, física e colisões
+        partida.avancar()
         
         # ==================== DESENHO ====================
-        # Limpa a tela com cor de fundo preta
-        TELA.fill(COR_FUNDO)
-        
-        # Desenha todos os contornos
-        for contorno in contornos:
-            contorno.desenhar(TELA)
-        
-        # Desenha a bola
-        bola.desenhar(TELA)
+        # Frames descartados pela conversão para o FPS do vídeo não são desenhados
+        if DESTINO_FRAMES is None or DESTINO_FRAMES.precisa_frame():
+            desenhar_partida(TELA, partida)
 
-        # Atualiza a tela
-        pygame.display.update()
-        clock.tick(60)
+            # Atualiza a tela
+            pygame.display.update()
+        if DESTINO_FRAMES:
+            DESTINO_FRAMES.enviar(TELA)
+        if gravador:
+            gravador.gravar(tempo=partida.tempo_decorrido(), contornos_destruidos=partida.contornos_destruidos)
+        relogio.tick()
     
     # Finaliza o Pygame
     pygame.quit()
-    print(f"Aplicativo finalizado! Contornos destruídos: {contornos_destruidos}")
+    print(f"Aplicativo finalizado! Contornos destruídos: {partida.contornos_destruidos}")
     finalizar_gravacao = True
     sys.exit()
 
+def simulate(seed, params=None, verbose=False):
+    """
+    Simula uma partida só com física e regras (sem janela nem desenho)
+    seed: semente da partida (a mesma do --seed do vídeo no modo rápido)
+    params: constantes do jogo a sobrescrever, ex.: {"VELOCIDADE_DIMINUICAO": 6}
+    verbose: mantém os prints do jogo
+    Retorna a LinhaDoTempo com os eventos contorno_criado (contorno),
+    contorno_destruido (bola, contorno) e fim
+    """
+    linha = simulation.LinhaDoTempo("ball_circles", seed, params)
+    random.seed(seed)
+    with simulation.silenciar(not verbose):
+        sortear_configuracao()
+        with simulation.parametros_jogo(sys.modules[__name__], params):
+            partida = Partida(linha)
+            while partida.tempo_decorrido() < GAME_DURATION:
+                partida.avancar()
+    
+    partida.registrar("fim", (partida.contornos_destruidos,))
+    linha.frames = partida.frame
+    linha.resultado = {"contornos_destruidos": partida.contornos_destruidos,
+                       "contornos_criados": linha.contar("contorno_criado")}
+    return linha
+
 # ==================== EXECUÇÃO DO PROGRAMA ====================
 if __name__ == "__main__":
     """Executa o programa quando o arquivo é executado diretamente"""
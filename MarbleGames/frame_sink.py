@@ -0,0 +1,168 @@
+"""
+Destinos de frames: recebem a TELA do pygame a cada frame do jogo e
+gravam o vídeo diretamente (ou entregam os frames ao gravador por memória
+compartilhada), sem janela, captura de tela ou cv2.resize.
+"""
+
+import atexit
+import sys
+
+import cv2
+import numpy as np
+import pygame
+
+import render_mode
+from shm_ring import AnelEncerrado, AnelFrames
+
+ESPERA_MAXIMA_GRAVADOR = 60  # Segundos sem nenhum slot liberado antes de desistir do gravador
+
+
+def copiar_superficie_bgr(superficie, destino, retangulos=None):
+    """
+    Copia os pixels de uma superfície pygame para um array BGR (altura, largura, 3)
+    superficie: superfície de origem (normalmente a TELA)
+    destino: array uint8 pré-alocado que recebe os pixels
+    retangulos: copia só estas áreas (o resto do destino deve já ter o frame anterior);
+    None = superfície inteira
+    """
+    # pixels3d é uma view (largura, altura, RGB) da memória da superfície:
+    # a transposição e a inversão dos canais são feitas na view do destino,
+    # então a cópia é única e não aloca memória
+    pixels = pygame.surfarray.pixels3d(superficie)
+    destino_xy = destino.transpose(1, 0, 2)[:, :, ::-1]
+    if retangulos is None:
+        np.copyto(destino_xy, pixels)
+    else:
+        limites = superficie.get_rect()
+        for retangulo in retangulos:
+            area = limites.clip(retangulo)
+            if area.width and area.height:
+                np.copyto(destino_xy[area.left:area.right, area.top:area.bottom],
+                          pixels[area.left:area.right, area.top:area.bottom])
+    del pixels  # Libera o lock da superfície
+
+
+class DestinoFrames:
+    """Classe base de um destino de frames com conversão de FPS do jogo para FPS do vídeo"""
+
+    def __init__(self, largura, altura, fps_video=None, fps_jogo=None):
+        """
+        Inicializa o destino
+        largura, altura: resolução dos frames
+        fps_video: frames gravados por segundo de jogo
+        fps_jogo: frames simulados por segundo de jogo
+        """
+        self.largura = largura
+        self.altura = altura
+        self.fps_video = fps_video or render_mode.FPS_VIDEO
+        self.fps_jogo = fps_jogo or render_mode.FPS_JOGO
+        self.frames_jogo = 0
+        self.frames_gravados = 0
+        self.fechado = False
+
+    def enviar(self, superficie, retangulos=None):
+        """
+        Recebe um frame do jogo e grava os frames de vídeo correspondentes
+        A 60 fps de jogo e 24 fps de vídeo, grava 2 de cada 5 frames
+        retangulos: áreas que mudaram desde o último frame desenhado (None = tela inteira);
+        só valem se os frames descartados pela conversão de FPS não foram desenhados
+        """
+        self.frames_jogo += 1
+        alvo = int(self.frames_jogo * self.fps_video / self.fps_jogo)
+        while self.frames_gravados < alvo:
+            self._gravar(superficie, retangulos)
+            self.frames_gravados += 1
+
+    def precisa_frame(self):
+        """
+        True se o próximo frame do jogo será gravado
+        Os frames descartados pela conversão de FPS não precisam ser desenhados
+        """
+        alvo = int((self.frames_jogo + 1) * self.fps_video / self.fps_jogo)
+        return alvo > self.frames_gravados
+
+    def segurar(self, superficie, segundos):
+        """Grava a mesma imagem durante alguns segundos (ex.: telas de empate e fim de jogo)"""
+        for _ in range(int(round(segundos * self.fps_jogo))):
+            self.enviar(superficie)
+
+    def _gravar(self, superficie, retangulos=None):
+        """
+        Grava um frame de vídeo a partir da superfície (implementado pelas subclasses)
+        retangulos: áreas alteradas desde o frame anterior (None = tela inteira)
+        """
+        raise NotImplementedError
+
+    def fechar(self):
+        """Finaliza o destino"""
+        self.fechado = True
+
+
+class DestinoVideoWriter(DestinoFrames):
+    """Destino que grava os frames em um arquivo de vídeo com o cv2.VideoWriter"""
+
+    def __init__(self, caminho, largura, altura, fps_video=None, fps_jogo=None):
+        super().__init__(largura, altura, fps_video, fps_jogo)
+        self.caminho = caminho
+        fourcc = cv2.VideoWriter_fourcc(*'XVID')  # type: ignore
+        self.out = cv2.VideoWriter(caminho, fourcc, self.fps_video, (largura, altura))
+        if not self.out.isOpened():
+            raise RuntimeError(f"Não foi possível abrir o vídeo de saída: {caminho}")
+        # Buffer reutilizado em todos os frames (sem alocação por frame)
+        self.buffer = np.empty((altura, largura, 3), dtype=np.uint8)
+
+    def _gravar(self, superficie, retangulos=None):
+        # O buffer guarda o frame anterior: basta copiar as áreas alteradas
+        copiar_superficie_bgr(superficie, self.buffer, retangulos)
+        self.out.write(self.buffer)
+
+    def fechar(self):
+        if not self.fechado:
+            self.out.release()
+            print(f"Vídeo gravado: {self.caminho} ({self.frames_gravados} frames)")
+        super().fechar()
+
+
+class DestinoMemoriaCompartilhada(DestinoFrames):
+    """Destino que escreve os frames no anel de memória compartilhada lido pelo gravador"""
+
+    def __init__(self, nome, largura, altura, fps_video=None, fps_jogo=None):
+        super().__init__(largura, altura, fps_video, fps_jogo)
+        self.anel = AnelFrames.conectar(nome)
+        if (self.anel.largura, self.anel.altura) != (largura, altura):
+            raise ValueError(f"Anel de frames {self.anel.largura}x{self.anel.altura} "
+                             f"incompatível com a tela {largura}x{altura}")
+
+    def _gravar(self, superficie, retangulos=None):
+        # A superfície é copiada direto no slot que o gravador vai ler
+        # (inteira: o slot reservado não tem o frame anterior)
+        try:
+            slot = self.anel.reservar(timeout=ESPERA_MAXIMA_GRAVADOR)
+        except (AnelEncerrado, TimeoutError) as erro:
+            # Sem gravador não há para onde mandar os frames: encerra o jogo
+            sys.exit(f"Gravação interrompida: {erro}")
+        copiar_superficie_bgr(superficie, slot)
+        self.anel.publicar()
+
+    def fechar(self):
+        if not self.fechado:
+            self.anel.finalizar()
+            self.anel.fechar()
+        super().fechar()
+
+
+def criar_destino_frames(largura, altura):
+    """
+    Cria o destino de frames configurado pelo modo de renderização
+    Retorna None quando o jogo roda normalmente (gravação por captura de tela)
+    """
+    if render_mode.MEMORIA_COMPARTILHADA:
+        destino = DestinoMemoriaCompartilhada(render_mode.MEMORIA_COMPARTILHADA, largura, altura)
+    elif render_mode.SAIDA_VIDEO:
+        destino = DestinoVideoWriter(render_mode.SAIDA_VIDEO, largura, altura)
+    else:
+        return None
+
+    # Os jogos terminam com sys.exit() em vários pontos: garante o fechamento do vídeo
+    atexit.register(destino.fechar)
+    return destino
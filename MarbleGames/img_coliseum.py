@@ -1,15 +1,21 @@
+import render_mode  # Antes do pygame: configura o driver SDL do modo headless
 import pygame
 import math
 import sys
 import random
 import os
-import glob
-from time import sleep
+import assets
+import frame_sink
+import physics
+import replay
+import simulation
+import text_cache
 
 finalizar_gravacao = False
 
 # ==================== CONFIGURAÇÕES DE IMAGENS ====================
 # Configurações para seleção aleatória de imagens
+PASTA_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Raiz do projeto
 PASTA_IMAGENS = "ImagesColiseum"  # Pasta com as imagens das bolas
 USAR_IMAGENS_ALEATORIAS = True    # True para selecionar imagens aleatórias, False para usar caminhos fixos
 CAMINHO_IMAGEM_BOLA_1 = ""        # Deixe vazio se usar imagens aleatórias
@@ -30,47 +36,50 @@ TAMANHO_FONTE_CRONOMETRO = 36     # Tamanho da fonte do cronômetro
 TAMANHO_FONTE_PLACAR = 48         # Tamanho da fonte do placar
 TAMANHO_FONTE_NOMES = 24          # Tamanho da fonte dos nomes das equipes
 
+# Pontuação sorteada a cada quique no contorno (a pontuação substitui a anterior)
+DISTRIBUICAO_PONTOS = [0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 3, 3, 4, 5]  # Sorteio uniforme entre os itens
+PONTOS_EXTRAS_ACRESCIMOS = 3  # Nos acréscimos: de pontuação de empate até empate + este valor
+
+# ==================== CONFIGURAÇÕES DO REPLAY DE DESTAQUE ====================
+USAR_DESTAQUE = True            # Replay em câmera lenta do último quique que pontuou, antes da tela final
+SEGUNDOS_BUFFER_DESTAQUE = 3    # Últimos segundos da partida guardados em memória (tamanho fixo)
+SEGUNDOS_ANTES_DESTAQUE = 1.0   # Trecho mostrado antes do quique
+SEGUNDOS_DEPOIS_DESTAQUE = 0.5  # Trecho mostrado depois do quique
+FATOR_CAMERA_LENTA = 4          # Cada frame da partida vira N frames no destaque
+
 def random_color():
     return (random.randint(80, 255), random.randint(80, 255), random.randint(80, 255))
 
 def carregar_imagem_bola(caminho, tamanho):
-    """Carrega e redimensiona uma imagem para o tamanho da bola"""
+    """
+    Carrega os quadros da imagem da bola no diâmetro da bola, recortados em círculo (gerados pelo assets.py)
+    Retorna a lista de quadros girados do atlas (QUADROS_GIRO) ou, sem giro, só a imagem
+    """
     if caminho and os.path.exists(caminho):
         try:
-            imagem = pygame.image.load(caminho)
-            # Redimensiona para o tamanho da bola (diâmetro)
-            imagem = pygame.transform.scale(imagem, (tamanho * 2, tamanho * 2))
-            return imagem
+            if USAR_GIRO:
+                return assets.carregar_atlas(caminho, tamanho, QUADROS_GIRO)
+            return [assets.carregar_imagem(caminho, "bola", tamanho)]
         except pygame.error:
             print(f"Erro ao carregar imagem: {caminho}")
             return None
     return None
 
 def carregar_plano_fundo(caminho, largura, altura):
-    """Carrega e redimensiona a imagem de plano de fundo"""
+    """Carrega a imagem de plano de fundo no tamanho da tela (gerada pelo assets.py)"""
     if caminho and os.path.exists(caminho):
         try:
-            imagem = pygame.image.load(caminho)
-            # Redimensiona para o tamanho da tela
-            imagem = pygame.transform.scale(imagem, (largura, altura))
-            return imagem
+            return assets.carregar_imagem(caminho, "fundo", (largura, altura))
         except pygame.error:
             print(f"Erro ao carregar plano de fundo: {caminho}")
             return None
     return None
 
 def carregar_titulo(caminho, largura_maxima=None):
-    """Carrega a imagem do título, opcionalmente redimensionando"""
+    """Carrega a imagem do título, reduzida à largura máxima se especificada (gerada pelo assets.py)"""
     if caminho and os.path.exists(caminho):
         try:
-            imagem = pygame.image.load(caminho)
-            # Se especificada largura máxima, redimensiona mantendo proporção
-            if largura_maxima and imagem.get_width() > largura_maxima:
-                altura_original = imagem.get_height()
-                largura_original = imagem.get_width()
-                nova_altura = int((altura_original * largura_maxima) / largura_original)
-                imagem = pygame.transform.scale(imagem, (largura_maxima, nova_altura))
-            return imagem
+            return assets.carregar_imagem(caminho, "titulo", largura_maxima)
         except pygame.error:
             print(f"Erro ao carregar título: {caminho}")
             return None
@@ -84,23 +93,30 @@ def extrair_nome_arquivo(caminho):
         return nome_sem_extensao.replace("_", " ").title()
     return "Jogador"
 
+def caminho_projeto(caminho):
+    """
+    Caminho de um asset: relativo à pasta atual (como o execute.py roda os jogos)
+    ou, se não existir, relativo à raiz do projeto (simulação importada de outra pasta)
+    """
+    if not caminho or os.path.exists(caminho):
+        return caminho
+    return os.path.join(PASTA_PROJETO, caminho)
+
+def caminho_relativo(caminho):
+    """Caminho de um asset relativo à raiz do projeto (gravado nos replays)"""
+    if not caminho:
+        return caminho
+    return os.path.relpath(os.path.abspath(caminho), PASTA_PROJETO)
+
 def selecionar_imagens_aleatorias(pasta_imagens):
     """
     Seleciona duas imagens aleatórias da pasta especificada
     pasta_imagens: caminho da pasta com as imagens
     Retorna: tupla com dois caminhos de imagens diferentes
     """
-    # Busca todas as imagens PNG na pasta
-    padrao = os.path.join(pasta_imagens, "*.png")
-    imagens_disponiveis = glob.glob(padrao)
-    
-    # Adiciona também imagens JPG se existirem
-    padrao_jpg = os.path.join(pasta_imagens, "*.jpg")
-    imagens_disponiveis.extend(glob.glob(padrao_jpg))
-    
-    # Adiciona também imagens JPEG se existirem
-    padrao_jpeg = os.path.join(pasta_imagens, "*.jpeg")
-    imagens_disponiveis.extend(glob.glob(padrao_jpeg))
+    # Imagens PNG, JPG e JPEG da pasta, em ordem alfabética
+    # (a ordem da listagem depende do sistema de arquivos e mudaria o sorteio da semente)
+    imagens_disponiveis = assets.listar_imagens(pasta_imagens)
     
     if len(imagens_disponiveis) < 2:
         print(f"AVISO: Apenas {len(imagens_disponiveis)} imagem(s) encontrada(s) em {pasta_imagens}")
@@ -117,19 +133,16 @@ def selecionar_imagens_aleatorias(pasta_imagens):
     
     return imagens_selecionadas
 
-# Inicialização do Pygame
-pygame.init()
-
 # ==================== CONFIGURAÇÕES DA JANELA ====================
 LARGURA = 480  # Largura da janela
 ALTURA = 854    # Altura da janela
-TELA = pygame.display.set_mode((LARGURA, ALTURA))
-pygame.display.set_caption("Jogo de Bolas com Contorno Fixo")
+TELA = None            # Criada por iniciar_tela() (o modo simulação não abre janela)
+DESTINO_FRAMES = None  # Criado por iniciar_tela(); None = gravação por captura de tela
 
 # ==================== CORES (CONFIGURÁVEIS) ====================
 COR_FUNDO = (0, 0, 0)        # Preto - cor do fundo (usado se não houver imagem)
-COR_BOLA_VERMELHA = random_color()  # Cor da primeira bola
-COR_BOLA_AZUL = random_color()      # Cor da segunda bola
+COR_BOLA_VERMELHA = None  # Cor da primeira bola (sorteada por sortear_configuracao())
+COR_BOLA_AZUL = None      # Cor da segunda bola (sorteada por sortear_configuracao())
 COR_CONTORNO_FIXO = (255, 255, 255)  # Branco - cor do contorno fixo
 
 # ==================== CONFIGURAÇÕES DAS BOLAS (CONFIGURÁVEIS) ====================
@@ -139,6 +152,14 @@ FORCA_QUIQUE = 1.0         # Força do quique (0.0 a 1.0)
 ACELERACAO_QUIQUE = 5     # Multiplicador de aceleração após cada quique
 VELOCIDADE_MAXIMA = 20      # Velocidade máxima que as bolas podem atingir
 
+# ==================== CONFIGURAÇÕES DO GIRO DAS BOLAS ====================
+USAR_GIRO = True             # Bolas com imagem giram (quadros pré-girados do atlas, um blit por frame)
+QUADROS_GIRO = 64            # Ângulos pré-renderizados por imagem (atlas de rotação do assets.py)
+FATOR_GIRO_CONTORNO = 1.0    # Giro após o quique no contorno (1.0 = rola sem deslizar na borda)
+FATOR_GIRO_BOLAS = 0.5       # Fração da velocidade tangencial relativa convertida em giro no choque entre bolas
+AMORTECIMENTO_GIRO = 0.99    # Fração do giro mantida a cada frame
+GIRO_MAXIMO = 8              # Quadros por frame (45°; acima disso o giro parece voltar no vídeo a 24 fps)
+
 # ==================== CONFIGURAÇÕES DO CONTORNO FIXO ====================
 RAIO_CONTORNO_FIXO = 200    # Raio do contorno fixo central
 ESPESSURA_CONTORNO = 5      # Espessura da linha do contorno
@@ -148,15 +169,18 @@ DURACAO_PULSO = 20          # Duração do pulso em frames
 class Cronometro:
     """Classe para gerenciar o cronômetro do jogo"""
     
-    def __init__(self, tempo_total):
+    def __init__(self, tempo_total, passo_fixo=None):
         """
         Inicializa o cronômetro
         tempo_total: tempo total do jogo em segundos
+        passo_fixo: conta frames em vez de acumular dt (padrão: modo rápido)
         """
         self.tempo_total = tempo_total
         self.tempo_restante = tempo_total
+        self.tempo_inicial = tempo_total  # Tempo do período atual (jogo ou acréscimos)
+        self.frames_decorridos = 0        # Frames do período atual (modo rápido)
         self.ativo = True
-        self.fonte = pygame.font.Font(None, TAMANHO_FONTE_CRONOMETRO)
+        self.passo_fixo = render_mode.MODO_RAPIDO if passo_fixo is None else passo_fixo
         self.em_acrescimos = False
     
     def atualizar(self, dt):
@@ -165,7 +189,12 @@ class Cronometro:
         dt: delta time em segundos
         """
         if self.ativo and self.tempo_restante > 0:
-            self.tempo_restante -= dt
+            if self.passo_fixo:
+                # Passo fixo: conta frames em vez de acumular dt
+                self.frames_decorridos += 1
+                self.tempo_restante = self.tempo_inicial - self.frames_decorridos / render_mode.FPS_JOGO
+            else:
+                self.tempo_restante -= dt
             if self.tempo_restante <= 0:
                 self.tempo_restante = 0
                 self.ativo = False
@@ -176,6 +205,8 @@ class Cronometro:
         """Inicia os acréscimos"""
         self.em_acrescimos = True
         self.tempo_restante = TEMPO_ACRESCIMOS
+        self.tempo_inicial = TEMPO_ACRESCIMOS
+        self.frames_decorridos = 0
         self.ativo = True
         print("ACRÉSCIMOS INICIADOS!")
     
@@ -187,12 +218,13 @@ class Cronometro:
         return f"{prefixo}{minutos:02d}:{segundos:02d}"
     
     def desenhar(self, tela, x, y):
-        """Desenha o cronômetro na tela"""
+        """Desenha o cronômetro na tela e retorna o retângulo desenhado"""
         cor = (255, 255, 0) if self.em_acrescimos else COR_CRONOMETRO  # Amarelo nos acréscimos
-        texto = self.fonte.render(self.get_tempo_formatado(), True, cor)
+        # Renderizado só quando o texto muda (uma vez por segundo)
+        texto = text_cache.renderizar(self.get_tempo_formatado(), TAMANHO_FONTE_CRONOMETRO, cor)
         rect = texto.get_rect()
         rect.center = (x, y)
-        tela.blit(texto, rect)
+        return tela.blit(texto, rect)
     
     def tempo_acabou(self):
         """Verifica se o tempo acabou"""
@@ -211,17 +243,15 @@ class Placar:
         self.pontos_jogador_2 = 0
         self.nome_jogador_1 = nome_jogador_1
         self.nome_jogador_2 = nome_jogador_2
-        self.fonte_placar = pygame.font.Font(None, TAMANHO_FONTE_PLACAR)
-        self.fonte_nomes = pygame.font.Font(None, TAMANHO_FONTE_NOMES)
         self.pontuacao_empate = 0  # Para controlar os acréscimos
     
     def marcar_ponto_jogador_1(self, em_acrescimos=False):
         """Marca pontos aleatórios para o jogador 1"""
         if em_acrescimos:
-            # Nos acréscimos, pontos vão da pontuação de empate até empate + 3
-            pontos = random.randint(self.pontuacao_empate, self.pontuacao_empate + 3)
+            # Nos acréscimos, pontos vão da pontuação de empate até empate + PONTOS_EXTRAS_ACRESCIMOS
+            pontos = random.randint(self.pontuacao_empate, self.pontuacao_empate + PONTOS_EXTRAS_ACRESCIMOS)
         else:
-            pontos = random.choice([0,1,1,1,2,2,2,2,2,2,3,3,4,5])
+            pontos = random.choice(DISTRIBUICAO_PONTOS)
         
         self.pontos_jogador_1 = pontos
         print(f"{self.nome_jogador_1} marcou {pontos} pontos! Total: {self.pontos_jogador_1}")
@@ -230,10 +260,10 @@ class Placar:
     def marcar_ponto_jogador_2(self, em_acrescimos=False):
         """Marca pontos aleatórios para o jogador 2"""
         if em_acrescimos:
-            # Nos acréscimos, pontos vão da pontuação de empate até empate + 3
-            pontos = random.randint(self.pontuacao_empate, self.pontuacao_empate + 3)
+            # Nos acréscimos, pontos vão da pontuação de empate até empate + PONTOS_EXTRAS_ACRESCIMOS
+            pontos = random.randint(self.pontuacao_empate, self.pontuacao_empate + PONTOS_EXTRAS_ACRESCIMOS)
         else:
-            pontos = random.choice([0,1,1,1,2,2,2,2,2,2,3,3,4,5])
+            pontos = random.choice(DISTRIBUICAO_PONTOS)
         
         self.pontos_jogador_2 = pontos
         print(f"{self.nome_jogador_2} marcou {pontos} pontos! Total: {self.pontos_jogador_2}")
@@ -249,16 +279,16 @@ class Placar:
         return f"{self.pontos_jogador_1} x {self.pontos_jogador_2}"
     
     def desenhar(self, tela, centro_x, y):
-        """Desenha o placar na tela"""
-        # Desenha o placar principal
-        texto_placar = self.fonte_placar.render(self.get_placar_texto(), True, COR_PLACAR)
+        """Desenha o placar na tela e retorna o retângulo que cobre placar e nomes"""
+        # Desenha o placar principal (os textos vêm do cache: renderizados só quando mudam)
+        texto_placar = text_cache.renderizar(self.get_placar_texto(), TAMANHO_FONTE_PLACAR, COR_PLACAR)
         rect_placar = texto_placar.get_rect()
         rect_placar.center = (centro_x, y)
-        tela.blit(texto_placar, rect_placar)
+        rect_placar = tela.blit(texto_placar, rect_placar)
         
         # Desenha os nomes dos jogadores
-        texto_nome_1 = self.fonte_nomes.render(self.nome_jogador_1, True, COR_PLACAR)
-        texto_nome_2 = self.fonte_nomes.render(self.nome_jogador_2, True, COR_PLACAR)
+        texto_nome_1 = text_cache.renderizar(self.nome_jogador_1, TAMANHO_FONTE_NOMES, COR_PLACAR)
+        texto_nome_2 = text_cache.renderizar(self.nome_jogador_2, TAMANHO_FONTE_NOMES, COR_PLACAR)
         
         # Posiciona os nomes abaixo dos respectivos números
         espacamento_nomes = 80  # Distância entre os nomes
@@ -269,8 +299,7 @@ class Placar:
         rect_nome_2 = texto_nome_2.get_rect()
         rect_nome_2.center = (centro_x + espacamento_nomes, y + 40)
         
-        tela.blit(texto_nome_1, rect_nome_1)
-        tela.blit(texto_nome_2, rect_nome_2)
+        return rect_placar.unionall([tela.blit(texto_nome_1, rect_nome_1), tela.blit(texto_nome_2, rect_nome_2)])
     
     def get_vencedor(self):
         """Retorna o vencedor do jogo"""
@@ -287,121 +316,64 @@ class Placar:
         print(f"Vencedor sorteado nos pênaltis: {vencedor}")
         return vencedor
 
-class Bola:
-    """Classe que representa uma bola no jogo"""
+def iniciar_tela():
+    """Inicializa o pygame, a janela (ou a tela headless) e o destino de frames"""
+    global TELA, DESTINO_FRAMES
+    pygame.init()
+    TELA = pygame.display.set_mode((LARGURA, ALTURA))
+    pygame.display.set_caption("Jogo de Bolas com Contorno Fixo")
+    DESTINO_FRAMES = frame_sink.criar_destino_frames(LARGURA, ALTURA)  # None = gravação por captura de tela
+
+def sortear_configuracao():
+    """
+    Sorteia as configurações aleatórias do jogo (cores das bolas)
+    Chamada depois da semente, antes da partida: mesma ordem de sorteios da
+    antiga inicialização do módulo, então a mesma semente gera a mesma partida
+    """
+    global COR_BOLA_VERMELHA, COR_BOLA_AZUL
+    COR_BOLA_VERMELHA = random_color()
+    COR_BOLA_AZUL = random_color()
+
+def criar_sistema_bolas(capacidade=2):
+    """Cria o núcleo de física das bolas com as constantes deste jogo"""
+    return physics.SistemaBolas(capacidade, LARGURA, ALTURA, GRAVIDADE, FORCA_QUIQUE,
+                                ACELERACAO_QUIQUE, VELOCIDADE_MAXIMA)
+
+class Bola(physics.BolaSistema):
+    """Classe que representa uma bola no jogo (a física fica no SistemaBolas)"""
     
-    def __init__(self, x, y, cor, imagem=None, id_jogador=1):
+    def __init__(self, sistema, x, y, cor, quadros=None, id_jogador=1):
         """
         Inicializa uma bola
-        x, y: posição inicial da bola
+        sistema: SistemaBolas que guarda posição, velocidade e quiques da bola
+        x, y: posição inicial da bola (velocidade inicial zero)
         cor: cor da bola (RGB)
-        imagem: imagem PNG da bola (opcional)
+        quadros: quadros girados da imagem da bola, de carregar_imagem_bola (opcional)
         id_jogador: ID do jogador (1 ou 2)
         """
-        self.x = x
-        self.y = y
-        self.vx = 0  # Velocidade horizontal inicial
-        self.vy = 0  # Velocidade vertical inicial
-        self.raio = RAIO_BOLA
+        super().__init__(sistema, x, y, RAIO_BOLA)
         self.cor = cor
-        self.imagem = imagem
-        self.quiques = 0  # Contador de quiques para acelerar
+        self.quadros = quadros
         self.id_jogador = id_jogador
+        
+        # Giro (só visual, não afeta a física): medido em quadros do atlas, sentido horário.
+        # Começa no meio do quadro 0, e o quadro desenhado é floor(giro)
+        self.giro = 0.5
+        self.velocidade_giro = 0.0  # Quadros por frame
     
-    def atualizar(self):
-        """Atualiza a posição da bola aplicando física"""
-        # Aplica gravidade à velocidade vertical
-        self.vy += GRAVIDADE
-        
-        # Limita a velocidade máxima para evitar bolas muito rápidas
-        velocidade_atual = math.sqrt(self.vx**2 + self.vy**2)
-        if velocidade_atual > VELOCIDADE_MAXIMA:
-            fator_limitacao = VELOCIDADE_MAXIMA / velocidade_atual
-            self.vx *= fator_limitacao
-            self.vy *= fator_limitacao
-        
-        # Atualiza a posição baseada na velocidade
-        self.x += self.vx
-        self.y += self.vy
-        
-        # Verifica colisão com as bordas da tela
-        self._colisao_bordas()
-    
-    def _colisao_bordas(self):
-        """Verifica e resolve colisões com as bordas da tela"""
-        # Borda esquerda
-        if self.x - self.raio <= 0:
-            self.x = self.raio
-            self.vx = -self.vx * FORCA_QUIQUE
-            self._acelerar_apos_quique()
-        
-        # Borda direita
-        elif self.x + self.raio >= LARGURA:
-            self.x = LARGURA - self.raio
-            self.vx = -self.vx * FORCA_QUIQUE
-            self._acelerar_apos_quique()
-        
-        # Borda superior
-        if self.y - self.raio <= 0:
-            self.y = self.raio
-            self.vy = -self.vy * FORCA_QUIQUE
-            self._acelerar_apos_quique()
-        
-        # Borda inferior
-        elif self.y + self.raio >= ALTURA:
-            self.y = ALTURA - self.raio
-            self.vy = -self.vy * FORCA_QUIQUE
-            self._acelerar_apos_quique()
-    
-    def _acelerar_apos_quique(self):
-        """Acelera a bola após um quique"""
-        self.quiques += 1
-        # Aplica aceleração gradual, mas limitada
-        if self.quiques <= 15:  # Limita a quantidade de acelerações
-            self.vx *= ACELERACAO_QUIQUE
-            self.vy *= ACELERACAO_QUIQUE
-    
-    def colisao_com_bola(self, outra_bola):
+    def girar_por_atrito(self, velocidade_tangencial, fator):
         """
-        Verifica e resolve colisão entre duas bolas
-        outra_bola: a outra bola para verificar colisão
+        Soma o giro causado pelo atrito em um contato
+        velocidade_tangencial: velocidade da superfície tocada em relação à bola, na direção
+        tangente (normal girada 90° no sentido horário da tela), em px por frame
         """
-        # Calcula a distância entre os centros das bolas
-        distancia = math.sqrt((self.x - outra_bola.x)**2 + (self.y - outra_bola.y)**2)
-        
-        # Verifica se há colisão
-        if distancia < self.raio + outra_bola.raio and distancia > 0:
-            # Calcula o ângulo da colisão
-            angulo = math.atan2(outra_bola.y - self.y, outra_bola.x - self.x)
-            
-            # Separa as bolas para evitar sobreposição
-            sobreposicao = (self.raio + outra_bola.raio - distancia) / 2
-            self.x -= math.cos(angulo) * sobreposicao
-            self.y -= math.sin(angulo) * sobreposicao
-            outra_bola.x += math.cos(angulo) * sobreposicao
-            outra_bola.y += math.sin(angulo) * sobreposicao
-            
-            # Calcula as novas velocidades após a colisão
-            # Velocidade relativa
-            vx_rel = self.vx - outra_bola.vx
-            vy_rel = self.vy - outra_bola.vy
-            
-            # Velocidade normal (na direção da colisão)
-            velocidade_normal = vx_rel * math.cos(angulo) + vy_rel * math.sin(angulo)
-            
-            # Só resolve se as bolas estão se aproximando
-            if velocidade_normal > 0:
-                # Troca as velocidades normais com força de quique
-                impulso = 2 * velocidade_normal / 2  # Assumindo massas iguais
-                
-                self.vx -= impulso * math.cos(angulo) * FORCA_QUIQUE
-                self.vy -= impulso * math.sin(angulo) * FORCA_QUIQUE
-                outra_bola.vx += impulso * math.cos(angulo) * FORCA_QUIQUE
-                outra_bola.vy += impulso * math.sin(angulo) * FORCA_QUIQUE
-                
-                # Acelera ambas as bolas após a colisão
-                self._acelerar_apos_quique()
-                outra_bola._acelerar_apos_quique()
+        self.velocidade_giro += fator * velocidade_tangencial / self.raio * QUADROS_GIRO / (2 * math.pi)
+        self.velocidade_giro = max(-GIRO_MAXIMO, min(GIRO_MAXIMO, self.velocidade_giro))
+    
+    def atualizar_giro(self, passo=1.0):
+        """Avança o giro por uma fração do frame (subpasso) e aplica o amortecimento"""
+        self.giro += self.velocidade_giro * passo
+        self.velocidade_giro *= AMORTECIMENTO_GIRO ** passo
     
     def colisao_com_contorno_fixo(self, contorno_fixo):
         """
@@ -432,6 +404,11 @@ class Bola:
                 
                 # Inverte a velocidade normal se a bola está se movendo em direção à borda
                 if velocidade_normal > 0:
+                    # A bola passa a rolar na borda (o quique não muda a velocidade tangencial)
+                    velocidade_tangencial = -self.vx * math.sin(angulo) + self.vy * math.cos(angulo)
+                    self.velocidade_giro = 0.0
+                    self.girar_por_atrito(-velocidade_tangencial, FATOR_GIRO_CONTORNO)
+                    
                     self.vx -= 2 * velocidade_normal * math.cos(angulo) * FORCA_QUIQUE
                     self.vy -= 2 * velocidade_normal * math.sin(angulo) * FORCA_QUIQUE
                     
@@ -443,15 +420,16 @@ class Bola:
         return False  # Não houve colisão
     
     def desenhar(self, tela):
-        """Desenha a bola na tela"""
-        if self.imagem:
-            # Desenha a imagem centralizada na posição da bola
-            rect = self.imagem.get_rect()
+        """Desenha a bola na tela e retorna o retângulo desenhado"""
+        if self.quadros:
+            # Desenha o quadro pré-girado do ângulo atual, centralizado na posição da bola
+            imagem = self.quadros[math.floor(self.giro) % len(self.quadros)]
+            rect = imagem.get_rect()
             rect.center = (int(self.x), int(self.y))
-            tela.blit(self.imagem, rect)
+            return tela.blit(imagem, rect)
         else:
             # Desenha um círculo colorido
-            pygame.draw.circle(tela, self.cor, (int(self.x), int(self.y)), self.raio)
+            return pygame.draw.circle(tela, self.cor, (int(self.x), int(self.y)), self.raio)
 
 class ContornoFixo:
     """Classe que representa um contorno fixo central com efeito de pulso"""
@@ -466,6 +444,7 @@ class ContornoFixo:
         self.y = y
         self.raio = raio
         self.raio_base = raio
+        self.raio_inicio = raio  # Raio no início do passo de física (varredura das bolas rápidas)
         self.cor = COR_CONTORNO_FIXO
         
         # Sistema de pulso
@@ -479,10 +458,14 @@ class ContornoFixo:
         self.frames_pulso = 0
         self.intensidade_atual = INTENSIDADE_PULSO
     
-    def atualizar(self):
-        """Atualiza o efeito de pulso"""
+    def atualizar(self, passo=1.0):
+        """
+        Atualiza o efeito de pulso
+        passo: fração do frame avançada (1 / subpassos de física)
+        """
+        self.raio_inicio = self.raio
         if self.pulsando:
-            self.frames_pulso += 1
+            self.frames_pulso += passo
             
             # Calcula a intensidade do pulso usando uma função senoidal
             progresso = self.frames_pulso / DURACAO_PULSO
@@ -496,13 +479,13 @@ class ContornoFixo:
                 self.raio = self.raio_base
     
     def desenhar(self, tela):
-        """Desenha o contorno fixo na tela"""
-        pygame.draw.circle(tela, self.cor, (int(self.x), int(self.y)), int(self.raio), ESPESSURA_CONTORNO)
+        """Desenha o contorno fixo na tela e retorna o retângulo desenhado"""
+        return pygame.draw.circle(tela, self.cor, (int(self.x), int(self.y)), int(self.raio), ESPESSURA_CONTORNO)
 
 def mostrar_tela_empate(tela, placar):
     """Mostra a tela de empate por 3 segundos"""
-    fonte_titulo = pygame.font.Font(None, 48)
-    fonte_resultado = pygame.font.Font(None, 36)
+    fonte_titulo = text_cache.fonte(48)
+    fonte_resultado = text_cache.fonte(36)
     
     # Limpa a tela
     tela.fill((0, 0, 0))
@@ -526,13 +509,17 @@ def mostrar_tela_empate(tela, placar):
     tela.blit(texto_acrescimos, rect_acrescimos)
     
     pygame.display.flip()
-    sleep(3)  # Pausa por 3 segundos
+    if DESTINO_FRAMES:
+        DESTINO_FRAMES.segurar(tela, 3)
+    render_mode.aguardar(3)  # Pausa por 3 segundos
 
-def mostrar_tela_final(tela, placar, cronometro, tipo_vitoria="normal"):
-    """Mostra a tela final do jogo com o resultado"""
-    fonte_titulo = pygame.font.Font(None, 48)
-    fonte_resultado = pygame.font.Font(None, 36)
-    fonte_instrucao = pygame.font.Font(None, 24)
+def mostrar_tela_final(tela, placar, cronometro, tipo_vitoria="normal", vencedor=None):
+    """
+    Mostra a tela final do jogo com o resultado
+    vencedor: decidido por Partida.decidir_vencedor (inclusive o sorteio dos pênaltis)
+    """
+    fonte_titulo = text_cache.fonte(48)
+    fonte_resultado = text_cache.fonte(36)
     
     # Limpa a tela
     tela.fill((0, 0, 0))
@@ -550,18 +537,13 @@ def mostrar_tela_final(tela, placar, cronometro, tipo_vitoria="normal"):
     tela.blit(texto_placar, rect_placar)
     
     # Vencedor com tipo de vitória
-    vencedor = placar.get_vencedor()
+    if vencedor is None:
+        vencedor = placar.get_vencedor()
     if tipo_vitoria == "acrescimos":
         texto_vencedor = fonte_resultado.render(f"VITÓRIA DE {vencedor.upper()}", True, (0, 255, 0))
         texto_tipo = fonte_resultado.render("NOS ACRÉSCIMOS!", True, (255, 255, 0))
     elif tipo_vitoria == "penaltis":
-        vencedor_penaltis = placar.sortear_vencedor_penaltis()
-        texto_vencedor = fonte_resultado.render(f"VITÓRIA DE {vencedor_penaltis.upper()}", True, (0, 255, 0))
-        texto_tipo = fonte_resultado.render("NOS PÊNALTIS!", True, (255, 255, 0))
-    elif vencedor == "Empate":
-        # Este caso não deveria acontecer mais, mas mantemos por segurança
-        vencedor_penaltis = placar.sortear_vencedor_penaltis()
-        texto_vencedor = fonte_resultado.render(f"VITÓRIA DE {vencedor_penaltis.upper()}", True, (0, 255, 0))
+        texto_vencedor = fonte_resultado.render(f"VITÓRIA DE {vencedor.upper()}", True, (0, 255, 0))
         texto_tipo = fonte_resultado.render("NOS PÊNALTIS!", True, (255, 255, 0))
     else:
         texto_vencedor = fonte_resultado.render(f"VENCEDOR: {vencedor.upper()}!", True, (0, 255, 0))
@@ -578,30 +560,211 @@ def mostrar_tela_final(tela, placar, cronometro, tipo_vitoria="normal"):
     
     pygame.display.flip()
 
-def main():
-    """Função principal do jogo"""
-    # Inicializa o relógio para controlar FPS
-    clock = pygame.time.Clock()
-    
-    # Seleciona imagens das bolas
+def selecionar_caminhos_imagens():
+    """Caminhos das imagens das duas bolas (sorteadas da PASTA_IMAGENS ou fixos)"""
     if USAR_IMAGENS_ALEATORIAS:
         # Seleciona imagens aleatórias da pasta
-        caminhos_imagens = selecionar_imagens_aleatorias(PASTA_IMAGENS)
+        caminhos_imagens = selecionar_imagens_aleatorias(caminho_projeto(PASTA_IMAGENS))
         caminho_imagem_1 = caminhos_imagens[0] if len(caminhos_imagens) > 0 else ""
         caminho_imagem_2 = caminhos_imagens[1] if len(caminhos_imagens) > 1 else ""
     else:
         # Usa caminhos fixos
-        caminho_imagem_1 = CAMINHO_IMAGEM_BOLA_1
-        caminho_imagem_2 = CAMINHO_IMAGEM_BOLA_2
+        caminho_imagem_1 = caminho_projeto(CAMINHO_IMAGEM_BOLA_1)
+        caminho_imagem_2 = caminho_projeto(CAMINHO_IMAGEM_BOLA_2)
+    return caminho_imagem_1, caminho_imagem_2
+
+class Partida:
+    """
+    Estado e regras de uma partida (cronômetro, placar, contorno fixo, bolas,
+    acréscimos e pênaltis), sem desenho
+    Usada pelo main, que desenha cada frame, e pelo simulate, que só registra os eventos
+    """
     
-    # Carrega imagens das bolas
-    imagem_bola_1 = carregar_imagem_bola(caminho_imagem_1, RAIO_BOLA)
-    imagem_bola_2 = carregar_imagem_bola(caminho_imagem_2, RAIO_BOLA)
+    def __init__(self, nome_jogador_1, nome_jogador_2, imagem_bola_1=None, imagem_bola_2=None,
+                 linha_do_tempo=None, passo_fixo=None):
+        """
+        nome_jogador_1, nome_jogador_2: nomes exibidos no placar
+        imagem_bola_1, imagem_bola_2: quadros das imagens das bolas, de carregar_imagem_bola (None = cor)
+        linha_do_tempo: LinhaDoTempo que recebe os eventos (None = não registra)
+        passo_fixo: cronômetro por frames (padrão: modo rápido)
+        """
+        self.linha_do_tempo = linha_do_tempo
+        self.frame = 0
+        
+        # Inicializa componentes do jogo
+        self.cronometro = Cronometro(TEMPO_JOGO, passo_fixo)
+        self.placar = Placar(nome_jogador_1, nome_jogador_2)
+        
+        # Calcula o centro da tela
+        self.centro_x = LARGURA // 2
+        self.centro_y = ALTURA // 2
+        
+        # Cria o contorno fixo no centro da tela
+        self.contorno_fixo = ContornoFixo(self.centro_x, self.centro_y, RAIO_CONTORNO_FIXO)
+        
+        # Cria as duas bolas no centro da tela
+        self.sistema_bolas = criar_sistema_bolas()
+        self.bola_1 = Bola(self.sistema_bolas, self.centro_x - random.randint(20, 25), self.centro_y,
+                           COR_BOLA_VERMELHA, imagem_bola_1, 1)
+        self.bola_2 = Bola(self.sistema_bolas, self.centro_x + random.randint(20, 25), self.centro_y,
+                           COR_BOLA_AZUL, imagem_bola_2, 2)
+        
+        # Dá uma pequena velocidade inicial para as bolas se moverem
+        self.bola_1.vx = -2
+        self.bola_2.vx = 2
+        
+        self.jogo_terminado = False
+        self.em_acrescimos = False
+        self.tipo_vitoria = "normal"
+        self.frame_ultimo_ponto = None  # Frame do último quique que pontuou (replay de destaque)
+    
+    def registrar(self, tipo, entidades=(), x=None, y=None):
+        """Registra um evento do frame atual na linha do tempo (se houver)"""
+        if self.linha_do_tempo is not None:
+            self.linha_do_tempo.registrar(self.frame, tipo, entidades, x, y)
     
+    def _reiniciar_bolas(self):
+        """Reposiciona as bolas no centro para os acréscimos"""
+        self.bola_1.x = self.centro_x - random.randint(20, 25)
+        self.bola_1.y = self.centro_y
+        self.bola_2.x = self.centro_x + random.randint(20, 25)
+        self.bola_2.y = self.centro_y
+        self.bola_1.vx = -2
+        self.bola_2.vx = 2
+        self.bola_1.vy = 0
+        self.bola_2.vy = 0
+    
+    def _fim_do_tempo(self):
+        """
+        Decide o que acontece quando o cronômetro zera: acréscimos no primeiro
+        empate, pênaltis no segundo ou fim de jogo com vencedor
+        Retorna True se o tempo normal terminou empatado (tela de empate)
+        """
+        placar = self.placar
+        vencedor = placar.get_vencedor()
+        
+        if vencedor == "Empate" and not self.em_acrescimos:
+            # Primeiro empate - vai para acréscimos
+            print(f"TEMPO ESGOTADO! Placar: {placar.get_placar_texto()} - EMPATE!")
+            placar.definir_pontuacao_empate()
+            self.registrar("empate", (placar.pontos_jogador_1, placar.pontos_jogador_2))
+            
+            # Inicia acréscimos
+            self.cronometro.iniciar_acrescimos()
+            self.em_acrescimos = True
+            self.tipo_vitoria = "acrescimos"
+            self.registrar("acrescimos")
+            
+            # Reinicia as bolas para os acréscimos
+            self._reiniciar_bolas()
+            return True
+        
+        if vencedor == "Empate" and self.em_acrescimos:
+            # Segundo empate - vai para pênaltis
+            print(f"ACRÉSCIMOS TERMINADOS! Placar: {placar.get_placar_texto()} - EMPATE!")
+            print("Indo para os pênaltis...")
+            self.tipo_vitoria = "penaltis"
+        else:
+            # Há um vencedor
+            if self.em_acrescimos:
+                print(f"ACRÉSCIMOS TERMINADOS! Placar final: {placar.get_placar_texto()}")
+                print(f"Vencedor nos acréscimos: {vencedor}")
+            else:
+                print(f"TEMPO ESGOTADO! Placar final: {placar.get_placar_texto()}")
+                print(f"Vencedor: {vencedor}")
+        self.jogo_terminado = True
+        return False
+    
+    def avancar(self, dt):
+        """
+        Avança um frame: cronômetro, pulso do contorno, física e placar
+        dt: delta time em segundos (ignorado no passo fixo)
+        Retorna True se o tempo normal terminou empatado neste frame (o main
+        mostra a tela de empate antes dos acréscimos)
+        """
+        empate = False
+        
+        # Atualiza o cronômetro
+        if self.cronometro.atualizar(dt):
+            # Tempo acabou
+            empate = self._fim_do_tempo()
+        
+        # Física das bolas em subpassos (TOKAI_SUBPASSOS): cada um avança
+        # PASSO_FISICA do frame, também no pulso do contorno fixo
+        for _ in range(render_mode.SUBPASSOS):
+            # Atualiza o contorno fixo (o raio muda durante o passo das bolas)
+            self.contorno_fixo.atualizar(render_mode.PASSO_FISICA)
+        
+            # Atualiza as bolas (gravidade, velocidade máxima e bordas em lote)
+            self.sistema_bolas.atualizar(render_mode.PASSO_FISICA)
+        
+            # Verifica colisão entre as bolas
+            pares = self.sistema_bolas.colisoes_entre_bolas()
+            self._girar_bolas(pares)
+        
+            # Bolas rápidas (ACELERACAO_QUIQUE alto) que atravessaram o contorno
+            # no passo voltam ao ponto de contato antes do teste de colisão
+            corrigidas, t_contato = physics.corrigir_tunelamento(self.sistema_bolas, [self.contorno_fixo],
+                                                                 ESPESSURA_CONTORNO)
+        
+            # Verifica colisões com o contorno fixo e atualiza placar
+            if self.bola_1.colisao_com_contorno_fixo(self.contorno_fixo):
+                self.contorno_fixo.iniciar_pulso()
+                pontos = self.placar.marcar_ponto_jogador_1(self.em_acrescimos)
+                self.frame_ultimo_ponto = self.frame
+                self.registrar("quique_contorno", (1, pontos), self.bola_1.x, self.bola_1.y)
+        
+            if self.bola_2.colisao_com_contorno_fixo(self.contorno_fixo):
+                self.contorno_fixo.iniciar_pulso()
+                pontos = self.placar.marcar_ponto_jogador_2(self.em_acrescimos)
+                self.frame_ultimo_ponto = self.frame
+                self.registrar("quique_contorno", (2, pontos), self.bola_2.x, self.bola_2.y)
+            
+            # As bolas corrigidas andam, depois do quique, o que faltava do passo
+            physics.avancar_restante(self.sistema_bolas, corrigidas, t_contato, render_mode.PASSO_FISICA)
+            
+            self.bola_1.atualizar_giro(render_mode.PASSO_FISICA)
+            self.bola_2.atualizar_giro(render_mode.PASSO_FISICA)
+        
+        self.frame += 1
+        return empate
+    
+    def _girar_bolas(self, pares):
+        """
+        Giro pelo atrito no choque entre as bolas (pares de colisoes_entre_bolas)
+        O impulso é só na normal, então a velocidade tangencial relativa é a de antes do choque;
+        o atrito gira as duas bolas no mesmo sentido
+        """
+        bolas = {self.bola_1.indice: self.bola_1, self.bola_2.indice: self.bola_2}
+        for i, j in zip(*pares):
+            bola_i, bola_j = bolas[int(i)], bolas[int(j)]
+            angulo = math.atan2(bola_j.y - bola_i.y, bola_j.x - bola_i.x)
+            relativa = ((bola_j.vx - bola_i.vx) * -math.sin(angulo) +
+                        (bola_j.vy - bola_i.vy) * math.cos(angulo))
+            bola_i.girar_por_atrito(relativa, FATOR_GIRO_BOLAS)
+            bola_j.girar_por_atrito(relativa, FATOR_GIRO_BOLAS)
+    
+    def decidir_vencedor(self):
+        """
+        Vencedor da partida terminada; um empate é decidido nos pênaltis (sorteio)
+        Chamada uma vez, no fim do jogo (antes da tela final)
+        """
+        vencedor = self.placar.get_vencedor()
+        if self.tipo_vitoria == "penaltis" or (self.tipo_vitoria == "normal" and vencedor == "Empate"):
+            vencedor = self.placar.sortear_vencedor_penaltis()
+            self.tipo_vitoria = "penaltis"
+        self.registrar("fim", (vencedor, self.tipo_vitoria))
+        return vencedor
+
+def carregar_cenario():
+    """
+    Carrega o plano de fundo e o título (se especificados)
+    Retorna (plano_fundo, titulo); None para o que não for usado ou não carregar
+    """
     # Carrega plano de fundo (se especificado)
     plano_fundo = None
     if USAR_PLANO_FUNDO:
-        plano_fundo = carregar_plano_fundo(CAMINHO_PLANO_FUNDO, LARGURA, ALTURA)
+        plano_fundo = carregar_plano_fundo(caminho_projeto(CAMINHO_PLANO_FUNDO), LARGURA, ALTURA)
         if plano_fundo:
             print(f"Plano de fundo carregado: {CAMINHO_PLANO_FUNDO}")
         else:
@@ -610,35 +773,254 @@ def main():
     # Carrega título (se especificado)
     titulo = None
     if USAR_TITULO:
-        titulo = carregar_titulo(CAMINHO_TITULO, LARGURA - 40)  # Margem de 20px de cada lado
+        titulo = carregar_titulo(caminho_projeto(CAMINHO_TITULO), LARGURA - 40)  # Margem de 20px de cada lado
         if titulo:
             print(f"Título carregado: {CAMINHO_TITULO}")
         else:
             print(f"Não foi possível carregar o título: {CAMINHO_TITULO}")
+    return plano_fundo, titulo
+
+def posicao_titulo(titulo, centro_y):
+    """Posição (x, y) do título: centralizado na parte superior, sem sobrepor o contorno fixo"""
+    titulo_rect = titulo.get_rect()
+    titulo_x = (LARGURA - titulo_rect.width) // 2
+    titulo_y = 20  # 20 pixels do topo
+    
+    # Verifica se não vai sobrepor o contorno (ajusta posição se necessário)
+    distancia_do_contorno = centro_y - RAIO_CONTORNO_FIXO - ESPESSURA_CONTORNO
+    if titulo_y + titulo_rect.height > distancia_do_contorno - 20:  # Margem de 20px
+        titulo_y = max(10, distancia_do_contorno - titulo_rect.height - 20)
+    return titulo_x, titulo_y
+
+def desenhar_partida(tela, partida, plano_fundo=None, titulo=None):
+    """Desenha um frame da partida (fundo, contorno fixo, bolas, título, cronômetro e placar)"""
+    # Desenha o plano de fundo
+    if plano_fundo:
+        tela.blit(plano_fundo, (0, 0))
+    else:
+        # Limpa a tela com cor de fundo preta
+        tela.fill(COR_FUNDO)
+    
+    # Desenha o contorno fixo
+    partida.contorno_fixo.desenhar(tela)
+    
+    # Desenha as bolas
+    partida.bola_1.desenhar(tela)
+    partida.bola_2.desenhar(tela)
+    
+    # Desenha o título (se carregado)
+    if titulo:
+        tela.blit(titulo, posicao_titulo(titulo, partida.centro_y))
+    
+    # Desenha o cronômetro (canto superior direito)
+    partida.cronometro.desenhar(tela, LARGURA - 240, ALTURA - 50)
+    
+    # Desenha o placar (entre o contorno e a parte inferior)
+    placar_y = partida.centro_y + RAIO_CONTORNO_FIXO + 80
+    partida.placar.desenhar(tela, partida.centro_x, placar_y)
+
+class RenderizadorPartida:
+    """
+    Desenha a partida redesenhando só os retângulos que mudam entre frames
+    O fundo e o título são compostos uma vez em uma camada estática; a cada frame
+    a camada é copiada só onde houve desenho no frame anterior, e o contorno fixo,
+    as bolas, o cronômetro e o placar são desenhados por cima. O resultado é o
+    mesmo do desenhar_partida.
+    """
+    
+    def __init__(self, partida, plano_fundo=None, titulo=None):
+        """
+        Compõe a camada estática da partida (o título depende do centro do contorno)
+        plano_fundo, titulo: superfícies do carregar_cenario() (None = cor sólida / sem título)
+        """
+        self.plano_fundo = plano_fundo
+        self.titulo = titulo
+        self.camada = pygame.Surface((LARGURA, ALTURA)).convert()
+        if plano_fundo:
+            self.camada.blit(plano_fundo, (0, 0))
+        else:
+            self.camada.fill(COR_FUNDO)
+        self.rect_titulo = None
+        if titulo:
+            self.rect_titulo = self.camada.blit(titulo, posicao_titulo(titulo, partida.centro_y))
+        self.retangulos_anteriores = None  # None = o próximo frame copia a camada inteira
+    
+    def invalidar(self):
+        """Faz o próximo frame redesenhar a tela inteira (depois de telas que cobrem a partida)"""
+        self.retangulos_anteriores = None
+    
+    def desenhar(self, tela, partida):
+        """
+        Desenha um frame da partida na tela
+        Retorna os retângulos alterados desde o frame anterior (None = tela inteira),
+        para o pygame.display.update() e o DESTINO_FRAMES
+        """
+        if self.retangulos_anteriores is None:
+            tela.blit(self.camada, (0, 0))
+        else:
+            # Apaga o frame anterior restaurando a camada onde houve desenho
+            for retangulo in self.retangulos_anteriores:
+                tela.blit(self.camada, retangulo, retangulo)
+        
+        novos = [partida.contorno_fixo.desenhar(tela),
+                 partida.bola_1.desenhar(tela),
+                 partida.bola_2.desenhar(tela),
+                 partida.cronometro.desenhar(tela, LARGURA - 240, ALTURA - 50),
+                 partida.placar.desenhar(tela, partida.centro_x, partida.centro_y + RAIO_CONTORNO_FIXO + 80)]
+        
+        # O título fica na frente do contorno e das bolas: se algo o alcançou (o layout
+        # normal não deixa), o frame é redesenhado inteiro como no desenhar_partida
+        if self.rect_titulo and self.rect_titulo.collidelist(novos) != -1:
+            desenhar_partida(tela, partida, self.plano_fundo, self.titulo)
+            self.retangulos_anteriores = novos + [self.rect_titulo]
+            return None
+        
+        alterados = None if self.retangulos_anteriores is None else self.retangulos_anteriores + novos
+        self.retangulos_anteriores = novos
+        return alterados
+
+# Valores gravados por frame no replay (além das posições das bolas)
+CAMPOS_REPLAY = ("tempo_restante", "acrescimos", "raio_contorno_fixo", "pontos_1", "pontos_2", "giro_1", "giro_2")
+
+def gravar_frame_replay(gravador, partida):
+    """Grava no replay o estado desenhado no frame atual"""
+    gravador.gravar(tempo_restante=partida.cronometro.tempo_restante,
+                    acrescimos=partida.cronometro.em_acrescimos,
+                    raio_contorno_fixo=partida.contorno_fixo.raio,
+                    pontos_1=partida.placar.pontos_jogador_1,
+                    pontos_2=partida.placar.pontos_jogador_2,
+                    giro_1=partida.bola_1.giro,
+                    giro_2=partida.bola_2.giro)
+
+def restaurar_estado(partida, estados, indice, fracao=0.0):
+    """
+    Copia para a partida o estado gravado de um frame (Replay ou BufferCircular)
+    fracao: interpola posições, pulso e tempo em direção ao frame seguinte (câmera lenta)
+    """
+    estados.restaurar_bolas(indice, [partida.bola_1, partida.bola_2], fracao)
+    partida.cronometro.tempo_restante = estados.campo(indice, "tempo_restante", fracao)
+    partida.cronometro.em_acrescimos = bool(estados.campo(indice, "acrescimos"))
+    partida.contorno_fixo.raio = estados.campo(indice, "raio_contorno_fixo", fracao)
+    partida.placar.pontos_jogador_1 = int(estados.campo(indice, "pontos_1"))
+    partida.placar.pontos_jogador_2 = int(estados.campo(indice, "pontos_2"))
+    # Gravado com arredondamento para baixo: floor(giro) escolhe o mesmo quadro do jogo
+    partida.bola_1.giro = estados.campo(indice, "giro_1", fracao)
+    partida.bola_2.giro = estados.campo(indice, "giro_2", fracao)
+
+def janela_destaque(partida, destaque):
+    """
+    Trecho (inicio, fim) do replay de destaque em frames da partida: do último
+    quique que pontuou, limitado ao que ainda está no buffer
+    Retorna None se não houve ponto ou se ele já saiu do buffer
+    """
+    if destaque is None or partida.frame_ultimo_ponto is None:
+        return None
+    colisao = partida.frame_ultimo_ponto
+    inicio = max(destaque.primeiro_disponivel(), colisao - int(SEGUNDOS_ANTES_DESTAQUE * render_mode.FPS_JOGO))
+    fim = min(destaque.quantidade - 1, colisao + int(SEGUNDOS_DEPOIS_DESTAQUE * render_mode.FPS_JOGO))
+    if fim < inicio:
+        return None
+    return inicio, fim
+
+def mostrar_destaque(tela, partida, estados, inicio, fim, plano_fundo=None, titulo=None):
+    """
+    Mostra em câmera lenta os frames inicio..fim da partida (replay do último ponto)
+    estados: BufferCircular da partida (ou o Replay gravado, no replay.py)
+    Cada frame vira FATOR_CAMERA_LENTA frames, com as posições interpoladas
+    """
+    texto_replay = text_cache.renderizar("REPLAY", 36, (255, 255, 255))
+    relogio = render_mode.RelogioJogo()
+    # O placar final é mostrado depois: o destaque desenha o placar de cada frame
+    pontos_finais = (partida.placar.pontos_jogador_1, partida.placar.pontos_jogador_2)
+    
+    for indice in range(inicio, fim + 1):
+        # O último frame do trecho não tem frame seguinte para interpolar
+        for passo in range(FATOR_CAMERA_LENTA if indice < fim else 1):
+            if DESTINO_FRAMES is None or DESTINO_FRAMES.precisa_frame():
+                restaurar_estado(partida, estados, indice, passo / FATOR_CAMERA_LENTA)
+                desenhar_partida(tela, partida, plano_fundo, titulo)
+                
+                # Indicador de replay (canto superior esquerdo)
+                pygame.draw.circle(tela, (255, 0, 0), (20, 20), 7)
+                tela.blit(texto_replay, (33, 20 - texto_replay.get_height() // 2))
+                pygame.display.flip()
+            if DESTINO_FRAMES:
+                DESTINO_FRAMES.enviar(tela)
+            relogio.tick()
+    
+    partida.placar.pontos_jogador_1, partida.placar.pontos_jogador_2 = pontos_finais
+
+def criar_reproducao(gravacao):
+    """
+    Prepara o redesenho de um replay (replay.py) com o desenho do jogo, sem física
+    gravacao: replay.Replay desta partida (constantes do jogo já restauradas)
+    Retorna (desenhar_frame(tela, indice), reproduzir_tela(tela, dados da tela)); as telas
+    gravam os próprios frames no DESTINO_FRAMES, como no jogo
+    """
+    nomes = gravacao.metadados["nomes"]
+    imagens = [carregar_imagem_bola(caminho_projeto(caminho), RAIO_BOLA) for caminho in gravacao.metadados["imagens"]]
+    plano_fundo, titulo = carregar_cenario()
+    partida = Partida(nomes[0], nomes[1], imagens[0], imagens[1])
+    
+    def desenhar_frame(tela, indice):
+        restaurar_estado(partida, gravacao, indice)
+        desenhar_partida(tela, partida, plano_fundo, titulo)
+    
+    def reproduzir_tela(tela, dados):
+        partida.placar.pontos_jogador_1, partida.placar.pontos_jogador_2 = dados["placar"]
+        if dados["tipo"] == "empate":
+            mostrar_tela_empate(tela, partida.placar)
+        elif dados["tipo"] == "destaque":
+            mostrar_destaque(tela, partida, gravacao, dados["inicio"], dados["fim"], plano_fundo, titulo)
+        else:
+            mostrar_tela_final(tela, partida.placar, partida.cronometro, dados["tipo_vitoria"], dados["vencedor"])
+            DESTINO_FRAMES.segurar(tela, 3)
+    
+    return desenhar_frame, reproduzir_tela
+
+def main():
+    """Função principal do jogo"""
+    iniciar_tela()
+    sortear_configuracao()
+    
+    # Inicializa o relógio para controlar FPS (passo fixo no modo rápido)
+    relogio = render_mode.RelogioJogo()
+    
+    # Seleciona imagens das bolas
+    caminho_imagem_1, caminho_imagem_2 = selecionar_caminhos_imagens()
+    
+    # Carrega imagens das bolas
+    imagem_bola_1 = carregar_imagem_bola(caminho_imagem_1, RAIO_BOLA)
+    imagem_bola_2 = carregar_imagem_bola(caminho_imagem_2, RAIO_BOLA)
+    
+    # Carrega plano de fundo e título (se especificados)
+    plano_fundo, titulo = carregar_cenario()
     
     # Extrai nomes dos jogadores dos arquivos de imagem
     nome_jogador_1 = extrair_nome_arquivo(caminho_imagem_1)
     nome_jogador_2 = extrair_nome_arquivo(caminho_imagem_2)
     
     while True:  # Loop para permitir reiniciar o jogo
-        # Inicializa componentes do jogo
-        cronometro = Cronometro(TEMPO_JOGO)
-        placar = Placar(nome_jogador_1, nome_jogador_2)
+        # Inicializa a partida (cronômetro, placar, contorno fixo e bolas)
+        partida = Partida(nome_jogador_1, nome_jogador_2, imagem_bola_1, imagem_bola_2)
+        placar = partida.placar
+        cronometro = partida.cronometro
         
-        # Calcula o centro da tela
-        centro_x = LARGURA // 2
-        centro_y = ALTURA // 2
+        # Fundo e título compostos uma vez; cada frame redesenha só o que muda
+        renderizador = RenderizadorPartida(partida, plano_fundo, titulo)
         
-        # Cria o contorno fixo no centro da tela
-        contorno_fixo = ContornoFixo(centro_x, centro_y, RAIO_CONTORNO_FIXO)
+        # Replay do estado de cada frame (TOKAI_REPLAY, execute.py --replay)
+        gravador = replay.criar_gravador(sys.modules[__name__], [partida.bola_1, partida.bola_2],
+                                         campos=CAMPOS_REPLAY,
+                                         metadados={"nomes": [nome_jogador_1, nome_jogador_2],
+                                                    "imagens": [caminho_relativo(caminho_imagem_1),
+                                                                caminho_relativo(caminho_imagem_2)]})
         
-        # Cria as duas bolas no centro da tela
-        bola_1 = Bola(centro_x - random.randint(20, 25), centro_y, COR_BOLA_VERMELHA, imagem_bola_1, 1)
-        bola_2 = Bola(centro_x + random.randint(20, 25), centro_y, COR_BOLA_AZUL, imagem_bola_2, 2)
-        
-        # Dá uma pequena velocidade inicial para as bolas se moverem
-        bola_1.vx = -2
-        bola_2.vx = 2
+        # Últimos segundos da partida para o replay de destaque (memória fixa)
+        destaque = None
+        if USAR_DESTAQUE:
+            destaque = replay.BufferCircular(int(SEGUNDOS_BUFFER_DESTAQUE * render_mode.FPS_JOGO),
+                                             [partida.bola_1, partida.bola_2], CAMPOS_REPLAY)
         
         print("Jogo de Bolas com Contorno Fixo iniciado!")
         print(f"- Cronômetro: {TEMPO_JOGO} segundos")
@@ -662,13 +1044,10 @@ def main():
         
         # Loop principal do jogo
         rodando = True
-        jogo_terminado = False
-        em_acrescimos = False
-        tipo_vitoria = "normal"
         
         while rodando:
             # Calcula delta time
-            dt = clock.tick(60) / 1000.0  # Delta time em segundos
+            dt = relogio.tick()  # Delta time em segundos
             
             # Processa eventos
             for evento in pygame.event.get():
@@ -677,126 +1056,66 @@ def main():
                     sys.exit()
                 elif evento.type == pygame.KEYDOWN:
                     if evento.key == pygame.K_ESCAPE:
-                        if jogo_terminado:
+                        if partida.jogo_terminado:
                             pygame.quit()
                             sys.exit()
                         else:
                             rodando = False
-                    elif evento.key == pygame.K_SPACE and jogo_terminado:
+                    elif evento.key == pygame.K_SPACE and partida.jogo_terminado:
                         rodando = False  # Reinicia o jogo
             
-            if not jogo_terminado:
-                # Atualiza o cronômetro
-                if cronometro.atualizar(dt):
-                    # Tempo acabou
-                    vencedor = placar.get_vencedor()
-                    
-                    if vencedor == "Empate" and not em_acrescimos:
-                        # Primeiro empate - vai para acréscimos
-                        print(f"TEMPO ESGOTADO! Placar: {placar.get_placar_texto()} - EMPATE!")
-                        placar.definir_pontuacao_empate()
-                        mostrar_tela_empate(TELA, placar)
-                        
-                        # Inicia acréscimos
-                        cronometro.iniciar_acrescimos()
-                        em_acrescimos = True
-                        tipo_vitoria = "acrescimos"
-                        
-                        # Reinicia as bolas para os acréscimos
-                        bola_1.x = centro_x - random.randint(20, 25)
-                        bola_1.y = centro_y
-                        bola_2.x = centro_x + random.randint(20, 25)
-                        bola_2.y = centro_y
-                        bola_1.vx = -2
-                        bola_2.vx = 2
-                        bola_1.vy = 0
-                        bola_2.vy = 0
-                        
-                    elif vencedor == "Empate" and em_acrescimos:
-                        # Segundo empate - vai para pênaltis
-                        print(f"ACRÉSCIMOS TERMINADOS! Placar: {placar.get_placar_texto()} - EMPATE!")
-                        print("Indo para os pênaltis...")
-                        tipo_vitoria = "penaltis"
-                        jogo_terminado = True
-                        
-                    else:
-                        # Há um vencedor
-                        if em_acrescimos:
-                            print(f"ACRÉSCIMOS TERMINADOS! Placar final: {placar.get_placar_texto()}")
-                            print(f"Vencedor nos acréscimos: {vencedor}")
-                        else:
-                            print(f"TEMPO ESGOTADO! Placar final: {placar.get_placar_texto()}")
-                            print(f"Vencedor: {vencedor}")
-                        jogo_terminado = True
-                
-                # Atualiza o contorno fixo
-                contorno_fixo.atualizar()
-                
-                # Atualiza as bolas
-                bola_1.atualizar()
-                bola_2.atualizar()
-                
-                # Verifica colisão entre as bolas
-                bola_1.colisao_com_bola(bola_2)
-                
-                # Verifica colisões com o contorno fixo e atualiza placar
-                if bola_1.colisao_com_contorno_fixo(contorno_fixo):
-                    contorno_fixo.iniciar_pulso()
-                    pontos = placar.marcar_ponto_jogador_1(em_acrescimos)
-                
-                if bola_2.colisao_com_contorno_fixo(contorno_fixo):
-                    contorno_fixo.iniciar_pulso()
-                    pontos = placar.marcar_ponto_jogador_2(em_acrescimos)
+            if not partida.jogo_terminado:
+                # Cronômetro, acréscimos/pênaltis, pulso do contorno, física e placar
+                if partida.avancar(dt):
+                    # Empate no tempo normal: tela de empate antes dos acréscimos
+                    if gravador:
+                        gravador.marcar_tela("empate", placar=[placar.pontos_jogador_1, placar.pontos_jogador_2])
+                    mostrar_tela_empate(TELA, placar)
+                    renderizador.invalidar()
             
             # ==================== DESENHO ====================
-            if not jogo_terminado:
-                # Desenha o plano de fundo
-                if plano_fundo:
-                    TELA.blit(plano_fundo, (0, 0))
-                else:
-                    # Limpa a tela com cor de fundo preta
-                    TELA.fill(COR_FUNDO)
-                
-                # Desenha o contorno fixo
-                contorno_fixo.desenhar(TELA)
-                
-                # Desenha as bolas
-                bola_1.desenhar(TELA)
-                bola_2.desenhar(TELA)
+            if not partida.jogo_terminado:
+                # Frames descartados pela conversão para o FPS do vídeo não são desenhados
+                alterados = None
+                if DESTINO_FRAMES is None or DESTINO_FRAMES.precisa_frame():
+                    alterados = renderizador.desenhar(TELA, partida)
                 
-                # Desenha o título (se carregado)
-                if titulo:
-                    # Calcula posição do título (centralizado horizontalmente, na parte superior)
-                    titulo_rect = titulo.get_rect()
-                    titulo_x = (LARGURA - titulo_rect.width) // 2
-                    titulo_y = 20  # 20 pixels do topo
-                    
-                    # Verifica se não vai sobrepor o contorno (ajusta posição se necessário)
-                    distancia_do_contorno = centro_y - RAIO_CONTORNO_FIXO - ESPESSURA_CONTORNO
-                    if titulo_y + titulo_rect.height > distancia_do_contorno - 20:  # Margem de 20px
-                        titulo_y = max(10, distancia_do_contorno - titulo_rect.height - 20)
-                    
-                    TELA.blit(titulo, (titulo_x, titulo_y))
-                
-                # Desenha o cronômetro (canto superior direito)
-                cronometro.desenhar(TELA, LARGURA - 240, ALTURA - 50)
+                    # Atualiza a tela (só os retângulos alterados)
+                    if alterados is None:
+                        pygame.display.flip()
+                    else:
+                        pygame.display.update(alterados)
+                if DESTINO_FRAMES:
+                    DESTINO_FRAMES.enviar(TELA, alterados)
+                if gravador:
+                    gravar_frame_replay(gravador, partida)
+                if destaque:
+                    gravar_frame_replay(destaque, partida)
+            else:
+                vencedor = partida.decidir_vencedor()
                 
-                # Desenha o placar (entre o contorno e a parte inferior)
-                placar_y = centro_y + RAIO_CONTORNO_FIXO + 80
-                placar.desenhar(TELA, centro_x, placar_y)
+                # Replay em câmera lenta do último ponto antes do resultado
+                janela = janela_destaque(partida, destaque)
+                if janela:
+                    if gravador:
+                        gravador.marcar_tela("destaque", placar=[placar.pontos_jogador_1, placar.pontos_jogador_2],
+                                             inicio=janela[0], fim=janela[1])
+                    mostrar_destaque(TELA, partida, destaque, janela[0], janela[1], plano_fundo, titulo)
                 
-                # Atualiza a tela
-                pygame.display.flip()
-            else:
                 # Mostra tela final
-                mostrar_tela_final(TELA, placar, cronometro, tipo_vitoria)
-                sleep(3)
+                if gravador:
+                    gravador.marcar_tela("final", placar=[placar.pontos_jogador_1, placar.pontos_jogador_2],
+                                         vencedor=vencedor, tipo_vitoria=partida.tipo_vitoria)
+                mostrar_tela_final(TELA, placar, cronometro, partida.tipo_vitoria, vencedor)
+                if DESTINO_FRAMES:
+                    DESTINO_FRAMES.segurar(TELA, 3)
+                render_mode.aguardar(3)
                 pygame.quit()
                 print("Jogo finalizado!")
                 sys.exit()
         
         # Se chegou aqui, o jogo vai reiniciar (a menos que tenha saído)
-        if not jogo_terminado:
+        if not partida.jogo_terminado:
             break  # Sai do loop principal se ESC foi pressionado durante o jogo
     
     # Finaliza o Pygame
@@ -805,6 +1124,40 @@ def main():
     sys.exit()
     finalizar_gravacao = True
 
+def simulate(seed, params=None, verbose=False):
+    """
+    Simula uma partida só com física e regras (sem janela nem desenho)
+    seed: semente da partida (a mesma do --seed do vídeo no modo rápido)
+    params: constantes do jogo a sobrescrever, ex.: {"ACELERACAO_QUIQUE": 3}
+    verbose: mantém os prints do jogo
+    Retorna a LinhaDoTempo com os eventos quique_contorno (jogador, pontos),
+    empate (placar), acrescimos e fim (vencedor, tipo de vitória)
+    """
+    linha = simulation.LinhaDoTempo("img_coliseum", seed, params)
+    random.seed(seed)
+    with simulation.silenciar(not verbose):
+        sortear_configuracao()
+        with simulation.parametros_jogo(sys.modules[__name__], params):
+            caminho_imagem_1, caminho_imagem_2 = selecionar_caminhos_imagens()
+            partida = Partida(extrair_nome_arquivo(caminho_imagem_1), extrair_nome_arquivo(caminho_imagem_2),
+                              linha_do_tempo=linha, passo_fixo=True)
+            while not partida.jogo_terminado:
+                partida.avancar(1 / render_mode.FPS_JOGO)
+            vencedor = partida.decidir_vencedor()
+    
+    placar = partida.placar
+    linha.frames = partida.frame
+    linha.resultado = {
+        "jogadores": [placar.nome_jogador_1, placar.nome_jogador_2],
+        "placar": [placar.pontos_jogador_1, placar.pontos_jogador_2],
+        "vencedor": vencedor,
+        "tipo_vitoria": partida.tipo_vitoria,
+        "acrescimos": partida.em_acrescimos,
+        "penaltis": partida.tipo_vitoria == "penaltis",
+        "quiques": linha.contar("quique_contorno"),
+    }
+    return linha
+
 # ==================== EXECUÇÃO DO PROGRAMA ====================
 if __name__ == "__main__":
     """Executa o programa quando o arquivo é executado diretamente"""
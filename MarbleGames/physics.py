@@ -0,0 +1,468 @@
+"""
+Núcleo de física vetorizado das bolas (struct-of-arrays)
+Posições, velocidades, raios e contadores de quiques de todas as bolas ficam
+em arrays NumPy; gravidade, limite de velocidade, quiques nas bordas e
+impulsos entre bolas são aplicados em lote, com as mesmas regras da antiga
+Bola.atualizar / _colisao_bordas / colisao_com_bola de cada jogo.
+Cada jogo passa as suas constantes (GRAVIDADE, FORCA_QUIQUE, ...).
+"""
+
+import math
+from operator import attrgetter
+
+import numpy as np
+
+from spatial_hash import GradeEspacial
+
+LIMITE_ACELERACOES = 15  # Quiques que ainda aceleram a bola
+MINIMO_BOLAS_GRADE = 128  # Abaixo disso a força bruta é mais barata que montar a grade (ver benchmark)
+
+
+class SistemaBolas:
+    """Conjunto de bolas simulado em lote"""
+
+    def __init__(self, capacidade, largura, altura, gravidade, forca_quique, aceleracao_quique,
+                 velocidade_maxima, limite_aceleracoes=LIMITE_ACELERACOES):
+        """
+        capacidade: número máximo de bolas
+        largura, altura: tamanho da arena (bordas da tela)
+        gravidade, forca_quique, aceleracao_quique, velocidade_maxima: constantes do jogo
+        (por frame, como nas classes Bola dos jogos)
+        """
+        self.capacidade = capacidade
+        self.largura = largura
+        self.altura = altura
+        self.gravidade = gravidade
+        self.forca_quique = forca_quique
+        self.aceleracao_quique = aceleracao_quique
+        self.velocidade_maxima = velocidade_maxima
+        self.limite_aceleracoes = limite_aceleracoes
+
+        self.n = 0
+        self._x = np.zeros(capacidade)
+        self._y = np.zeros(capacidade)
+        self._vx = np.zeros(capacidade)
+        self._vy = np.zeros(capacidade)
+        self._raio = np.zeros(capacidade)
+        self._quiques = np.zeros(capacidade, dtype=np.int64)
+        # Posições no início do passo (deslocamento usado pelo teste de varredura)
+        self._x_inicio = np.zeros(capacidade)
+        self._y_inicio = np.zeros(capacidade)
+        self.grade = None  # Broadphase (criada quando há bolas suficientes)
+
+    # Views das bolas existentes (as operações em lote trabalham só com elas)
+    @property
+    def x(self):
+        return self._x[:self.n]
+
+    @property
+    def y(self):
+        return self._y[:self.n]
+
+    @property
+    def vx(self):
+        return self._vx[:self.n]
+
+    @property
+    def vy(self):
+        return self._vy[:self.n]
+
+    @property
+    def raio(self):
+        return self._raio[:self.n]
+
+    @property
+    def quiques(self):
+        return self._quiques[:self.n]
+
+    def adicionar(self, x, y, raio, vx=0.0, vy=0.0):
+        """Adiciona uma bola e retorna o seu índice"""
+        if self.n >= self.capacidade:
+            raise ValueError(f"SistemaBolas cheio ({self.capacidade} bolas)")
+        indice = self.n
+        self._x[indice] = x
+        self._y[indice] = y
+        self._vx[indice] = vx
+        self._vy[indice] = vy
+        self._raio[indice] = raio
+        self._quiques[indice] = 0
+        self.n += 1
+        return indice
+
+    # ==================== PASSO DE SIMULAÇÃO ====================
+    def atualizar(self, passo=1.0):
+        """
+        Avança a física de todas as bolas: integração e quiques nas bordas
+        passo: fração do frame (1 / subpassos); as constantes são por frame
+        """
+        self.marcar_inicio_passo()
+        self.integrar(passo)
+        self.colisao_bordas()
+
+    def marcar_inicio_passo(self):
+        """Guarda as posições atuais como início do passo (ver corrigir_tunelamento)"""
+        self._x_inicio[:self.n] = self.x
+        self._y_inicio[:self.n] = self.y
+
+    def integrar(self, passo=1.0):
+        """
+        Gravidade, limite de velocidade e atualização das posições
+        passo: fração do frame; gravidade e deslocamento são escalados por ele
+        (com passo 1.0 as contas são exatamente as de um frame inteiro)
+        """
+        vx, vy = self.vx, self.vy
+        vy += self.gravidade * passo
+
+        # Limita a velocidade máxima (mesma conta da Bola: fator = máxima / atual)
+        velocidade = np.sqrt(vx * vx + vy * vy)
+        rapidas = velocidade > self.velocidade_maxima
+        if rapidas.any():
+            fator = self.velocidade_maxima / velocidade[rapidas]
+            vx[rapidas] *= fator
+            vy[rapidas] *= fator
+
+        self.x[:] += vx * passo
+        self.y[:] += vy * passo
+
+    def colisao_bordas(self, bolas=None):
+        """
+        Quiques nas bordas da tela
+        Como na Bola: esquerda OU direita, depois superior OU inferior, e cada
+        quique acelera a bola (o quique vertical usa a velocidade já acelerada)
+        bolas: índices a testar de novo depois de um deslocamento extra no passo
+        (avancar_restante); só quicam as que estão indo em direção à borda
+        (None = todas, sem olhar o sentido)
+        """
+        x, y, vx, vy, raio = self.x, self.y, self.vx, self.vy, self.raio
+        if bolas is not None:
+            selecionadas = np.zeros(self.n, dtype=bool)
+            selecionadas[bolas] = True
+
+        esquerda = x - raio <= 0
+        direita = ~esquerda & (x + raio >= self.largura)
+        if bolas is not None:
+            esquerda &= selecionadas & (vx < 0)
+            direita &= selecionadas & (vx > 0)
+        horizontal = esquerda | direita
+        if horizontal.any():
+            x[esquerda] = raio[esquerda]
+            x[direita] = self.largura - raio[direita]
+            vx[horizontal] = -vx[horizontal] * self.forca_quique
+            self.acelerar_apos_quique(np.flatnonzero(horizontal))
+
+        superior = y - raio <= 0
+        inferior = ~superior & (y + raio >= self.altura)
+        if bolas is not None:
+            superior &= selecionadas & (vy < 0)
+            inferior &= selecionadas & (vy > 0)
+        vertical = superior | inferior
+        if vertical.any():
+            y[superior] = raio[superior]
+            y[inferior] = self.altura - raio[inferior]
+            vy[vertical] = -vy[vertical] * self.forca_quique
+            self.acelerar_apos_quique(np.flatnonzero(vertical))
+
+    def acelerar_apos_quique(self, indices):
+        """
+        Conta um quique para cada índice (repetidos contam várias vezes) e aplica
+        ACELERACAO_QUIQUE enquanto a bola tiver até limite_aceleracoes quiques
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.size == 0:
+            return
+        contagem = np.bincount(indices, minlength=self.n)
+        bolas = np.flatnonzero(contagem)
+        antes = self._quiques[bolas]
+        self._quiques[bolas] += contagem[bolas]
+        # Quantos desses quiques ainda estavam dentro do limite de acelerações
+        aceleracoes = np.clip(self.limite_aceleracoes - antes, 0, contagem[bolas])
+        fator = self.aceleracao_quique ** aceleracoes
+        self._vx[bolas] *= fator
+        self._vy[bolas] *= fator
+
+    # ==================== COLISÕES ENTRE BOLAS ====================
+    def pares_todos(self):
+        """Todos os pares (i < j) de bolas: força bruta O(n²)"""
+        return np.triu_indices(self.n, k=1)
+
+    def pares_candidatos(self):
+        """
+        Pares (i < j) que podem estar em contato
+        Poucas bolas: todos os pares; muitas: grade espacial com células do
+        tamanho do maior diâmetro (custo perto de linear)
+        """
+        if self.n < MINIMO_BOLAS_GRADE:
+            return self.pares_todos()
+        diametro = 2 * float(self.raio.max())
+        if self.grade is None or self.grade.tamanho_celula < diametro:
+            self.grade = GradeEspacial(self.largura, self.altura, diametro)
+        return self.grade.pares_candidatos(self.x, self.y)
+
+    def colisoes_entre_bolas(self, pares=None):
+        """
+        Separa as bolas sobrepostas e aplica o impulso de massas iguais
+        pares: (i, j) candidatos; None = pares_candidatos()
+        Retorna os pares que colidiram (i, j)
+        Os pares são resolvidos em lote (as correções de uma bola em vários
+        contatos são somadas); com um único par é igual à antiga colisao_com_bola
+        """
+        i, j = self.pares_candidatos() if pares is None else pares
+        if len(i) == 0:
+            return i, j
+
+        x, y, vx, vy, raio = self.x, self.y, self.vx, self.vy, self.raio
+        dx = x[j] - x[i]
+        dy = y[j] - y[i]
+        soma_raios = raio[i] + raio[j]
+        # Teste com distância ao quadrado; a raiz só é calculada para os contatos
+        dist2 = dx * dx + dy * dy
+        contato = (dist2 < soma_raios * soma_raios) & (dist2 > 0)
+        if not contato.any():
+            return i[:0], j[:0]
+
+        i, j, dx, dy, soma_raios = i[contato], j[contato], dx[contato], dy[contato], soma_raios[contato]
+        distancia = np.sqrt(dist2[contato])
+        # Normal pelo ângulo (como na colisao_com_bola original): mantém os mesmos
+        # resultados de ponto flutuante que as partidas já gravadas. O np.arctan2
+        # difere do math.atan2 no último bit, então o ângulo vem do math (só os
+        # pares em contato, que são poucos)
+        angulo = np.fromiter(map(math.atan2, dy.tolist(), dx.tolist()), dtype=np.float64, count=len(dx))
+        nx = np.cos(angulo)
+        ny = np.sin(angulo)
+
+        # Separa as bolas para evitar sobreposição
+        sobreposicao = (soma_raios - distancia) / 2
+        np.subtract.at(x, i, nx * sobreposicao)
+        np.subtract.at(y, i, ny * sobreposicao)
+        np.add.at(x, j, nx * sobreposicao)
+        np.add.at(y, j, ny * sobreposicao)
+
+        # Só resolve se as bolas estão se aproximando
+        velocidade_normal = (vx[i] - vx[j]) * nx + (vy[i] - vy[j]) * ny
+        aproximando = velocidade_normal > 0
+        if aproximando.any():
+            ia, ja = i[aproximando], j[aproximando]
+            impulso = 2 * velocidade_normal[aproximando] / 2  # Massas iguais
+            ix = impulso * nx[aproximando] * self.forca_quique
+            iy = impulso * ny[aproximando] * self.forca_quique
+            np.subtract.at(vx, ia, ix)
+            np.subtract.at(vy, ia, iy)
+            np.add.at(vx, ja, ix)
+            np.add.at(vy, ja, iy)
+            self.acelerar_apos_quique(np.concatenate((ia, ja)))
+        return i, j
+
+
+# ==================== COLISÕES COM CONTORNOS (ANÉIS) ====================
+MARGEM_PRE_FILTRO = 1e-9  # Margem relativa do pré-filtro com distâncias ao quadrado
+
+
+def contatos_aneis(bx, by, braio, ax, ay, araio, espessura):
+    """
+    Teste do anel para todas as bolas x todos os contornos em uma passada
+    Mesma condição da colisao_com_contorno dos jogos: a bola está dentro do
+    contorno (distancia < raio) e perto da linha (|distancia - raio| <= raio_bola + espessura)
+    bx, by, braio: arrays (bolas,); ax, ay, araio: arrays (contornos,)
+    Retorna (contato, nx, ny), arrays (bolas, contornos): máscara dos contatos e
+    normal unitária do centro do contorno para a bola (zero fora dos contatos)
+    """
+    dx = bx[:, None] - ax[None, :]
+    dy = by[:, None] - ay[None, :]
+    dist2 = dx * dx + dy * dy
+    raio_contorno = araio[None, :]
+    limite = braio[:, None] + espessura
+
+    # Pré-filtro só com distâncias ao quadrado: dentro do contorno e fora do
+    # círculo interno (raio - raio_bola - espessura); a margem cobre o arredondamento
+    interno = raio_contorno - limite
+    candidatos = ((dist2 > 0) & (dist2 < raio_contorno * raio_contorno * (1 + MARGEM_PRE_FILTRO))
+                  & ((interno <= 0) | (dist2 >= interno * interno * (1 - MARGEM_PRE_FILTRO))))
+
+    contato = np.zeros(dist2.shape, dtype=bool)
+    nx = np.zeros(dist2.shape)
+    ny = np.zeros(dist2.shape)
+    b, a = np.nonzero(candidatos)
+    if b.size:
+        # Teste exato (com a raiz) só nos candidatos
+        distancia = np.sqrt(dist2[b, a])
+        exato = (distancia < araio[a]) & (np.abs(distancia - araio[a]) <= limite[b, 0])
+        b, a, distancia = b[exato], a[exato], distancia[exato]
+        contato[b, a] = True
+        nx[b, a] = dx[b, a] / distancia
+        ny[b, a] = dy[b, a] / distancia
+    return contato, nx, ny
+
+
+def contatos_em_ordem(bolas, contornos, espessura):
+    """
+    Gera, na ordem da lista, os contornos em contato com alguma das bolas
+    O teste é feito em lote para todos os contornos restantes; depois de cada
+    contorno entregue (o jogo resolve o quique e a bola muda de posição) o teste
+    é refeito a partir do contorno seguinte. Assim o resultado é o mesmo de
+    testar contorno por contorno, mas os contornos sem contato (quase todos)
+    não passam pelo Python
+    bolas, contornos: objetos com x, y e raio
+    """
+    if not contornos:
+        return
+    ax = np.array([contorno.x for contorno in contornos], dtype=np.float64)
+    ay = np.array([contorno.y for contorno in contornos], dtype=np.float64)
+    araio = np.array([contorno.raio for contorno in contornos], dtype=np.float64)
+
+    k = 0
+    while k < len(contornos):
+        bx = np.array([bola.x for bola in bolas])
+        by = np.array([bola.y for bola in bolas])
+        braio = np.array([bola.raio for bola in bolas])
+        contato, _, _ = contatos_aneis(bx, by, braio, ax[k:], ay[k:], araio[k:], espessura)
+        tocados = np.flatnonzero(contato.any(axis=0))
+        if tocados.size == 0:
+            return
+        k += int(tocados[0])
+        yield contornos[k]
+        k += 1
+
+
+def tempos_impacto_aneis(x0, y0, x1, y1, braio, ax, ay, araio, espessura, araio0=None):
+    """
+    Teste de varredura (swept circle) das bolas contra os contornos
+    Uma bola "atravessou" um contorno quando começou o passo dentro dele e
+    terminou fora: o teste discreto (contatos_aneis) só olha a posição final e
+    perde esse quique. Para cada travessia calcula a fração t do deslocamento em
+    que o centro da bola chega ao meio da faixa de contato (raio - (raio_bola +
+    espessura) / 2), onde o teste discreto certamente detecta o contato
+    O raio do contorno é interpolado linearmente de araio0 (início do passo) até
+    araio (fim do passo), já que os contornos diminuem ou pulsam durante o passo.
+    O centro (ax, ay) é o do fim do passo e é tratado como fixo: os contornos dos
+    jogos nascem no centro de atração e não saem dele
+    x0, y0 / x1, y1: arrays (bolas,) com as posições no início e no fim do passo
+    araio0: raios dos contornos no início do passo (None = raio constante)
+    Retorna (t, anel), arrays (bolas,): fração do primeiro contorno atravessado
+    e o seu índice (inf e -1 para bolas que não atravessaram nenhum)
+    """
+    if araio0 is None:
+        araio0 = araio
+    dx = x1 - x0
+    dy = y1 - y0
+    ox = x0[:, None] - ax[None, :]
+    oy = y0[:, None] - ay[None, :]
+    fx = x1[:, None] - ax[None, :]
+    fy = y1[:, None] - ay[None, :]
+    atravessou = ((ox * ox + oy * oy < araio0[None, :] * araio0[None, :])
+                  & (fx * fx + fy * fy >= araio[None, :] * araio[None, :]))
+
+    t = np.full(atravessou.shape, np.inf)
+    b, a = np.nonzero(atravessou)
+    if b.size:
+        # Meio da faixa no início do passo e a sua variação até o fim: alvo(t) = alvo0 + t * dalvo
+        alvo0 = np.maximum(araio0[a] - (braio[b] + espessura) / 2, 0.0)
+        dalvo = np.maximum(araio[a] - (braio[b] + espessura) / 2, 0.0) - alvo0
+        # |p0 + t * d - c|² = alvo(t)²  ->  qa t² + 2 qb t + qc = 0
+        qa = dx[b] * dx[b] + dy[b] * dy[b] - dalvo * dalvo
+        qb = dx[b] * ox[b, a] + dy[b] * oy[b, a] - alvo0 * dalvo
+        qc = ox[b, a] * ox[b, a] + oy[b, a] * oy[b, a] - alvo0 * alvo0
+        # qc < 0: a bola começou antes do meio da faixa e há uma única raiz positiva;
+        # qc >= 0 (ou faixa mais rápida que a bola, qa <= 0): volta para o início do passo
+        valida = (qc < 0) & (qa > 0)
+        divisor = np.where(valida, qa, 1.0)
+        raiz = (-qb + np.sqrt(np.maximum(qb * qb - qa * qc, 0.0))) / divisor
+        t[b, a] = np.where(valida, np.clip(raiz, 0.0, 1.0), 0.0)
+
+    anel = np.argmin(t, axis=1)
+    t_min = t[np.arange(len(x0)), anel]
+    anel[np.isinf(t_min)] = -1
+    return t_min, anel
+
+
+def corrigir_tunelamento(sistema, contornos, espessura):
+    """
+    Detecção contínua de colisões com os contornos para bolas rápidas
+    Só as bolas que se deslocaram mais que a espessura do contorno no passo
+    passam pelo teste de varredura; as que atravessaram algum contorno voltam
+    pela trajetória até o ponto de contato com o primeiro deles, e o teste
+    discreto (contatos_em_ordem) resolve o quique normalmente. Depois das
+    colisões, avancar_restante completa o passo dessas bolas
+    Deve ser chamada depois de sistema.atualizar / colisoes_entre_bolas e antes
+    das colisões com os contornos
+    sistema: SistemaBolas; contornos: objetos com x, y, raio e raio_inicio
+    (raio no início do passo); o centro é considerado fixo durante o passo
+    Retorna (bolas, t): índices das bolas corrigidas e a fração do passo em que
+    cada uma chegou ao contorno
+    """
+    x, y = sistema.x, sistema.y
+    x0, y0 = sistema._x_inicio[:sistema.n], sistema._y_inicio[:sistema.n]
+    dx = x - x0
+    dy = y - y0
+    rapidas = np.flatnonzero(dx * dx + dy * dy > espessura * espessura)
+    if rapidas.size == 0 or not contornos:
+        return rapidas[:0], np.zeros(0)
+
+    ax = np.array([contorno.x for contorno in contornos], dtype=np.float64)
+    ay = np.array([contorno.y for contorno in contornos], dtype=np.float64)
+    araio = np.array([contorno.raio for contorno in contornos], dtype=np.float64)
+    araio0 = np.array([contorno.raio_inicio for contorno in contornos], dtype=np.float64)
+    t, anel = tempos_impacto_aneis(x0[rapidas], y0[rapidas], x[rapidas], y[rapidas],
+                                   sistema.raio[rapidas], ax, ay, araio, espessura, araio0)
+    corrigidas = anel >= 0
+    bolas, t = rapidas[corrigidas], t[corrigidas]
+    x[bolas] = x0[bolas] + dx[bolas] * t
+    y[bolas] = y0[bolas] + dy[bolas] * t
+    return bolas, t
+
+
+def avancar_restante(sistema, bolas, t, passo=1.0):
+    """
+    Completa o passo das bolas que corrigir_tunelamento levou de volta ao contorno:
+    depois das colisões elas andam a fração (1 - t) do passo que faltava com a
+    velocidade atual (já refletida, se quicaram), e as bordas da tela são testadas
+    de novo para elas (o teste das bordas do passo já rodou em sistema.atualizar).
+    O restante não é subdividido: um segundo contorno no caminho só é tratado no
+    próximo passo, e a borda é tratada pelo teste discreto (posição limitada à tela)
+    bolas, t: retorno de corrigir_tunelamento; passo: fração do frame (1 / subpassos)
+    """
+    if len(bolas) == 0:
+        return
+    restante = (1.0 - t) * passo
+    sistema.x[bolas] += sistema.vx[bolas] * restante
+    sistema.y[bolas] += sistema.vy[bolas] * restante
+    sistema.colisao_bordas(bolas)
+
+
+def campo_array(nome, tipo=float, dono="sistema"):
+    """
+    Propriedade que lê/escreve o campo de um objeto no array do seu dono
+    (bola no SistemaBolas, contorno no PoolContornos...)
+    nome: atributo do dono com o array; dono: atributo do objeto que aponta para o dono
+    O objeto guarda o seu índice no array em self.indice
+    """
+    array = attrgetter(f"{dono}.{nome}")
+
+    def ler(self):
+        return tipo(array(self)[self.indice])
+
+    def escrever(self, valor):
+        array(self)[self.indice] = valor
+
+    return property(ler, escrever)
+
+
+class BolaSistema:
+    """
+    Base das classes Bola dos jogos: os atributos físicos (x, y, vx, vy, raio,
+    quiques) são views do SistemaBolas; a bola guarda só o que é do jogo (cor, imagem...)
+    """
+
+    x = campo_array("x")
+    y = campo_array("y")
+    vx = campo_array("vx")
+    vy = campo_array("vy")
+    raio = campo_array("raio")
+    quiques = campo_array("quiques", int)
+
+    def __init__(self, sistema, x, y, raio):
+        self.sistema = sistema
+        self.indice = sistema.adicionar(x, y, raio)
+
+    def _acelerar_apos_quique(self):
+        """Acelera a bola após um quique"""
+        self.sistema.acelerar_apos_quique([self.indice])
@@ -0,0 +1,87 @@
+"""
+Configuração do modo de renderização dos jogos
+Deve ser importado ANTES de pygame.init(): no modo headless o driver de
+vídeo do SDL precisa ser trocado para "dummy" antes da inicialização.
+Também deve vir antes de qualquer uso de random: a semente da execução é
+aplicada aqui, antes das cores e constantes sorteadas na importação.
+"""
+
+import os
+import random
+import sys
+import time
+
+import pygame
+
+# ==================== CONFIGURAÇÕES DO MODO DE RENDERIZAÇÃO ====================
+# As variáveis de ambiente são definidas pelo execute.py ao iniciar o jogo
+MODO_HEADLESS = os.environ.get("TOKAI_HEADLESS") == "1"      # True = sem janela (driver SDL dummy)
+SAIDA_VIDEO = os.environ.get("TOKAI_SAIDA_VIDEO", "")         # Arquivo de vídeo gravado pelo próprio jogo
+MEMORIA_COMPARTILHADA = os.environ.get("TOKAI_SHM", "")       # Anel de frames lido pelo gravador (execute.py)
+MODO_RAPIDO = os.environ.get("TOKAI_RAPIDO") == "1"          # True = passo fixo, sem esperar o relógio
+FPS_JOGO = 60                                                 # Frames de simulação por segundo
+FPS_VIDEO = float(os.environ.get("TOKAI_FPS_VIDEO", "24"))   # Frames gravados por segundo de jogo
+SUBPASSOS = max(1, int(os.environ.get("TOKAI_SUBPASSOS", "1")))  # Subpassos de física por frame de jogo
+PASSO_FISICA = 1.0 / SUBPASSOS                                # Fração do frame avançada em cada subpasso
+ARQUIVO_REPLAY = os.environ.get("TOKAI_REPLAY", "")          # Replay (.npy) do estado de cada frame
+
+
+def ler_semente():
+    """
+    Semente da execução: --seed N na linha de comando ou TOKAI_SEED
+    Sem nenhuma das duas, sorteia uma (a execução continua reproduzível pela semente impressa)
+    """
+    for i, arg in enumerate(sys.argv):
+        if arg.startswith("--seed="):
+            return int(arg.split("=", 1)[1])
+        if arg == "--seed" and i + 1 < len(sys.argv):
+            return int(sys.argv[i + 1])
+    if os.environ.get("TOKAI_SEED"):
+        return int(os.environ["TOKAI_SEED"])
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+# Mesma semente = mesmas cores, constantes, imagens e placares
+# (bit a bit no modo rápido, em que o passo não depende do relógio)
+SEMENTE = ler_semente()
+random.seed(SEMENTE)
+print(f"Semente: {SEMENTE}")
+
+if MODO_HEADLESS:
+    # Sem janela e sem áudio: permite rodar em servidores Linux sem display
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+class RelogioJogo:
+    """
+    Relógio do loop principal dos jogos
+    Tempo real: limita a 60 fps com pygame.time.Clock e mede o tempo com time.time()
+    Modo rápido: avança exatamente 1/60 s por frame, sem dormir, e o tempo é
+    contado em frames (mesmos frames do tempo real, no máximo da CPU)
+    """
+
+    def __init__(self, fps=FPS_JOGO):
+        self.fps = fps
+        self.frames = 0
+        self.inicio = time.time()
+        self.clock = pygame.time.Clock()
+
+    def tick(self):
+        """Avança um frame e retorna o delta time em segundos"""
+        self.frames += 1
+        if MODO_RAPIDO:
+            return 1 / self.fps
+        return self.clock.tick(self.fps) / 1000.0
+
+    def tempo_decorrido(self):
+        """Retorna o tempo de jogo decorrido em segundos"""
+        if MODO_RAPIDO:
+            return self.frames / self.fps
+        return time.time() - self.inicio
+
+
+def aguardar(segundos):
+    """Pausa o jogo (telas de empate e fim de jogo); no modo rápido não dorme"""
+    if not MODO_RAPIDO:
+        time.sleep(segundos)
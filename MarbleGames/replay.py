@@ -0,0 +1,450 @@
+"""
+Replays compactos das partidas
+Durante o jogo (TOKAI_REPLAY=<arquivo>.npy, definido pelo execute.py --replay)
+o estado de cada frame é gravado em um array estruturado float32: posição e
+cor das bolas, slots do pool de contornos (posição, raio, alpha, cor, estado e
+ordem) e os campos do jogo (placar, tempo...). O array é salvo como .npy
+(lido com memory map) e os metadados (jogo, semente, constantes sorteadas,
+nomes, telas de empate/destaque/fim) em um .json ao lado.
+
+O renderizador redesenha a partida com as funções de desenho do próprio jogo,
+sem física, no máximo da CPU e com constantes de estilo trocadas
+(--param COR_FUNDO="(20,20,20)"). O desenho é sempre na resolução do jogo:
+--size só redimensiona os frames prontos (smoothscale), então um vídeo maior
+que a tela do jogo é uma ampliação, sem mais detalhes:
+    python MarbleGames/replay.py output.replay.npy --out replay.avi --size 1080x1920
+"""
+
+import os
+
+# O renderizador não abre janela nem espera nas telas fixas (antes do render_mode/pygame)
+if __name__ == "__main__":
+    os.environ.setdefault("TOKAI_HEADLESS", "1")
+    os.environ.setdefault("TOKAI_RAPIDO", "1")
+
+import argparse
+import ast
+import atexit
+import importlib
+import json
+import math
+import time
+
+import numpy as np
+import pygame
+
+import frame_sink
+import render_mode
+import simulation
+
+VERSAO = 1
+
+# Estado dos slots de contorno no replay
+LIVRE, VIVO, DESTRUIDO = 0, 1, 2
+
+FRAMES_INICIAIS = 60 * 60  # Frames pré-alocados (o array dobra quando enche)
+
+
+def caminho_metadados(caminho):
+    """<replay>.json ao lado do <replay>.npy"""
+    return os.path.splitext(caminho)[0] + ".json"
+
+
+def tipo_frame(quantidade_bolas, capacidade_contornos, campos=()):
+    """dtype de um frame do replay"""
+    return np.dtype([
+        ("bolas", np.float32, (quantidade_bolas, 2)),         # x, y
+        ("cor_bolas", np.uint8, (quantidade_bolas, 3)),
+        ("contornos", np.float32, (capacidade_contornos, 4)),  # x, y, raio, alpha
+        ("cor_contornos", np.uint8, (capacidade_contornos, 3)),
+        ("tipo_contornos", np.int8, (capacidade_contornos,)),
+        ("estado_contornos", np.uint8, (capacidade_contornos,)),  # LIVRE, VIVO ou DESTRUIDO
+        ("ordem_contornos", np.int32, (capacidade_contornos,)),
+    ] + [(nome, np.float32) for nome in campos])
+
+
+def float32_piso(valores):
+    """
+    Converte para float32 arredondando para baixo: int() do valor gravado é o
+    mesmo do valor original (os jogos desenham com coordenadas inteiras)
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    convertidos = valores.astype(np.float32)
+    acima = convertidos > valores
+    if acima.any():
+        convertidos[acima] = np.nextafter(convertidos[acima], np.float32(-np.inf))
+    return convertidos
+
+
+def float32_piso_escalar(valor):
+    """float32_piso de um único valor, sem criar arrays (gravação a cada frame)"""
+    convertido = np.float32(valor)
+    if float(convertido) > valor:  # Comparação em float64 (float32 > float compara em float32)
+        convertido = np.nextafter(convertido, np.float32(-np.inf))
+    return convertido
+
+
+def constantes_jogo(modulo):
+    """
+    Constantes em MAIÚSCULAS do jogo que podem ir para o JSON (cores sorteadas, espessuras...)
+    Caminhos absolutos (ex.: PASTA_PROJETO) são da máquina da gravação e ficam de fora
+    """
+    constantes = {}
+    for nome, valor in vars(modulo).items():
+        if isinstance(valor, str) and os.path.isabs(valor):
+            continue
+        if nome.isupper() and isinstance(valor, (bool, int, float, str, tuple, list)):
+            try:
+                json.dumps(valor)
+            except TypeError:
+                continue
+            constantes[nome] = valor
+    return constantes
+
+
+def restaurar_valor(valor):
+    """Listas do JSON voltam a ser tuplas (cores), inclusive dentro de listas"""
+    if isinstance(valor, list):
+        return tuple(restaurar_valor(item) for item in valor)
+    return valor
+
+
+class GravadorReplay:
+    """Grava o estado de cada frame de uma partida"""
+
+    def __init__(self, caminho, modulo, bolas, contornos=None, campos=(), metadados=None):
+        """
+        caminho: arquivo .npy do replay
+        modulo: módulo do jogo (nome e constantes vão para os metadados)
+        bolas: bolas do jogo (BolaSistema com cor), na ordem de desenho
+        contornos: PoolContornos do jogo (None = jogo sem contornos no pool)
+        campos: nomes dos valores por frame passados para gravar() (placar, tempo...)
+        metadados: dados fixos da partida (nomes, imagens...)
+        """
+        self.caminho = caminho
+        self.bolas = bolas
+        self.contornos = contornos
+        self.campos = tuple(campos)
+        capacidade = contornos.capacidade if contornos is not None else 0
+        self.frames = np.zeros(FRAMES_INICIAIS, dtype=tipo_frame(len(bolas), capacidade, self.campos))
+        self.quantidade = 0
+        self.fechado = False
+        self.metadados = {
+            "versao": VERSAO,
+            "jogo": os.path.splitext(os.path.basename(modulo.__file__))[0],  # O jogo roda como __main__
+            "semente": render_mode.SEMENTE,
+            "fps_jogo": render_mode.FPS_JOGO,
+            "fps_video": render_mode.FPS_VIDEO,
+            "subpassos": render_mode.SUBPASSOS,
+            "largura": modulo.LARGURA,
+            "altura": modulo.ALTURA,
+            "campos": list(self.campos),
+            "constantes": constantes_jogo(modulo),
+            "telas": [],
+            **(metadados or {}),
+        }
+
+    def gravar(self, **valores):
+        """Grava o estado atual como o próximo frame (valores: um por nome de campos)"""
+        if self.quantidade == len(self.frames):
+            self.frames = np.concatenate([self.frames, np.zeros_like(self.frames)])
+        frame = self.frames[self.quantidade]
+
+        for i, bola in enumerate(self.bolas):
+            frame["bolas"][i] = float32_piso((bola.x, bola.y))
+            frame["cor_bolas"][i] = bola.cor[:3]
+
+        pool = self.contornos
+        if pool is not None:
+            frame["contornos"][:, 0] = float32_piso(pool.x)
+            frame["contornos"][:, 1] = float32_piso(pool.y)
+            frame["contornos"][:, 2] = float32_piso(pool.raio)
+            frame["contornos"][:, 3] = float32_piso(pool.alpha)
+            frame["cor_contornos"] = pool.cor
+            frame["tipo_contornos"] = pool.tipo
+            frame["estado_contornos"] = np.where(pool.ativo, np.where(pool.destruido, DESTRUIDO, VIVO), LIVRE)
+            frame["ordem_contornos"] = pool.ordem
+
+        for nome in self.campos:
+            frame[nome] = float32_piso(valores[nome])
+        self.quantidade += 1
+
+    def marcar_tela(self, tipo, **dados):
+        """
+        Registra uma tela fora da partida (empate, destaque, fim de jogo) mostrada antes do próximo frame
+        dados: o que o jogo precisa para redesenhar a tela (placar, vencedor...)
+        """
+        self.metadados["telas"].append({"frame": self.quantidade, "tipo": tipo, **dados})
+
+    def fechar(self):
+        """Salva o .npy e o .json do replay"""
+        if self.fechado:
+            return
+        self.fechado = True
+        np.save(self.caminho, self.frames[:self.quantidade])
+        self.metadados["frames"] = self.quantidade
+        with open(caminho_metadados(self.caminho), "w", encoding="utf-8") as arquivo:
+            json.dump(self.metadados, arquivo, indent=2)
+        tamanho = os.path.getsize(self.caminho) / 1024 ** 2
+        print(f"Replay gravado: {self.caminho} ({self.quantidade} frames, {tamanho:.1f} MB)")
+
+
+def criar_gravador(modulo, bolas, contornos=None, campos=(), metadados=None):
+    """
+    Cria o gravador de replay configurado pelo modo de renderização
+    Retorna None quando a execução não grava replay (sem TOKAI_REPLAY)
+    """
+    if not render_mode.ARQUIVO_REPLAY:
+        return None
+    gravador = GravadorReplay(render_mode.ARQUIVO_REPLAY, modulo, bolas, contornos, campos, metadados)
+    # Os jogos terminam com sys.exit() em vários pontos: garante que o replay seja salvo
+    atexit.register(gravador.fechar)
+    return gravador
+
+
+class EstadosFrames:
+    """
+    Base do Replay e do BufferCircular: copia o estado de um frame (índice =
+    número do frame na partida) de volta para os objetos do jogo
+    fracao: interpola posições e campos em direção ao frame seguinte (câmera lenta)
+    """
+
+    def _frame(self, indice):
+        """Registro do frame (implementado pelas subclasses)"""
+        raise NotImplementedError
+
+    def _interpolar(self, indice, nome, fracao):
+        atual = self._frame(indice)[nome]
+        if not fracao:
+            return atual
+        return atual + (self._frame(indice + 1)[nome] - atual) * fracao
+
+    def restaurar_bolas(self, indice, bolas, fracao=0.0):
+        """Copia posição e cor das bolas do frame para as bolas do jogo"""
+        posicoes = self._interpolar(indice, "bolas", fracao)
+        cores = self._frame(indice)["cor_bolas"]
+        for i, bola in enumerate(bolas):
+            bola.x, bola.y = (float(valor) for valor in posicoes[i])
+            bola.cor = tuple(int(canal) for canal in cores[i])
+
+    def restaurar_contornos(self, indice, pool):
+        """
+        Copia os slots de contorno do frame para o PoolContornos do jogo
+        O pool pode ter mais slots que a gravação (capacidade calculada de outra
+        forma): os slots que sobram ficam livres
+        """
+        frame = self._frame(indice)
+        n = len(frame["estado_contornos"])
+        pool.x[:n] = frame["contornos"][:, 0]
+        pool.y[:n] = frame["contornos"][:, 1]
+        pool.raio[:n] = frame["contornos"][:, 2]
+        pool.alpha[:n] = frame["contornos"][:, 3]
+        pool.cor[:n] = frame["cor_contornos"]
+        pool.tipo[:n] = frame["tipo_contornos"]
+        pool.ativo[:n] = frame["estado_contornos"] != LIVRE
+        pool.ativo[n:] = False
+        pool.destruido[:n] = frame["estado_contornos"] == DESTRUIDO
+        pool.ordem[:n] = frame["ordem_contornos"]
+
+    def campo(self, indice, nome, fracao=0.0):
+        """Valor de um campo do jogo no frame"""
+        return float(self._interpolar(indice, nome, fracao))
+
+
+class Replay(EstadosFrames):
+    """Replay gravado: frames em memory map e metadados"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.frames = np.load(caminho, mmap_mode="r")
+        with open(caminho_metadados(caminho), encoding="utf-8") as arquivo:
+            self.metadados = json.load(arquivo)
+        if self.metadados.get("versao") != VERSAO:
+            raise ValueError(f"Versão de replay não suportada: {self.metadados.get('versao')}")
+        self.jogo = self.metadados["jogo"]
+
+    def __len__(self):
+        return len(self.frames)
+
+    def _frame(self, indice):
+        return self.frames[indice]
+
+    def telas(self):
+        """Telas fora da partida agrupadas pelo frame antes do qual são mostradas"""
+        por_frame = {}
+        for tela in self.metadados["telas"]:
+            por_frame.setdefault(tela["frame"], []).append(tela)
+        return por_frame
+
+
+class BufferCircular(EstadosFrames):
+    """
+    Últimos frames da partida em um array pré-alocado (replay instantâneo)
+    A memória é fixa (capacidade frames) qualquer que seja a duração da partida:
+    cada frame gravado sobrescreve o mais antigo, sem alocação por frame
+    """
+
+    def __init__(self, capacidade, bolas, campos=()):
+        """
+        capacidade: frames guardados (ex.: 3 s * FPS_JOGO)
+        bolas: bolas do jogo (BolaSistema com cor)
+        campos: nomes dos valores por frame passados para gravar()
+        """
+        self.capacidade = capacidade
+        self.bolas = bolas
+        self.frames = np.zeros(capacidade, dtype=tipo_frame(len(bolas), 0, campos))
+        # Views das colunas: a gravação escreve escalares direto no slot
+        self._posicoes = self.frames["bolas"]
+        self._cores = self.frames["cor_bolas"]
+        self._campos = {nome: self.frames[nome] for nome in campos}
+        self.quantidade = 0  # Frames gravados desde o início (o último é quantidade - 1)
+
+    def gravar(self, **valores):
+        """Grava o estado atual como o próximo frame (mesma interface do GravadorReplay)"""
+        slot = self.quantidade % self.capacidade
+        # Mesmo arredondamento do GravadorReplay: o replay redesenha o destaque igual
+        for i, bola in enumerate(self.bolas):
+            self._posicoes[slot, i, 0] = float32_piso_escalar(bola.x)
+            self._posicoes[slot, i, 1] = float32_piso_escalar(bola.y)
+            for canal in range(3):
+                self._cores[slot, i, canal] = bola.cor[canal]
+        for nome, coluna in self._campos.items():
+            coluna[slot] = float32_piso_escalar(valores[nome])
+        self.quantidade += 1
+
+    def primeiro_disponivel(self):
+        """Frame mais antigo ainda no buffer"""
+        return max(0, self.quantidade - self.capacidade)
+
+    def _frame(self, indice):
+        if not self.primeiro_disponivel() <= indice < self.quantidade:
+            raise IndexError(f"Frame {indice} fora do buffer ({self.primeiro_disponivel()}..{self.quantidade - 1})")
+        return self.frames[indice % self.capacidade]
+
+
+def ler_tamanho(texto):
+    """Converte "LARGURAxALTURA" em (largura, altura)"""
+    largura, _, altura = texto.lower().partition("x")
+    return int(largura), int(altura)
+
+
+def ler_parametro(texto):
+    """Converte "NOME=valor" em (NOME, valor) com o valor como literal Python"""
+    nome, separador, valor = texto.partition("=")
+    if not separador:
+        raise ValueError(f"Parâmetro sem valor: {texto} (use NOME=valor)")
+    try:
+        return nome.strip(), ast.literal_eval(valor)
+    except (ValueError, SyntaxError):
+        raise ValueError(f"Valor inválido para {nome}: {valor}")
+
+
+class DestinoVideoRedimensionado(frame_sink.DestinoVideoWriter):
+    """
+    DestinoVideoWriter que redimensiona (smoothscale) a TELA do jogo já desenhada
+    para a resolução do vídeo; não redesenha na resolução maior
+    """
+
+    def __init__(self, caminho, largura, altura, fps_video=None, fps_jogo=None):
+        super().__init__(caminho, largura, altura, fps_video, fps_jogo)
+        self.superficie = pygame.Surface((largura, altura))  # Reutilizada em todos os frames
+
+    def _gravar(self, superficie, retangulos=None):
+        tamanho_jogo = superficie.get_size()
+        if tamanho_jogo != (self.largura, self.altura):
+            pygame.transform.smoothscale(superficie, (self.largura, self.altura), self.superficie)
+            superficie = self.superficie
+            if retangulos is not None:
+                retangulos = redimensionar_retangulos(retangulos, tamanho_jogo, (self.largura, self.altura))
+        super()._gravar(superficie, retangulos)
+
+
+def redimensionar_retangulos(retangulos, origem, destino):
+    """
+    Retângulos alterados na resolução do jogo levados para a do vídeo
+    Cada um cresce pela área de influência do filtro do smoothscale, então os
+    pixels de fora dependem só de pixels que não mudaram
+    """
+    escala_x = destino[0] / origem[0]
+    escala_y = destino[1] / origem[1]
+    margem_x = math.ceil(escala_x) + 2
+    margem_y = math.ceil(escala_y) + 2
+    redimensionados = []
+    for retangulo in retangulos:
+        esquerda = math.floor(retangulo.left * escala_x) - margem_x
+        topo = math.floor(retangulo.top * escala_y) - margem_y
+        direita = math.ceil(retangulo.right * escala_x) + margem_x
+        base = math.ceil(retangulo.bottom * escala_y) + margem_y
+        redimensionados.append(pygame.Rect(esquerda, topo, direita - esquerda, base - topo))
+    return redimensionados
+
+
+def renderizar(replay, caminho_saida, tamanho=None, fps_video=None, parametros=None):
+    """
+    Redesenha o replay em um vídeo (sem física)
+    tamanho: (largura, altura) do vídeo (None = resolução do jogo)
+    fps_video: FPS do vídeo (None = o da gravação)
+    parametros: constantes de estilo do jogo a sobrescrever
+    Retorna o número de frames de vídeo gravados
+    """
+    modulo = importlib.import_module(replay.jogo)
+    constantes = {nome: restaurar_valor(valor) for nome, valor in replay.metadados["constantes"].items()
+                  if hasattr(modulo, nome)}
+    constantes.update(parametros or {})
+
+    with simulation.parametros_jogo(modulo, constantes):
+        modulo.iniciar_tela()
+        tela = modulo.TELA
+        largura, altura = tamanho or tela.get_size()
+        destino = DestinoVideoRedimensionado(caminho_saida, largura, altura,
+                                             fps_video=fps_video or replay.metadados["fps_video"],
+                                             fps_jogo=replay.metadados["fps_jogo"])
+        # As telas do jogo (empate, destaque, fim) gravam os seus frames no DESTINO_FRAMES do módulo
+        modulo.DESTINO_FRAMES = destino
+        desenhar_frame, reproduzir_tela = modulo.criar_reproducao(replay)
+        telas = replay.telas()
+        try:
+            for indice in range(len(replay)):
+                for dados_tela in telas.get(indice, []):
+                    reproduzir_tela(tela, dados_tela)
+                # Frames descartados pela conversão para o FPS do vídeo não são desenhados
+                if destino.precisa_frame():
+                    desenhar_frame(tela, indice)
+                destino.enviar(tela)
+            for dados_tela in telas.get(len(replay), []):
+                reproduzir_tela(tela, dados_tela)
+        finally:
+            destino.fechar()
+            pygame.quit()
+    return destino.frames_gravados
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Renderiza um replay gravado sem rodar a física')
+    parser.add_argument('replay', help='Arquivo .npy do replay (com o .json ao lado)')
+    parser.add_argument('--out', default='replay.avi', help='Vídeo gerado')
+    parser.add_argument('--size', type=ler_tamanho, help='Resolução do vídeo, ex.: 1080x1920 (os frames do jogo são redimensionados, não redesenhados)')
+    parser.add_argument('--fps', type=float, help='FPS do vídeo (padrão: o da gravação)')
+    parser.add_argument('--param', action='append', default=[], metavar='NOME=valor',
+                        help='Constante de estilo do jogo, ex.: COR_FUNDO="(20,20,20)" (repetível)')
+    args = parser.parse_args()
+
+    try:
+        parametros = dict(ler_parametro(texto) for texto in args.param)
+    except ValueError as e:
+        parser.error(str(e))
+
+    replay = Replay(args.replay)
+    inicio = time.time()
+    try:
+        gravados = renderizar(replay, args.out, args.size, args.fps, parametros)
+    except KeyError as e:
+        parser.error(e.args[0])
+    decorrido = time.time() - inicio
+    duracao = gravados / (args.fps or replay.metadados["fps_video"])
+    print(f"{replay.jogo}: {len(replay)} frames do jogo em {decorrido:.1f}s "
+          f"({duracao / decorrido:.1f}x o tempo real)")
+
+
+if __name__ == "__main__":
+    main()
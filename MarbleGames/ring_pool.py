@@ -0,0 +1,204 @@
+"""
+Pool de contornos em um array estruturado do NumPy
+Todos os contornos de um jogo ficam em um array de capacidade fixa (posição,
+raio, velocidade, alpha, cor, tipo e estado); diminuição, movimento em direção
+ao centro, fade e desativação são aplicados em lote. Os slots dos contornos
+desativados voltam para uma pilha de slots livres e são reaproveitados, então
+nenhum objeto é criado durante o jogo.
+Cada slot tem um objeto ContornoPool fixo (sem __dict__) com a mesma interface
+da antiga classe Contorno (x, y, raio, ativo, destruido, alpha, cor, destruir).
+"""
+
+import math
+
+import numpy as np
+
+from physics import campo_array
+
+VELOCIDADE_FADE = 15  # Quanto o alpha de um contorno destruído diminui por frame
+
+TIPO_CONTORNO = np.dtype([
+    ("x", np.float64),
+    ("y", np.float64),
+    ("raio", np.float64),
+    ("raio_inicial", np.float64),
+    ("raio_inicio", np.float64),  # Raio no início do passo de física (ver physics.corrigir_tunelamento)
+    ("vx", np.float64),
+    ("vy", np.float64),
+    ("velocidade", np.float64),
+    ("alpha", np.float64),
+    ("cor", np.uint8, (3,)),
+    ("tipo", np.int8),
+    ("ativo", np.bool_),      # Slot em uso (contorno desenhado)
+    ("destruido", np.bool_),  # Em fade, não colide mais
+    ("ordem", np.int64),      # Ordem de criação (ordem de desenho e de colisão)
+])
+
+
+def capacidade_necessaria(simultaneos, intervalo_criacao, velocidade_fade=VELOCIDADE_FADE):
+    """
+    Slots que um jogo pode ocupar ao mesmo tempo: até `simultaneos` contornos vivos,
+    mais os em fade. Um contorno fica em fade por 255 / velocidade_fade frames; nesse
+    tempo podem ser destruídos os vivos do início mais os criados no período
+    (um a cada intervalo_criacao frames)
+    """
+    frames_fade = math.ceil(255 / velocidade_fade)
+    return 2 * simultaneos + math.ceil(frames_fade / max(intervalo_criacao, 1)) + 1
+
+
+class ContornoPool:
+    """
+    Base das classes Contorno dos jogos: referência a um slot do PoolContornos
+    TIPOS: nomes dos tipos de contorno do jogo (o array guarda o índice)
+    """
+
+    __slots__ = ("pool", "indice")
+    TIPOS = ("neutro",)
+
+    x = campo_array("x", dono="pool")
+    y = campo_array("y", dono="pool")
+    raio = campo_array("raio", dono="pool")
+    raio_inicial = campo_array("raio_inicial", dono="pool")
+    raio_inicio = campo_array("raio_inicio", dono="pool")
+    vx = campo_array("vx", dono="pool")
+    vy = campo_array("vy", dono="pool")
+    velocidade_atual = campo_array("velocidade", dono="pool")
+    alpha = campo_array("alpha", dono="pool")
+    ativo = campo_array("ativo", bool, dono="pool")
+    destruido = campo_array("destruido", bool, dono="pool")
+    ordem = campo_array("ordem", int, dono="pool")  # Identificador do contorno (ordem de criação)
+
+    def __init__(self, pool, indice):
+        self.pool = pool
+        self.indice = indice
+
+    @property
+    def cor(self):
+        return tuple(int(canal) for canal in self.pool.cor[self.indice])
+
+    @property
+    def tipo(self):
+        return self.TIPOS[self.pool.tipo[self.indice]]
+
+    def destruir(self):
+        """Marca o contorno para ser destruído com efeito fade"""
+        self.pool.destruir(self.indice)
+
+
+class PoolContornos:
+    """Contornos de um jogo em um array estruturado de capacidade fixa"""
+
+    def __init__(self, capacidade, raio_minimo, velocidade_diminuicao, velocidade_fade=VELOCIDADE_FADE,
+                 classe_contorno=ContornoPool):
+        """
+        capacidade: número máximo de contornos simultâneos (incluindo os em fade)
+        raio_minimo: raio em que o contorno é desativado (RAIO_MINIMO_CONTORNO)
+        velocidade_diminuicao: quanto o raio diminui por frame (VELOCIDADE_DIMINUICAO)
+        velocidade_fade: quanto o alpha de um contorno destruído diminui por frame
+        classe_contorno: subclasse de ContornoPool do jogo (desenho, tipos)
+        """
+        self.capacidade = capacidade
+        self.raio_minimo = raio_minimo
+        self.velocidade_diminuicao = velocidade_diminuicao
+        self.velocidade_fade = velocidade_fade
+
+        self.dados = np.zeros(capacidade, dtype=TIPO_CONTORNO)
+        # Views dos campos (pool.x, pool.raio, ...), usadas pelas operações em lote
+        for nome in TIPO_CONTORNO.names:
+            setattr(self, nome, self.dados[nome])
+
+        self.contornos = [classe_contorno(self, indice) for indice in range(capacidade)]
+        self._livres = list(range(capacidade - 1, -1, -1))  # Pilha de slots livres (slot 0 no topo)
+        self._proxima_ordem = 0
+        self.quantidade_ativos = 0  # Slots em uso (inclui os contornos em fade)
+        self.quantidade_vivos = 0   # Ativos e não destruídos (os que colidem)
+
+    def criar(self, x, y, raio, cor=(255, 255, 255), tipo=0, velocidade=0.0):
+        """Ocupa um slot livre com um novo contorno e retorna o seu ContornoPool"""
+        if not self._livres:
+            raise ValueError(f"PoolContornos cheio ({self.capacidade} contornos)")
+        indice = self._livres.pop()
+        self.dados[indice] = (x, y, raio, raio, raio, 0.0, 0.0, velocidade, 255.0, cor, tipo,
+                              True, False, self._proxima_ordem)
+        self._proxima_ordem += 1
+        self.quantidade_ativos += 1
+        self.quantidade_vivos += 1
+        return self.contornos[indice]
+
+    def destruir(self, indice):
+        """Marca o contorno como destruído (começa o fade)"""
+        if self.ativo[indice] and not self.destruido[indice]:
+            self.quantidade_vivos -= 1
+        self.destruido[indice] = True
+
+    # ==================== ATUALIZAÇÃO EM LOTE ====================
+    def atualizar(self, passo=1.0):
+        """
+        Diminui o raio dos contornos vivos, aplica o fade dos destruídos e libera
+        os slots dos que foram desativados (mesmas regras do antigo Contorno.atualizar)
+        passo: fração do frame avançada (1 / subpassos de física)
+        """
+        if self.quantidade_ativos == 0:
+            return
+        self.raio_inicio[:] = self.raio
+        vivos = self.ativo & ~self.destruido
+        self.raio[vivos] -= self.velocidade_diminuicao * passo
+        pequenos = vivos & (self.raio <= self.raio_minimo)
+
+        destruidos = self.ativo & self.destruido
+        self.alpha[destruidos] -= self.velocidade_fade * passo
+        apagados = destruidos & (self.alpha <= 0)
+
+        desativados = np.flatnonzero(pequenos | apagados)
+        if desativados.size:
+            self.ativo[desativados] = False
+            self.quantidade_vivos -= int(np.count_nonzero(pequenos))
+            self.quantidade_ativos -= desativados.size
+            self._livres.extend(desativados[::-1].tolist())
+
+    def mover_para_alvo(self, passo, alvo_x, alvo_y, aceleracao, velocidade_limite, desaceleracao,
+                        velocidade_minima, distancia_desaceleracao, distancia_minima=5):
+        """
+        Move os contornos vivos em direção ao alvo (antigo _atualizar_movimento)
+        Longe do alvo a velocidade cresce até velocidade_limite; a menos de
+        distancia_desaceleracao ela é multiplicada por desaceleracao até velocidade_minima.
+        A menos de distancia_minima do alvo a direção não é recalculada
+        passo: fração do frame (aceleração somada e desaceleração composta por passo)
+        """
+        vivos = np.flatnonzero(self.ativo & ~self.destruido)
+        if vivos.size == 0:
+            return
+        dx = alvo_x - self.x[vivos]
+        dy = alvo_y - self.y[vivos]
+        distancia = np.sqrt(dx * dx + dy * dy)
+
+        movendo = distancia > distancia_minima
+        if movendo.any():
+            indices, dx, dy, distancia = vivos[movendo], dx[movendo], dy[movendo], distancia[movendo]
+            velocidade = self.velocidade[indices]
+            longe = distancia > distancia_desaceleracao
+            velocidade = np.where(longe,
+                                  np.minimum(velocidade + aceleracao * passo, velocidade_limite),
+                                  np.maximum(velocidade * desaceleracao ** passo, velocidade_minima))
+            self.velocidade[indices] = velocidade
+            self.vx[indices] = dx / distancia * velocidade
+            self.vy[indices] = dy / distancia * velocidade
+
+        self.x[vivos] += self.vx[vivos] * passo
+        self.y[vivos] += self.vy[vivos] * passo
+
+    # ==================== CONSULTAS ====================
+    def indices_ativos(self):
+        """Slots em uso, na ordem de criação dos contornos"""
+        indices = np.flatnonzero(self.ativo)
+        return indices[np.argsort(self.ordem[indices], kind="stable")]
+
+    def ativos(self):
+        """Contornos em uso (vivos e em fade), na ordem de criação: os que são desenhados"""
+        return [self.contornos[indice] for indice in self.indices_ativos()]
+
+    def vivos(self):
+        """Contornos ativos e não destruídos, na ordem de criação: os que colidem"""
+        if self.quantidade_vivos == 0:
+            return []
+        return [self.contornos[indice] for indice in self.indices_ativos() if not self.destruido[indice]]
@@ -0,0 +1,165 @@
+"""
+Anel de frames em memória compartilhada (multiprocessing.shared_memory)
+O jogo (produtor) escreve cada frame em um slot pré-alocado e o gravador
+(consumidor) lê o mesmo slot como uma view NumPy: nenhuma cópia ou alocação
+por frame entre a simulação e o encoder.
+
+Protocolo de números de sequência (um produtor, um consumidor):
+- escritos: frames publicados pelo produtor
+- lidos: frames liberados pelo consumidor
+- o produtor só escreve no slot escritos % slots quando escritos - lidos < slots
+- o consumidor lê os slots em ordem enquanto houver frames publicados e os
+  libera (lidos += 1) na mesma ordem, quando o encoder terminar de usá-los
+- encerrado: o consumidor parou de ler; o produtor bloqueado no anel cheio
+  recebe AnelEncerrado em vez de esperar para sempre
+Cada contador é escrito por um único processo, então não há necessidade de locks.
+"""
+
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Índices do cabeçalho (int64)
+ESCRITOS = 0
+LIDOS = 1
+FINALIZADO = 2
+SLOTS = 3
+ALTURA = 4
+LARGURA = 5
+ENCERRADO = 6
+TAMANHO_CABECALHO = 8 * 8  # 8 campos int64 (64 bytes mantém os slots alinhados)
+
+ESPERA_POLLING = 0.0005  # Intervalo de espera quando o anel está cheio/vazio (segundos)
+
+
+class AnelEncerrado(RuntimeError):
+    """O consumidor encerrou o anel: não há mais quem libere os slots"""
+
+
+def _abrir_memoria(nome):
+    """Conecta a um bloco existente sem registrá-lo no resource_tracker deste processo"""
+    try:
+        return shared_memory.SharedMemory(name=nome, track=False)  # Python 3.13+
+    except TypeError:
+        memoria = shared_memory.SharedMemory(name=nome)
+        # Sem isso o resource_tracker do processo conectado apagaria o bloco ao sair
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(memoria._name, "shared_memory")
+        return memoria
+
+
+class AnelFrames:
+    """Anel de slots BGR (altura, largura, 3) em memória compartilhada"""
+
+    def __init__(self, memoria, dono):
+        """
+        Use AnelFrames.criar() no gravador e AnelFrames.conectar() no jogo
+        memoria: bloco SharedMemory
+        dono: True se este processo criou (e deve apagar) o bloco
+        """
+        self.memoria = memoria
+        self.dono = dono
+        self.cabecalho = np.ndarray((8,), dtype=np.int64, buffer=memoria.buf)
+        self.slots = int(self.cabecalho[SLOTS])
+        self.altura = int(self.cabecalho[ALTURA])
+        self.largura = int(self.cabecalho[LARGURA])
+        # Próximo frame a ser entregue pelo consumidor (pode estar à frente de "lidos"
+        # enquanto os frames entregues aguardam o encoder)
+        self.cursor_leitura = int(self.cabecalho[LIDOS])
+        # Views de todos os slots criadas uma única vez
+        self.frames = np.ndarray((self.slots, self.altura, self.largura, 3), dtype=np.uint8,
+                                 buffer=memoria.buf, offset=TAMANHO_CABECALHO)
+
+    @classmethod
+    def criar(cls, slots=16, altura=854, largura=480):
+        """Cria um novo anel (lado do gravador)"""
+        tamanho = TAMANHO_CABECALHO + slots * altura * largura * 3
+        memoria = shared_memory.SharedMemory(create=True, size=tamanho)
+        cabecalho = np.ndarray((8,), dtype=np.int64, buffer=memoria.buf)
+        cabecalho[:] = 0
+        cabecalho[SLOTS] = slots
+        cabecalho[ALTURA] = altura
+        cabecalho[LARGURA] = largura
+        del cabecalho
+        return cls(memoria, dono=True)
+
+    @classmethod
+    def conectar(cls, nome):
+        """Conecta a um anel existente pelo nome (lado do jogo)"""
+        return cls(_abrir_memoria(nome), dono=False)
+
+    @property
+    def nome(self):
+        return self.memoria.name
+
+    # ==================== PRODUTOR ====================
+    def reservar(self, timeout=None):
+        """
+        Retorna a view do próximo slot livre para escrita
+        Bloqueia enquanto o anel estiver cheio (back-pressure do encoder)
+        Levanta AnelEncerrado se o consumidor encerrar o anel, ou TimeoutError
+        se nenhum slot for liberado em timeout segundos (None = sem limite)
+        """
+        escritos = int(self.cabecalho[ESCRITOS])
+        limite = None if timeout is None else time.time() + timeout
+        while escritos - int(self.cabecalho[LIDOS]) >= self.slots:
+            if self.cabecalho[ENCERRADO]:
+                raise AnelEncerrado("O gravador encerrou o anel de frames")
+            if limite is not None and time.time() >= limite:
+                raise TimeoutError(f"Nenhum slot do anel de frames liberado em {timeout}s")
+            time.sleep(ESPERA_POLLING)
+        return self.frames[escritos % self.slots]
+
+    def publicar(self):
+        """Publica o slot reservado para o consumidor"""
+        self.cabecalho[ESCRITOS] += 1
+
+    def finalizar(self):
+        """Sinaliza que não haverá mais frames"""
+        self.cabecalho[FINALIZADO] = 1
+
+    # ==================== CONSUMIDOR ====================
+    def proximo(self, timeout=None):
+        """
+        Retorna (sequência, view do slot) do próximo frame publicado
+        Retorna None se o produtor finalizou e não há frames pendentes,
+        ou se o timeout (segundos) expirar
+        O slot continua reservado até liberar() ser chamado
+        """
+        sequencia = self.cursor_leitura
+        limite = None if timeout is None else time.time() + timeout
+        while int(self.cabecalho[ESCRITOS]) <= sequencia:
+            if self.cabecalho[FINALIZADO]:
+                return None
+            if limite is not None and time.time() >= limite:
+                return None
+            time.sleep(ESPERA_POLLING)
+        self.cursor_leitura += 1
+        return sequencia, self.frames[sequencia % self.slots]
+
+    def encerrar(self):
+        """Sinaliza que o consumidor não vai mais ler (desbloqueia o produtor)"""
+        self.cabecalho[ENCERRADO] = 1
+
+    def liberar(self):
+        """Devolve ao produtor o slot mais antigo entregue por proximo()"""
+        self.cabecalho[LIDOS] += 1
+
+    def pendentes(self):
+        """Quantidade de frames publicados e ainda não liberados"""
+        return int(self.cabecalho[ESCRITOS] - self.cabecalho[LIDOS])
+
+    def finalizado(self):
+        return bool(self.cabecalho[FINALIZADO])
+
+    def fechar(self):
+        """Desconecta do bloco (e o apaga, se for o dono)"""
+        if self.dono:
+            self.encerrar()
+        # As views precisam ser liberadas antes de fechar o buffer
+        del self.frames
+        del self.cabecalho
+        self.memoria.close()
+        if self.dono:
+            self.memoria.unlink()
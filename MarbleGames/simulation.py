@@ -0,0 +1,91 @@
+"""
+Modo só simulação dos jogos
+Cada jogo expõe simulate(seed, params) que roda só a física e as regras da
+partida no passo fixo do modo rápido, sem janela, desenho ou gravação, e
+devolve uma LinhaDoTempo com os eventos (frame, tipo, entidades, posição) e o
+resultado final. Com a mesma semente a partida é a mesma do vídeo renderizado
+no modo rápido (mesma sequência do random global).
+
+Uso:
+    import ball_circles
+    linha = ball_circles.simulate(7, {"VELOCIDADE_DIMINUICAO": 6})
+    print(linha.resultado, linha.contar("contorno_destruido"))
+"""
+
+import contextlib
+import os
+from collections import namedtuple
+
+Evento = namedtuple("Evento", "frame tipo entidades x y")
+
+
+class LinhaDoTempo:
+    """Eventos de uma partida simulada, em ordem de frame"""
+
+    def __init__(self, jogo, semente, parametros=None):
+        self.jogo = jogo
+        self.semente = semente
+        self.parametros = dict(parametros or {})
+        self.eventos = []
+        self.resultado = {}
+        self.frames = 0
+
+    def registrar(self, frame, tipo, entidades=(), x=None, y=None):
+        """
+        Adiciona um evento
+        entidades: identificadores envolvidos (bola, contorno, jogador...)
+        x, y: posição do evento (normalmente a da bola), se houver
+        """
+        self.eventos.append(Evento(frame, tipo, tuple(entidades),
+                                   None if x is None else round(float(x), 2),
+                                   None if y is None else round(float(y), 2)))
+
+    def contar(self, tipo):
+        """Quantidade de eventos de um tipo"""
+        return sum(1 for evento in self.eventos if evento.tipo == tipo)
+
+    def do_tipo(self, tipo):
+        """Eventos de um tipo, em ordem"""
+        return [evento for evento in self.eventos if evento.tipo == tipo]
+
+    def como_dict(self):
+        """Dicionário serializável em JSON (eventos como listas compactas)"""
+        return {
+            "jogo": self.jogo,
+            "seed": self.semente,
+            "params": self.parametros,
+            "frames": self.frames,
+            "resultado": self.resultado,
+            "eventos": [list(evento) for evento in self.eventos],
+        }
+
+
+@contextlib.contextmanager
+def parametros_jogo(modulo, parametros):
+    """
+    Sobrescreve constantes de configuração do jogo (nomes em MAIÚSCULAS do
+    módulo) durante a simulação e restaura os valores no final
+    Constantes derivadas na importação (ex.: RAIO_MINIMO_CONTORNO = RAIO_BOLA * 5)
+    não são recalculadas: para mudá-las, passe-as também
+    """
+    antigos = {}
+    try:
+        for nome, valor in (parametros or {}).items():
+            if not nome.isupper() or not hasattr(modulo, nome):
+                raise KeyError(f"Parâmetro desconhecido em {modulo.__name__}: {nome}")
+            antigos[nome] = getattr(modulo, nome)
+            setattr(modulo, nome, valor)
+        yield
+    finally:
+        for nome, valor in antigos.items():
+            setattr(modulo, nome, valor)
+
+
+@contextlib.contextmanager
+def silenciar(ativo=True):
+    """Descarta os prints do jogo (placar, tempo) durante a simulação"""
+    if not ativo:
+        yield
+        return
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        yield
@@ -0,0 +1,149 @@
+"""
+Broadphase por grade uniforme (spatial hash) para colisões entre bolas
+A arena é dividida em células do tamanho do diâmetro da bola; duas bolas só
+podem colidir se estiverem na mesma célula ou em células vizinhas. Os pares
+candidatos saem em lote (ordenação por célula + searchsorted), então o custo
+cresce perto de O(n) em vez dos O(n²) pares da força bruta.
+
+Benchmark contra a força bruta:
+    python MarbleGames/spatial_hash.py --bolas 100 500 1000 2000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+# Vizinhança "meia": a própria célula e 4 das 8 vizinhas, para cada par de
+# células ser visitado uma única vez
+VIZINHOS = ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+
+class GradeEspacial:
+    """Grade uniforme sobre a arena que gera pares candidatos de colisão"""
+
+    def __init__(self, largura, altura, tamanho_celula):
+        """
+        largura, altura: tamanho da arena
+        tamanho_celula: lado da célula; deve ser >= maior diâmetro das bolas
+        (ex.: 2 * RAIO_BOLA) para que bolas em contato fiquem em células vizinhas
+        """
+        self.tamanho_celula = float(tamanho_celula)
+        self.colunas = max(1, int(np.ceil(largura / self.tamanho_celula)))
+        self.linhas = max(1, int(np.ceil(altura / self.tamanho_celula)))
+
+    def pares_candidatos(self, x, y):
+        """
+        Retorna (i, j), com i < j, dos pares de bolas em células iguais ou vizinhas
+        x, y: arrays com as posições das bolas
+        """
+        n = len(x)
+        if n < 2:
+            vazio = np.zeros(0, dtype=np.int64)
+            return vazio, vazio
+
+        # Bolas fora da arena (durante um quique) ficam na célula da borda
+        coluna = np.clip((x // self.tamanho_celula).astype(np.int64), 0, self.colunas - 1)
+        linha = np.clip((y // self.tamanho_celula).astype(np.int64), 0, self.linhas - 1)
+        celula = linha * self.colunas + coluna
+
+        # Bolas agrupadas por célula
+        ordem = np.argsort(celula, kind="stable")
+        celulas_ordenadas = celula[ordem]
+        bolas = np.arange(n)
+
+        lista_i = []
+        lista_j = []
+        for dc, dl in VIZINHOS:
+            coluna_vizinha = coluna + dc
+            linha_vizinha = linha + dl
+            dentro = ((coluna_vizinha >= 0) & (coluna_vizinha < self.colunas)
+                      & (linha_vizinha < self.linhas))
+            alvo = linha_vizinha[dentro] * self.colunas + coluna_vizinha[dentro]
+            origem = bolas[dentro]
+
+            # Intervalo [inicio, fim) das bolas da célula vizinha em "ordem"
+            inicio = np.searchsorted(celulas_ordenadas, alvo, side="left")
+            fim = np.searchsorted(celulas_ordenadas, alvo, side="right")
+            quantidade = fim - inicio
+            total = int(quantidade.sum())
+            if total == 0:
+                continue
+
+            # Expande cada bola de origem para todas as bolas da célula vizinha
+            i = np.repeat(origem, quantidade)
+            deslocamento = np.arange(total) - np.repeat(np.cumsum(quantidade) - quantidade, quantidade)
+            j = ordem[np.repeat(inicio, quantidade) + deslocamento]
+
+            if (dc, dl) == (0, 0):
+                # Mesma célula: cada par aparece duas vezes (e a bola com ela mesma)
+                manter = i < j
+                i, j = i[manter], j[manter]
+            lista_i.append(i)
+            lista_j.append(j)
+
+        if not lista_i:
+            vazio = np.zeros(0, dtype=np.int64)
+            return vazio, vazio
+        i = np.concatenate(lista_i)
+        j = np.concatenate(lista_j)
+        return np.minimum(i, j), np.maximum(i, j)
+
+
+def pares_em_contato(x, y, raio, i, j):
+    """Filtra os pares (i, j) cujas bolas se sobrepõem (narrowphase com distância ao quadrado)"""
+    dx = x[j] - x[i]
+    dy = y[j] - y[i]
+    soma_raios = raio[i] + raio[j]
+    contato = dx * dx + dy * dy < soma_raios * soma_raios
+    return i[contato], j[contato]
+
+
+def benchmark(quantidades, raio=15, largura=480, altura=854, repeticoes=20, semente=0):
+    """
+    Compara a grade com a força bruta para cada quantidade de bolas
+    As bolas são espalhadas aleatoriamente na arena; confere se os dois métodos
+    encontram exatamente os mesmos pares em contato
+    """
+    gerador = np.random.default_rng(semente)
+    grade = GradeEspacial(largura, altura, 2 * raio)
+    print(f"{'bolas':>6} {'força bruta (ms)':>17} {'grade (ms)':>11} {'speedup':>8} {'candidatos':>11} {'contatos':>9}")
+
+    for n in quantidades:
+        x = gerador.uniform(raio, largura - raio, n)
+        y = gerador.uniform(raio, altura - raio, n)
+        raios = np.full(n, float(raio))
+
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            i, j = np.triu_indices(n, k=1)
+            bruta = pares_em_contato(x, y, raios, i, j)
+        tempo_bruta = (time.perf_counter() - inicio) / repeticoes
+
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            i, j = grade.pares_candidatos(x, y)
+            candidatos = len(i)
+            pela_grade = pares_em_contato(x, y, raios, i, j)
+        tempo_grade = (time.perf_counter() - inicio) / repeticoes
+
+        iguais = set(zip(*map(np.ndarray.tolist, bruta))) == set(zip(*map(np.ndarray.tolist, pela_grade)))
+        if not iguais:
+            raise AssertionError(f"A grade perdeu pares em contato com {n} bolas")
+
+        print(f"{n:>6} {tempo_bruta * 1000:>17.3f} {tempo_grade * 1000:>11.3f} "
+              f"{tempo_bruta / tempo_grade:>7.1f}x {candidatos:>11} {len(bruta[0]):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da grade espacial contra a força bruta')
+    parser.add_argument('--bolas', type=int, nargs='+', default=[10, 100, 500, 1000, 2000, 5000],
+                        help='Quantidades de bolas testadas')
+    parser.add_argument('--raio', type=float, default=15, help='Raio das bolas (RAIO_BOLA)')
+    parser.add_argument('--repeticoes', type=int, default=20, help='Repetições por medida')
+    args = parser.parse_args()
+    benchmark(args.bolas, raio=args.raio, repeticoes=args.repeticoes)
+
+
+if __name__ == "__main__":
+    main()
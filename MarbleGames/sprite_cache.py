@@ -0,0 +1,97 @@
+"""
+Cache de sprites dos contornos em fade
+Um contorno destruído era desenhado criando a cada frame uma superfície
+SRCALPHA de até ~1000x1000 px e rasterizando o círculo nela. O cache guarda o
+anel já desenhado (opaco) por (raio quantizado, espessura, cor); o alpha do
+fade é aplicado no blit (alpha da superfície combinado com o alpha por pixel).
+O blit com alpha da superfície custa ~3x mais por pixel que o antigo, então o
+sprite é copiado só nas faixas horizontais que têm pixels do anel (o miolo
+transparente fica de fora): poucos % da área do quadrado para anéis grandes.
+A memória é limitada em bytes e os sprites menos usados recentemente são
+descartados (LRU).
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+MARGEM = 10                        # Borda transparente em volta do anel (px)
+LIMITE_BYTES = 64 * 1024 * 1024    # Memória máxima dos sprites guardados
+ALTURA_FAIXA = 16                  # Linhas por faixa copiada no blit do anel
+
+
+def faixas_visiveis(sprite, altura=ALTURA_FAIXA):
+    """
+    Retângulos do sprite que contêm todos os pixels com alpha > 0
+    Cada faixa de `altura` linhas vira 1 retângulo por trecho contínuo de
+    colunas não transparentes (2 no meio do anel, 1 no topo e na base)
+    """
+    alpha = pygame.surfarray.array_alpha(sprite)  # (largura, altura)
+    largura_sprite, altura_sprite = alpha.shape
+    faixas = []
+    for y in range(0, altura_sprite, altura):
+        colunas = alpha[:, y:y + altura].any(axis=1)
+        bordas = np.flatnonzero(np.diff(np.concatenate(([0], colunas.view(np.int8), [0]))))
+        h = min(altura, altura_sprite - y)
+        for inicio, fim in zip(bordas[::2], bordas[1::2]):
+            faixas.append(pygame.Rect(int(inicio), y, int(fim - inicio), h))
+    return faixas
+
+
+class CacheSprites:
+    """Sprites de anéis por (raio, espessura, cor) com descarte LRU"""
+
+    def __init__(self, limite_bytes=LIMITE_BYTES, quantizacao_raio=1):
+        """
+        limite_bytes: memória máxima dos sprites (largura * altura * 4 de cada um)
+        quantizacao_raio: raios no mesmo intervalo de N px usam o mesmo sprite
+        """
+        self.limite_bytes = limite_bytes
+        self.quantizacao_raio = quantizacao_raio
+        self.sprites = OrderedDict()  # chave -> (sprite, faixas visíveis, raio quantizado)
+        self.bytes = 0
+        self.acertos = 0
+        self.criados = 0
+
+    def anel(self, raio, espessura, cor):
+        """
+        Sprite do anel (alpha 255): o chamador define o alpha com set_alpha() antes do blit
+        Retorna (sprite, faixas visíveis, raio quantizado); o centro do anel no
+        sprite é (raio quantizado + MARGEM) nos dois eixos
+        """
+        raio = int(raio) // self.quantizacao_raio * self.quantizacao_raio
+        chave = (raio, espessura, tuple(cor))
+        guardado = self.sprites.get(chave)
+        if guardado is not None:
+            self.sprites.move_to_end(chave)
+            self.acertos += 1
+            return guardado
+
+        lado = raio * 2 + MARGEM * 2
+        sprite = pygame.Surface((lado, lado), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, chave[2], (raio + MARGEM, raio + MARGEM), raio, espessura)
+        self.criados += 1
+
+        guardado = (sprite, faixas_visiveis(sprite), raio)
+        self.sprites[chave] = guardado
+        self.bytes += lado * lado * 4
+        # Descarta os menos usados recentemente (nunca o sprite recém-criado)
+        while self.bytes > self.limite_bytes and len(self.sprites) > 1:
+            _, (antigo, _, _) = self.sprites.popitem(last=False)
+            self.bytes -= antigo.get_width() * antigo.get_height() * 4
+        return guardado
+
+    def desenhar_anel(self, tela, x, y, raio, espessura, cor, alpha):
+        """
+        Desenha o anel com transparência centrado em (int(x), int(y)), como o
+        pygame.draw.circle dos contornos vivos
+        Mesmo resultado de um blit do sprite inteiro: cada faixa vai para a
+        posição do sprite + seu deslocamento
+        """
+        sprite, faixas, raio_sprite = self.anel(raio, espessura, cor)
+        sprite.set_alpha(alpha)
+        # Deslocamento pelo raio do sprite (quantizado), não pelo raio pedido
+        x0 = int(x) - raio_sprite - MARGEM
+        y0 = int(y) - raio_sprite - MARGEM
+        tela.blits([(sprite, (x0 + faixa.x, y0 + faixa.y), faixa) for faixa in faixas], doreturn=False)
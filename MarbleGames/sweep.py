@@ -0,0 +1,235 @@
+"""
+Varredura Monte Carlo de parâmetros dos jogos
+Roda simulate(seed, params) de um jogo para cada combinação da grade de
+parâmetros × sementes em um pool de processos (sem desenhar nenhum frame) e
+mostra uma tabela com as médias por configuração: duração da partida,
+colisões por segundo, contornos destruídos, taxa de empate etc.
+
+Exemplos:
+    python MarbleGames/sweep.py --game ball_circles --seeds 1000 \\
+        --param VELOCIDADE_DIMINUICAO=4,6,8 --param INTERVALO_CRIACAO=2,4 --param GRAVIDADE=0.5,0.7
+    python MarbleGames/sweep.py --game img_coliseum --seeds 2000 --sort taxa_empate \\
+        --param "DISTRIBUICAO_PONTOS=[0,1,2,2,3],[0,1,1,1,2,2,2,2,2,2,3,3,4,5]" --csv sweep.csv
+
+Os valores de --param são literais Python separados por vírgula (números,
+strings entre aspas, listas); parâmetros são as constantes em MAIÚSCULAS do jogo.
+"""
+
+import argparse
+import ast
+import csv
+import importlib
+import itertools
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import render_mode
+import simulation
+
+JOGOS = ("ball_circles", "two_balls_circles", "img_coliseum")
+
+# Eventos que contam como colisão da bola com um contorno, em qualquer jogo
+TIPOS_COLISAO = ("contorno_destruido", "quique_incompativel", "quique_contorno")
+
+SEMENTES_POR_TAREFA = 25  # Sementes simuladas por tarefa do pool (menos overhead de IPC)
+
+
+def ler_parametro(texto):
+    """Converte "NOME=v1,v2,..." em (NOME, [v1, v2, ...])"""
+    nome, separador, valores = texto.partition("=")
+    if not separador or not valores:
+        raise ValueError(f"Parâmetro sem valores: {texto} (use NOME=v1,v2)")
+    try:
+        lista = ast.literal_eval(f"[{valores}]")
+    except (ValueError, SyntaxError):
+        raise ValueError(f"Valores inválidos para {nome}: {valores}")
+    return nome.strip(), lista
+
+
+def montar_grade(parametros):
+    """Todas as combinações dos valores dos parâmetros (produto cartesiano), como dicionários"""
+    nomes = [nome for nome, _ in parametros]
+    return [dict(zip(nomes, valores)) for valores in itertools.product(*(lista for _, lista in parametros))]
+
+
+def metricas_partida(linha):
+    """
+    Métricas de uma partida simulada
+    duracao_s, colisoes e colisoes_s vêm dos eventos; os valores numéricos e
+    booleanos do resultado do jogo (contornos_destruidos, acrescimos...) são copiados
+    """
+    duracao = linha.frames / render_mode.FPS_JOGO
+    colisoes = sum(1 for evento in linha.eventos if evento.tipo in TIPOS_COLISAO)
+    metricas = {
+        "duracao_s": duracao,
+        "colisoes": colisoes,
+        "colisoes_s": colisoes / duracao if duracao else 0.0,
+    }
+    for nome, valor in linha.resultado.items():
+        if isinstance(valor, (bool, int, float)):
+            metricas[nome] = float(valor)
+    if "acrescimos" in linha.resultado:
+        metricas["taxa_empate"] = float(linha.resultado["acrescimos"])
+    return metricas
+
+
+def simular_tarefa(jogo, indice_config, parametros, sementes):
+    """
+    Executa no processo do pool: simula as sementes com a configuração
+    Retorna (indice_config, lista de métricas, lista de (semente, erro)); uma
+    semente que falha não descarta as outras do lote
+    """
+    modulo = importlib.import_module(jogo)
+    lista_metricas = []
+    erros = []
+    for semente in sementes:
+        try:
+            lista_metricas.append(metricas_partida(modulo.simulate(semente, parametros)))
+        except Exception as e:
+            erros.append((semente, f"{type(e).__name__}: {e}"))
+    return indice_config, lista_metricas, erros
+
+
+def agregar(lista_metricas):
+    """Média de cada métrica e desvio padrão de colisoes_s"""
+    if not lista_metricas:
+        return {}
+    nomes = [nome for nome in lista_metricas[0]]
+    quantidade = len(lista_metricas)
+    agregado = {"partidas": quantidade}
+    for nome in nomes:
+        agregado[nome] = sum(metricas[nome] for metricas in lista_metricas) / quantidade
+    media = agregado["colisoes_s"]
+    variancia = sum((metricas["colisoes_s"] - media) ** 2 for metricas in lista_metricas) / quantidade
+    agregado["colisoes_s_desvio"] = math.sqrt(variancia)
+    return agregado
+
+
+def colunas_metricas(modulo, parametros, semente):
+    """
+    Métricas agregadas de uma configuração (nomes das colunas da tabela), obtidas
+    simulando uma única partida: as do resultado variam de jogo para jogo
+    """
+    return list(agregar([metricas_partida(modulo.simulate(semente, parametros))]))
+
+
+def formatar_valor(valor):
+    """Texto curto de um valor da tabela"""
+    if isinstance(valor, float):
+        return f"{valor:.3f}" if abs(valor) < 10 else f"{valor:.1f}"
+    return str(valor)
+
+
+def mostrar_tabela(linhas, colunas):
+    """Imprime as linhas (dicionários) como tabela de texto alinhada"""
+    textos = [[formatar_valor(linha.get(coluna, "")) for coluna in colunas] for linha in linhas]
+    larguras = [max([len(coluna)] + [len(texto[i]) for texto in textos]) for i, coluna in enumerate(colunas)]
+    print("  ".join(coluna.rjust(largura) for coluna, largura in zip(colunas, larguras)))
+    print("  ".join("-" * largura for largura in larguras))
+    for texto in textos:
+        print("  ".join(valor.rjust(largura) for valor, largura in zip(texto, larguras)))
+
+
+def gravar_csv(caminho, linhas, colunas):
+    """Grava a tabela agregada em CSV"""
+    with open(caminho, "w", newline="") as arquivo:
+        escritor = csv.DictWriter(arquivo, fieldnames=colunas, extrasaction="ignore")
+        escritor.writeheader()
+        for linha in linhas:
+            escritor.writerow({coluna: repr(valor) if isinstance(valor, (list, tuple)) else valor
+                               for coluna, valor in linha.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Varredura de parâmetros com simulações headless')
+    parser.add_argument('--game', required=True, choices=JOGOS, help='Jogo simulado')
+    parser.add_argument('--param', action='append', default=[], metavar='NOME=v1,v2',
+                        help='Valores de uma constante do jogo (repetível; grade = produto)')
+    parser.add_argument('--seeds', type=int, default=200, help='Sementes por configuração')
+    parser.add_argument('--seed-base', type=int, default=0, help='Primeira semente (seed-base .. seed-base + seeds - 1)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Processos em paralelo')
+    parser.add_argument('--sort', help='Métrica usada para ordenar a tabela (decrescente)')
+    parser.add_argument('--csv', help='Grava a tabela agregada neste arquivo CSV')
+    args = parser.parse_args()
+
+    try:
+        parametros = [ler_parametro(texto) for texto in args.param]
+    except ValueError as e:
+        parser.error(str(e))
+    grade = montar_grade(parametros)
+
+    # Valida os nomes antes de distribuir as tarefas (KeyError para constantes desconhecidas)
+    modulo = importlib.import_module(args.game)
+    for configuracao in grade:
+        try:
+            with simulation.parametros_jogo(modulo, configuracao):
+                pass
+        except KeyError as e:
+            parser.error(e.args[0])
+
+    # Valida --sort antes da varredura (um nome errado não descarta horas de simulação)
+    if args.sort:
+        try:
+            opcoes = colunas_metricas(modulo, grade[0], args.seed_base)
+        except Exception as e:
+            print(f"⚠️ Não foi possível validar --sort antes da varredura ({type(e).__name__}: {e})")
+        else:
+            if args.sort not in opcoes:
+                parser.error(f"Métrica desconhecida em --sort: {args.sort} (opções: {', '.join(opcoes)})")
+
+    sementes = list(range(args.seed_base, args.seed_base + args.seeds))
+    lotes = [sementes[i:i + SEMENTES_POR_TAREFA] for i in range(0, len(sementes), SEMENTES_POR_TAREFA)]
+    total = len(grade) * len(sementes)
+    print(f"Simulando {args.game}: {len(grade)} configurações × {len(sementes)} sementes "
+          f"= {total} partidas com {args.workers} processos...")
+
+    inicio = time.time()
+    resultados = [[] for _ in grade]
+    erros = [[] for _ in grade]  # (semente, erro) por configuração
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futuros = [pool.submit(simular_tarefa, args.game, indice, configuracao, lote)
+                   for indice, configuracao in enumerate(grade) for lote in lotes]
+        for futuro in as_completed(futuros):
+            indice, metricas, erros_lote = futuro.result()
+            resultados[indice].extend(metricas)
+            erros[indice].extend(erros_lote)
+
+    decorrido = time.time() - inicio
+    simuladas = sum(len(metricas) for metricas in resultados)
+    print(f"{simuladas}/{total} partidas em {decorrido:.1f}s ({simuladas / decorrido:.0f} partidas/s)\n")
+
+    for configuracao, erros_config in zip(grade, erros):
+        if erros_config:
+            semente, erro = min(erros_config)
+            print(f"❌ Configuração {configuracao}: {len(erros_config)} sementes falharam "
+                  f"(semente {semente}: {erro})")
+
+    nomes_parametros = [nome for nome, _ in parametros]
+    linhas = []
+    for configuracao, metricas in zip(grade, resultados):
+        if metricas:
+            linhas.append({**configuracao, **agregar(metricas)})
+    if not linhas:
+        sys.exit(1)
+
+    colunas_metricas = [nome for nome in linhas[0] if nome not in nomes_parametros]
+    if args.sort:
+        if args.sort not in colunas_metricas:
+            parser.error(f"Métrica desconhecida em --sort: {args.sort} (opções: {', '.join(colunas_metricas)})")
+        linhas.sort(key=lambda linha: linha[args.sort], reverse=True)
+
+    colunas = nomes_parametros + colunas_metricas
+    mostrar_tabela(linhas, colunas)
+    if args.csv:
+        gravar_csv(args.csv, linhas, colunas)
+        print(f"\nTabela gravada em {args.csv}")
+
+    if any(erros):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Cache de fontes e de textos renderizados
+O cronômetro e o placar chamavam font.render a cada frame para textos que
+mudam uma vez por segundo (ou a cada ponto), e as telas de empate e de fim de
+jogo criavam fontes novas a cada chamada. As fontes são carregadas uma vez por
+processo e cada texto é renderizado só quando o conteúdo, a cor ou a fonte
+mudam; os textos menos usados recentemente são descartados (LRU).
+As superfícies retornadas são compartilhadas: só devem ser usadas em blits.
+pygame.quit() invalida as fontes carregadas: os caches são esvaziados no quit
+e as fontes são recarregadas depois de um novo pygame.init().
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+LIMITE_TEXTOS = 256  # Textos renderizados guardados (o cronômetro sozinho usa ~1 por segundo de jogo)
+
+_fontes = {}  # (arquivo, tamanho) -> pygame.font.Font
+
+
+def fonte(tamanho, arquivo=None):
+    """Fonte carregada uma única vez por processo (arquivo None = fonte padrão do pygame)"""
+    chave = (arquivo, tamanho)
+    if chave not in _fontes:
+        if not _fontes:
+            # As funções de quit rodam uma vez: registra de novo a cada (re)inicialização
+            pygame.register_quit(limpar)
+        _fontes[chave] = pygame.font.Font(arquivo, tamanho)
+    return _fontes[chave]
+
+
+class CacheTextos:
+    """Superfícies de texto por (texto, tamanho, cor, fonte) com descarte LRU"""
+
+    def __init__(self, limite=LIMITE_TEXTOS):
+        """limite: quantidade máxima de textos renderizados guardados"""
+        self.limite = limite
+        self.textos = OrderedDict()
+        self.acertos = 0
+        self.renderizados = 0
+
+    def renderizar(self, texto, tamanho, cor, arquivo=None, antialias=True):
+        """Superfície do texto (mesmo resultado de fonte(tamanho, arquivo).render(texto, antialias, cor))"""
+        chave = (texto, tamanho, tuple(cor), arquivo, antialias)
+        superficie = self.textos.get(chave)
+        if superficie is not None:
+            self.textos.move_to_end(chave)
+            self.acertos += 1
+            return superficie
+
+        superficie = fonte(tamanho, arquivo).render(texto, antialias, cor)
+        self.renderizados += 1
+        self.textos[chave] = superficie
+        if len(self.textos) > self.limite:
+            self.textos.popitem(last=False)
+        return superficie
+
+    def limpar(self):
+        """Descarta todos os textos renderizados"""
+        self.textos.clear()
+
+
+# Cache compartilhado pelos jogos
+TEXTOS = CacheTextos()
+
+
+def limpar():
+    """Descarta as fontes e os textos do cache compartilhado (chamado pelo pygame.quit())"""
+    _fontes.clear()
+    TEXTOS.limpar()
+
+
+def renderizar(texto, tamanho, cor, arquivo=None, antialias=True):
+    """Texto renderizado pelo cache compartilhado (re-renderiza só se texto, cor ou fonte mudarem)"""
+    return TEXTOS.renderizar(texto, tamanho, cor, arquivo, antialias)
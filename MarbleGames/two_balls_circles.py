@@ -1,13 +1,19 @@
+import render_mode  # Antes do pygame: configura o driver SDL do modo headless
 import pygame
 import math
 import sys
 import random
 import os
 import time
+import frame_sink
+import physics
+import replay
+import ring_pool
+import simulation
+import sprite_cache
 from types import DynamicClassAttribute
 
 finalizar_gravacao = False
-game_start_time = None
 
 def random_color():
     return (random.randint(80, 255), random.randint(80, 255), random.randint(80, 255))
@@ -18,21 +24,20 @@ def random_velocity():
 def random_width():
     return random.randint(2, 8)
 
-# Inicialização do Pygame
-pygame.init()
-
 # ==================== CONFIGURAÇÕES DA JANELA ====================
 LARGURA = 480  # Largura da janela
 ALTURA = 854    # Altura da janela
-TELA = pygame.display.set_mode((LARGURA, ALTURA))
-pygame.display.set_caption("Efeito Interativo de Bolas - Contornos Móveis e Coloridos")
+TELA = None            # Criada por iniciar_tela() (o modo simulação não abre janela)
+DESTINO_FRAMES = None  # Criado por iniciar_tela(); None = gravação por captura de tela
 
 # ==================== CORES (CONFIGURÁVEIS) ====================
 COR_FUNDO = (0, 0, 0)        # Preto - cor do fundo
-COR_BOLA_VERMELHA = random_color()  # Vermelho - cor da primeira bola
-COR_BOLA_AZUL = random_color()      # Azul - cor da segunda bola
-COR_CONTORNO_VERMELHO = COR_BOLA_VERMELHA  # Vermelho claro - contornos vermelhos
-COR_CONTORNO_AZUL = COR_BOLA_AZUL     # Azul claro - contornos azuis
+# (as cores das bolas, a velocidade e a espessura dos contornos são sorteadas
+# por sortear_configuracao() no início da partida)
+COR_BOLA_VERMELHA = None  # Vermelho - cor da primeira bola
+COR_BOLA_AZUL = None      # Azul - cor da segunda bola
+COR_CONTORNO_VERMELHO = None  # Vermelho claro - contornos vermelhos (cor da bola vermelha)
+COR_CONTORNO_AZUL = None     # Azul claro - contornos azuis (cor da bola azul)
 COR_CONTORNO_NEUTRO = (255, 255, 255)    # Branco - para referência
 
 # ==================== CONFIGURAÇÕES DAS BOLAS (CONFIGURÁVEIS) ====================
@@ -46,8 +51,8 @@ VELOCIDADE_MAXIMA = 18      # Velocidade máxima que as bolas podem atingir
 QUANTIDADE_CONTORNOS_SIMULTANEOS = 8   # Quantidade de contornos simultâneos na tela
 RAIO_MINIMO_CONTORNO = RAIO_BOLA * 5   # Tamanho mínimo = 5R
 RAIO_MAXIMO_INICIAL = 300              # Raio máximo inicial dos contornos
-VELOCIDADE_DIMINUICAO = random_velocity()            # Velocidade que os contornos diminuem de tamanho
-ESPESSURA_CONTORNO = random_width()               # Espessura da linha do contorno
+VELOCIDADE_DIMINUICAO = None            # Velocidade que os contornos diminuem de tamanho (sorteada)
+ESPESSURA_CONTORNO = None               # Espessura da linha do contorno (sorteada)
 INTERVALO_CRIACAO = 15               # Intervalo em frames para criar novos contornos
 
 # ==================== CONFIGURAÇÕES DE MOVIMENTO DOS CONTORNOS ====================
@@ -55,26 +60,52 @@ VELOCIDADE_INICIAL_CONTORNO = 10     # Velocidade inicial dos contornos em dire
 ACELERACAO_CONTORNO = 3             # Aceleração inicial dos contornos
 DESACELERACAO_CONTORNO = 0.12          # Fator de desaceleração (multiplicador < 1)
 DISTANCIA_DESACELERACAO = 100          # Distância do centro onde começa a desaceleração
+CENTRO_ALVO_X = LARGURA // 2                 # Alvo do movimento dos contornos
+CENTRO_ALVO_Y = (ALTURA // 2) * 1.3
 
 # ==================== TIMER CONFIGURATION ====================
 GAME_DURATION = 30  # 30 seconds
 
-class Bola:
-    """Classe que representa uma bola no jogo"""
+def iniciar_tela():
+    """Inicializa o pygame, a janela (ou a tela headless) e o destino de frames"""
+    global TELA, DESTINO_FRAMES
+    pygame.init()
+    TELA = pygame.display.set_mode((LARGURA, ALTURA))
+    pygame.display.set_caption("Efeito Interativo de Bolas - Contornos Móveis e Coloridos")
+    DESTINO_FRAMES = frame_sink.criar_destino_frames(LARGURA, ALTURA)  # None = gravação por captura de tela
+
+def sortear_configuracao():
+    """
+    Sorteia as configurações aleatórias do jogo (cores, velocidade e espessura dos contornos)
+    Chamada depois da semente, antes da partida: mesma ordem de sorteios da
+    antiga inicialização do módulo, então a mesma semente gera a mesma partida
+    """
+    global COR_BOLA_VERMELHA, COR_BOLA_AZUL, COR_CONTORNO_VERMELHO, COR_CONTORNO_AZUL
+    global VELOCIDADE_DIMINUICAO, ESPESSURA_CONTORNO
+    COR_BOLA_VERMELHA = random_color()
+    COR_BOLA_AZUL = random_color()
+    COR_CONTORNO_VERMELHO = COR_BOLA_VERMELHA
+    COR_CONTORNO_AZUL = COR_BOLA_AZUL
+    VELOCIDADE_DIMINUICAO = random_velocity()
+    ESPESSURA_CONTORNO = random_width()
+
+def criar_sistema_bolas(capacidade=2):
+    """Cria o núcleo de física das bolas com as constantes deste jogo"""
+    return physics.SistemaBolas(capacidade, LARGURA, ALTURA, GRAVIDADE, FORCA_QUIQUE,
+                                ACELERACAO_QUIQUE, VELOCIDADE_MAXIMA)
+
+class Bola(physics.BolaSistema):
+    """Classe que representa uma bola no jogo (a física fica no SistemaBolas)"""
     
-    def __init__(self, x, y, cor):
+    def __init__(self, sistema, x, y, cor):
         """
         Inicializa uma bola
-        x, y: posição inicial da bola
+        sistema: SistemaBolas que guarda posição, velocidade e quiques da bola
+        x, y: posição inicial da bola (velocidade inicial zero)
         cor: cor da bola (RGB)
         """
-        self.x = x
-        self.y = y
-        self.vx = 0  # Velocidade horizontal inicial
-        self.vy = 0  # Velocidade vertical inicial
-        self.raio = RAIO_BOLA
+        super().__init__(sistema, x, y, RAIO_BOLA)
         self.cor = cor
-        self.quiques = 0  # Contador de quiques para acelerar
         
         # Determina o tipo da bola baseado na cor
         if cor == COR_BOLA_VERMELHA:
@@ -84,106 +115,12 @@ class Bola:
         else:
             self.tipo = "neutro"
     
-    def atualizar(self):
-        """Atualiza a posição da bola aplicando física"""
-        # Aplica gravidade à velocidade vertical
-        self.vy += GRAVIDADE
-        
-        # Limita a velocidade máxima para evitar bolas muito rápidas
-        velocidade_atual = math.sqrt(self.vx**2 + self.vy**2)
-        if velocidade_atual > VELOCIDADE_MAXIMA:
-            fator_limitacao = VELOCIDADE_MAXIMA / velocidade_atual
-            self.vx *= fator_limitacao
-            self.vy *= fator_limitacao
-        
-        # Atualiza a posição baseada na velocidade
-        self.x += self.vx
-        self.y += self.vy
-        
-        # Verifica colisão com as bordas da tela
-        self._colisao_bordas()
-    
-    def _colisao_bordas(self):
-        """Verifica e resolve colisões com as bordas da tela"""
-        # Borda esquerda
-        if self.x - self.raio <= 0:
-            self.x = self.raio
-            self.vx = -self.vx * FORCA_QUIQUE
-            self._acelerar_apos_quique()
-        
-        # Borda direita
-        elif self.x + self.raio >= LARGURA:
-            self.x = LARGURA - self.raio
-            self.vx = -self.vx * FORCA_QUIQUE
-            self._acelerar_apos_quique()
-        
-        # Borda superior
-        if self.y - self.raio <= 0:
-            self.y = self.raio
-            self.vy = -self.vy * FORCA_QUIQUE
-            self._acelerar_apos_quique()
-        
-        # Borda inferior
-        elif self.y + self.raio >= ALTURA:
-            self.y = ALTURA - self.raio
-            self.vy = -self.vy * FORCA_QUIQUE
-            self._acelerar_apos_quique()
-    
-    def _acelerar_apos_quique(self):
-        """Acelera a bola após um quique"""
-        self.quiques += 1
-        # Aplica aceleração gradual, mas limitada
-        if self.quiques <= 15:  # Limita a quantidade de acelerações
-            self.vx *= ACELERACAO_QUIQUE
-            self.vy *= ACELERACAO_QUIQUE
-    
-    def colisao_com_bola(self, outra_bola):
-        """
-        Verifica e resolve colisão entre duas bolas
-        outra_bola: a outra bola para verificar colisão
-        """
-        # Calcula a distância entre os centros das bolas
-        distancia = math.sqrt((self.x - outra_bola.x)**2 + (self.y - outra_bola.y)**2)
-        
-        # Verifica se há colisão
-        if distancia < self.raio + outra_bola.raio and distancia > 0:
-            # Calcula o ângulo da colisão
-            angulo = math.atan2(outra_bola.y - self.y, outra_bola.x - self.x)
-            
-            # Separa as bolas para evitar sobreposição
-            sobreposicao = (self.raio + outra_bola.raio - distancia) / 2
-            self.x -= math.cos(angulo) * sobreposicao
-            self.y -= math.sin(angulo) * sobreposicao
-            outra_bola.x += math.cos(angulo) * sobreposicao
-            outra_bola.y += math.sin(angulo) * sobreposicao
-            
-            # Calcula as novas velocidades após a colisão
-            # Velocidade relativa
-            vx_rel = self.vx - outra_bola.vx
-            vy_rel = self.vy - outra_bola.vy
-            
-            # Velocidade normal (na direção da colisão)
-            velocidade_normal = vx_rel * math.cos(angulo) + vy_rel * math.sin(angulo)
-            
-            # Só resolve se as bolas estão se aproximando
-            if velocidade_normal > 0:
-                # Troca as velocidades normais com força de quique
-                impulso = 2 * velocidade_normal / 2  # Assumindo massas iguais
-                
-                self.vx -= impulso * math.cos(angulo) * FORCA_QUIQUE
-                self.vy -= impulso * math.sin(angulo) * FORCA_QUIQUE
-                outra_bola.vx += impulso * math.cos(angulo) * FORCA_QUIQUE
-                outra_bola.vy += impulso * math.sin(angulo) * FORCA_QUIQUE
-                
-                # Acelera ambas as bolas após a colisão
-                self._acelerar_apos_quique()
-                outra_bola._acelerar_apos_quique()
-    
     def colisao_com_contorno(self, contorno):
         """
         Verifica e resolve colisão com um contorno circular - COM SISTEMA DE CORES
         contorno: objeto Contorno para verificar colisão
-        Retorna True se houve colisão e destruição, False caso contrário
+        Retorna (bateu, pode_destruir): bateu é True se a bola quicou no contorno ou
+        o tocou com a cor dele (destruição); pode_destruir aplica a regra das cores
         """
         # Calcula a distância entre o centro da bola e o centro do contorno
         distancia = math.sqrt((self.x - contorno.x)**2 + (self.y - contorno.y)**2)
@@ -207,21 +144,20 @@ class Bola:
                 velocidade_normal = self.vx * math.cos(angulo) + self.vy * math.sin(angulo)
                 
                 # Inverte a velocidade normal se a bola está se movendo em direção à borda
-                if velocidade_normal > 0:
+                quicou = velocidade_normal > 0
+                if quicou:
                     self.vx -= 2 * velocidade_normal * math.cos(angulo) * FORCA_QUIQUE
                     self.vy -= 2 * velocidade_normal * math.sin(angulo) * FORCA_QUIQUE
                     
                     # Acelera a bola após o quique
                     self._acelerar_apos_quique()
                 
-                # SISTEMA DE CORES: Verifica se a bola pode destruir o contorno
-                if self.pode_destruir_contorno(contorno):
-                    return True  # Pode destruir
-                else:
-                    # Apenas quica, não destrói
-                    return False
+                # SISTEMA DE CORES: a bola destrói o contorno da sua cor; nos outros apenas quica
+                # (o contato sem quique, com a bola já se afastando da borda, não conta como batida)
+                pode_destruir = self.pode_destruir_contorno(contorno)
+                return quicou or pode_destruir, pode_destruir
         
-        return False  # Não houve colisão
+        return False, False  # Não houve colisão
     
     def pode_destruir_contorno(self, contorno):
         """
@@ -234,113 +170,48 @@ class Bola:
         """Desenha a bola na tela"""
         pygame.draw.circle(tela, self.cor, (int(self.x), int(self.y)), self.raio)
 
-class Contorno:
-    """Classe que representa um contorno circular móvel e colorido"""
-    
-    def __init__(self, x, y, raio_inicial, tipo_cor):
-        """
-        Inicializa um contorno
-        x, y: posição inicial do contorno
-        raio_inicial: raio inicial do contorno
-        tipo_cor: "vermelho" ou "azul"
-        """
-        self.x = x
-        self.y = y
-        self.raio = raio_inicial
-        self.raio_inicial = raio_inicial
-        self.ativo = True
-        self.alpha = 255
-        self.destruido = False
-        
-        # Sistema de cores
-        self.tipo = tipo_cor
-        if tipo_cor == "vermelho":
-            self.cor = COR_CONTORNO_VERMELHO
-        elif tipo_cor == "azul":
-            self.cor = COR_CONTORNO_AZUL
-        else:
-            self.cor = COR_CONTORNO_NEUTRO
-        
-        # Sistema de movimento
-        self.centro_alvo_x = LARGURA // 2
-        self.centro_alvo_y = (ALTURA // 2) * 1.3
-        self.vx = 0  # Velocidade horizontal
-        self.vy = 0  # Velocidade vertical
-        self.velocidade_atual = VELOCIDADE_INICIAL_CONTORNO
-        
-        # Calcula direção inicial em direção ao centro
-        self._calcular_direcao_inicial()
-    
-    def _calcular_direcao_inicial(self):
-        """Calcula a direção inicial do movimento em direção às bolas"""
-        # Como os contornos começam no centro, eles se expandem para fora inicialmente
-        # Mas depois se movem em direção às bolas quando detectam proximidade
-        self.vx = 0
-        self.vy = 0
-    
-    def atualizar(self):
-        """Atualiza o contorno (movimento, diminuição de tamanho)"""
-        if self.ativo and not self.destruido:
-            # Atualiza movimento em direção ao centro
-            self._atualizar_movimento()
-            
-            # Atualiza posição
-            self.x += self.vx
-            self.y += self.vy
-            
-            # Diminui o raio gradualmente
-            self.raio -= VELOCIDADE_DIMINUICAO
-            
-            # Se o raio ficou muito pequeno, desativa o contorno
-            if self.raio <= RAIO_MINIMO_CONTORNO:
-                self.ativo = False
-        
-        # Se foi destruído, aplica efeito fade
-        if self.destruido:
-            self.alpha -= 15  # Velocidade do fade
-            if self.alpha <= 0:
-                self.ativo = False
+# Anéis dos contornos em fade já desenhados, por (raio, espessura, cor)
+SPRITES_CONTORNO = sprite_cache.CacheSprites()
+
+def criar_pool_contornos():
+    """
+    Cria o pool de contornos com as constantes deste jogo
+    A capacidade sai das constantes atuais (simulate e o sweep podem trocá-las)
+    """
+    capacidade = ring_pool.capacidade_necessaria(QUANTIDADE_CONTORNOS_SIMULTANEOS, INTERVALO_CRIACAO)
+    return ring_pool.PoolContornos(capacidade, RAIO_MINIMO_CONTORNO, VELOCIDADE_DIMINUICAO,
+                                   classe_contorno=Contorno)
+
+def atualizar_contornos(contornos, passo=1.0):
+    """
+    Atualiza todos os contornos em lote (movimento, diminuição de tamanho e fade)
+    contornos: PoolContornos do jogo
+    passo: fração do frame avançada (1 / subpassos de física)
+    """
+    # Movimento com aceleração em direção ao centro (onde estão as bolas)
+    contornos.mover_para_alvo(passo, CENTRO_ALVO_X, CENTRO_ALVO_Y, ACELERACAO_CONTORNO,
+                              VELOCIDADE_INICIAL_CONTORNO * 2, DESACELERACAO_CONTORNO, 0.5,
+                              DISTANCIA_DESACELERACAO)
     
-    def _atualizar_movimento(self):
-        """Atualiza o movimento do contorno com aceleração em direção às bolas"""
-        # Encontra a bola mais próxima (assumindo que há duas bolas no centro)
-        # Para simplificar, vamos usar o centro como alvo inicial
-        dx = self.centro_alvo_x - self.x
-        dy = self.centro_alvo_y - self.y
-        distancia_ao_alvo = math.sqrt(dx**2 + dy**2)
-        
-        if distancia_ao_alvo > 5:  # Evita divisão por zero
-            # Normaliza a direção
-            direcao_x = dx / distancia_ao_alvo
-            direcao_y = dy / distancia_ao_alvo
-            
-            # Sistema de aceleração/desaceleração baseado na distância
-            if distancia_ao_alvo > DISTANCIA_DESACELERACAO:
-                # Longe do alvo: acelera
-                self.velocidade_atual += ACELERACAO_CONTORNO
-                self.velocidade_atual = min(self.velocidade_atual, VELOCIDADE_INICIAL_CONTORNO * 2)
-            else:
-                # Próximo do alvo: desacelera
-                self.velocidade_atual *= DESACELERACAO_CONTORNO
-                self.velocidade_atual = max(self.velocidade_atual, 0.5)
-            
-            # Aplica a velocidade na direção do alvo
-            self.vx = direcao_x * self.velocidade_atual
-            self.vy = direcao_y * self.velocidade_atual
+    # Diminui o raio, aplica o fade e libera os slots dos contornos desativados
+    contornos.atualizar(passo)
+
+class Contorno(ring_pool.ContornoPool):
+    """
+    Contorno circular móvel e colorido; os dados (posição, raio, velocidade,
+    alpha, cor e tipo) ficam no PoolContornos, que os atualiza em lote
+    """
     
-    def destruir(self):
-        """Marca o contorno para ser destruído com efeito fade"""
-        self.destruido = True
+    __slots__ = ()
+    TIPOS = ("vermelho", "azul", "neutro")
     
     def desenhar(self, tela):
         """Desenha o contorno na tela com sua cor específica"""
         if self.ativo and self.raio > 0:
             if self.destruido:
-                # Desenha com transparência se está sendo destruído
-                superficie_temp = pygame.Surface((self.raio * 2 + 20, self.raio * 2 + 20), pygame.SRCALPHA)
-                pygame.draw.circle(superficie_temp, (*self.cor, max(0, self.alpha)), 
-                                 (self.raio + 10, self.raio + 10), int(self.raio), ESPESSURA_CONTORNO)
-                tela.blit(superficie_temp, (self.x - self.raio - 10, self.y - self.raio - 10))
+                # Desenha com transparência se está sendo destruído (sprite do cache, alpha no blit)
+                SPRITES_CONTORNO.desenhar_anel(tela, self.x, self.y, self.raio, ESPESSURA_CONTORNO,
+                                               self.cor, max(0, int(self.alpha)))
             else:
                 # Desenha normalmente com sua cor
                 pygame.draw.circle(tela, self.cor, (int(self.x), int(self.y)), int(self.raio), ESPESSURA_CONTORNO)
@@ -360,24 +231,24 @@ class GeradorContornos:
     def atualizar(self, contornos):
         """
         Atualiza o gerador e cria novos contornos quando necessário
-        contornos: lista atual de contornos
+        contornos: PoolContornos do jogo
+        Retorna o contorno criado neste frame (ou None)
         """
         self.contador_frames += 1
         
         # Verifica se é hora de criar um novo contorno
         if self.contador_frames >= INTERVALO_CRIACAO:
-            # Conta quantos contornos ativos existem
-            contornos_ativos = [c for c in contornos if c.ativo and not c.destruido]
-            
-            # Se há menos contornos que o máximo, cria um novo
-            if len(contornos_ativos) < QUANTIDADE_CONTORNOS_SIMULTANEOS:
+            # Se há menos contornos vivos que o máximo, cria um novo (contagem O(1) do pool)
+            if contornos.quantidade_vivos < QUANTIDADE_CONTORNOS_SIMULTANEOS:
                 # Alterna cor
                 tipo_cor = "vermelho" if self.alternar_cor else "azul"
+                cor = COR_CONTORNO_VERMELHO if self.alternar_cor else COR_CONTORNO_AZUL
                 self.alternar_cor = not self.alternar_cor
                 
-                # Cria novo contorno no centro
-                novo_contorno = Contorno(self.centro_x, self.centro_y, self.proximo_raio, tipo_cor)
-                contornos.append(novo_contorno)
+                # Cria novo contorno no centro (reaproveita um slot livre do pool)
+                novo_contorno = contornos.criar(self.centro_x, self.centro_y, self.proximo_raio, cor=cor,
+                                                tipo=Contorno.TIPOS.index(tipo_cor),
+                                                velocidade=VELOCIDADE_INICIAL_CONTORNO)
                 
                 # Incrementa o raio para o próximo contorno
                 self.proximo_raio += 25
@@ -386,14 +257,17 @@ class GeradorContornos:
                 
                 # Reseta o contador
                 self.contador_frames = 0
+                return novo_contorno
+        return None
 
-def check_timer():
-    """Verifica se o timer de 30 segundos terminou"""
-    global game_start_time, finalizar_gravacao
-    if game_start_time is None:
-        return False
+def check_timer(relogio):
+    """
+    Verifica se o timer de 30 segundos terminou
+    relogio: RelogioJogo do loop principal (conta frames no modo rápido)
+    """
+    global finalizar_gravacao
     
-    elapsed_time = time.time() - game_start_time
+    elapsed_time = relogio.tempo_decorrido()
     seconds_passed = int(elapsed_time)
     print(f"Tempo decorrido: {seconds_passed} segundos")
     
@@ -402,34 +276,142 @@ def check_timer():
         return True
     return False
 
-def main():
-    """Função principal do jogo"""
-    global game_start_time, finalizar_gravacao
+class Partida:
+    """
+    Estado e regras de uma partida (duas bolas, contornos, gerador e colisões), sem desenho
+    Usada pelo main, que desenha cada frame, e pelo simulate, que só registra os eventos
+    """
     
-    # Inicializa o timer
-    game_start_time = time.time()
-    print("Jogo iniciado! Timer de 30 segundos começou.")
+    def __init__(self, linha_do_tempo=None):
+        """linha_do_tempo: LinhaDoTempo que recebe os eventos (None = não registra)"""
+        self.linha_do_tempo = linha_do_tempo
+        self.frame = 0
+        self.contornos_destruidos_total = 0
+        self.quiques_incompativeis = 0
+        
+        # Inicializa o pool de contornos (vazio)
+        self.contornos = criar_pool_contornos()
+        
+        # Cria o gerador de contornos infinitos
+        self.gerador = GeradorContornos()
+        
+        # Calcula o centro da tela para posicionar as bolas
+        centro_x = LARGURA // 2
+        centro_y = ALTURA // 2
+        
+        # Cria as duas bolas no centro da tela
+        self.sistema_bolas = criar_sistema_bolas()
+        self.bola_vermelha = Bola(self.sistema_bolas, centro_x - 25, centro_y, COR_BOLA_VERMELHA)
+        self.bola_azul = Bola(self.sistema_bolas, centro_x + 25, centro_y, COR_BOLA_AZUL)
+        
+        # Dá uma pequena velocidade inicial para as bolas se moverem
+        self.bola_vermelha.vx = -2
+        self.bola_azul.vx = 2
+    
+    def registrar(self, tipo, entidades=(), x=None, y=None):
+        """Registra um evento do frame atual na linha do tempo (se houver)"""
+        if self.linha_do_tempo is not None:
+            self.linha_do_tempo.registrar(self.frame, tipo, entidades, x, y)
+    
+    def tempo_decorrido(self):
+        """Tempo de jogo em segundos (passo fixo: frames / FPS_JOGO)"""
+        return self.frame / render_mode.FPS_JOGO
+    
+    def _colisao_bola_contorno(self, bola, contorno):
+        """Resolve a colisão de uma bola com um contorno e aplica a regra das cores"""
+        if contorno.ativo and not contorno.destruido:
+            bateu, pode_destruir = bola.colisao_com_contorno(contorno)
+            if bateu:
+                if pode_destruir:
+                    contorno.destruir()
+                    self.contornos_destruidos_total += 1
+                    self.registrar("contorno_destruido", (bola.tipo, contorno.ordem), bola.x, bola.y)
+                else:
+                    self.quiques_incompativeis += 1
+                    self.registrar("quique_incompativel", (bola.tipo, contorno.ordem), bola.x, bola.y)
+    
+    def avancar(self):
+        """Avança um frame: gerador de contornos e física em subpassos"""
+        # Atualiza o gerador de contornos
+        novo_contorno = self.gerador.atualizar(self.contornos)
+        if novo_contorno is not None:
+            self.registrar("contorno_criado", (novo_contorno.tipo, novo_contorno.ordem),
+                           novo_contorno.x, novo_contorno.y)
+        
+        # Física em subpassos (TOKAI_SUBPASSOS): cada um avança PASSO_FISICA do frame,
+        # para mais precisão na trajetória sem aumentar o FPS
+        for _ in range(render_mode.SUBPASSOS):
+            # Atualiza as bolas (gravidade, velocidade máxima e bordas em lote)
+            self.sistema_bolas.atualizar(render_mode.PASSO_FISICA)
+        
+            # Verifica colisão entre as bolas
+            self.sistema_bolas.colisoes_entre_bolas()
+        
+            # Atualiza contornos (movimento, diminuição e fade em lote)
+            atualizar_contornos(self.contornos, render_mode.PASSO_FISICA)
+        
+            # Verifica colisões: o teste do anel é feito em lote (duas bolas x todos os
+            # contornos) e só os contornos em contato são resolvidos, na ordem da lista
+            contornos_vivos = self.contornos.vivos()
+            # Bolas rápidas que atravessaram um contorno no passo voltam ao ponto de contato
+            corrigidas, t_contato = physics.corrigir_tunelamento(self.sistema_bolas, contornos_vivos,
+                                                                 ESPESSURA_CONTORNO)
+            bolas = [self.bola_vermelha, self.bola_azul]
+            for contorno in physics.contatos_em_ordem(bolas, contornos_vivos, ESPESSURA_CONTORNO):
+                # Verifica colisão com a bola vermelha e depois com a azul
+                for bola in bolas:
+                    self._colisao_bola_contorno(bola, contorno)
+            # ... e depois do quique andam o que faltava do passo
+            physics.avancar_restante(self.sistema_bolas, corrigidas, t_contato, render_mode.PASSO_FISICA)
+        
+        self.frame += 1
+
+def desenhar_partida(tela, partida):
+    """Desenha um frame da partida (fundo, contornos e bolas)"""
+    # Limpa a tela com cor de fundo preta
+    tela.fill(COR_FUNDO)
     
-    # Inicializa o relógio para controlar FPS
-    clock = pygame.time.Clock()
+    # Desenha todos os contornos
+    for contorno in partida.contornos.ativos():
+        contorno.desenhar(tela)
     
-    # Inicializa lista de contornos vazia
-    contornos = []
+    # Desenha as bolas
+    partida.bola_vermelha.desenhar(tela)
+    partida.bola_azul.desenhar(tela)
 
-    # Cria o gerador de contornos infinitos
-    gerador = GeradorContornos()
+def criar_reproducao(gravacao):
+    """
+    Prepara o redesenho de um replay (replay.py) com o desenho do jogo, sem física
+    gravacao: replay.Replay desta partida (constantes do jogo já restauradas)
+    Retorna (desenhar_frame(tela, indice), reproduzir_tela); este jogo não tem telas fora da partida
+    """
+    partida = Partida()
+    bolas = [partida.bola_vermelha, partida.bola_azul]
     
-    # Calcula o centro da tela para posicionar as bolas
-    centro_x = LARGURA // 2
-    centro_y = ALTURA // 2
+    def desenhar_frame(tela, indice):
+        gravacao.restaurar_bolas(indice, bolas)
+        gravacao.restaurar_contornos(indice, partida.contornos)
+        desenhar_partida(tela, partida)
     
-    # Cria as duas bolas no centro da tela
-    bola_vermelha = Bola(centro_x - 25, centro_y, COR_BOLA_VERMELHA)
-    bola_azul = Bola(centro_x + 25, centro_y, COR_BOLA_AZUL)
+    return desenhar_frame, None
+
+def main():
+    """Função principal do jogo"""
+    global finalizar_gravacao
     
-    # Dá uma pequena velocidade inicial para as bolas se moverem
-    bola_vermelha.vx = -2
-    bola_azul.vx = 2
+    iniciar_tela()
+    sortear_configuracao()
+    
+    # Inicializa o relógio para controlar FPS (também é o timer do jogo)
+    relogio = render_mode.RelogioJogo()
+    print("Jogo iniciado! Timer de 30 segundos começou.")
+    
+    # Cria a partida: duas bolas no centro, pool de contornos vazio e gerador
+    partida = Partida()
+    
+    # Replay do estado de cada frame (TOKAI_REPLAY, execute.py --replay)
+    gravador = replay.criar_gravador(sys.modules[__name__], [partida.bola_vermelha, partida.bola_azul],
+                                     partida.contornos, campos=("tempo", "contornos_destruidos"))
     
     print("Aplicativo iniciado com contornos móveis e sistema de cores!")
     print("REGRAS:")
@@ -437,14 +419,11 @@ def main():
     print("- Contornos AZUIS: só a bola azul pode destruir")
     print("- Bolas incompatíveis apenas quicam nos contornos")
     
-    contornos_destruidos_total = 0
-    quiques_incompativeis = 0
-    
     # Loop principal do jogo
     rodando = True
     while rodando:
         # Verifica o timer
-        if check_timer():
+        if check_timer(relogio):
             print("Tempo esgotado! Finalizando jogo...")
             rodando = False
             break
@@ -457,63 +436,23 @@ def main():
                 if evento.key == pygame.K_ESCAPE:
                     rodando = False
         
-        # Atualiza o gerador de contornos
-        gerador.atualizar(contornos)
-        
-        # Atualiza as bolas
-        bola_vermelha.atualizar()
-        bola_azul.atualizar()
-        
-        # Verifica colisão entre as bolas
-        bola_vermelha.colisao_com_bola(bola_azul)
-        
-        # Atualiza contornos e verifica colisões
-        contornos_restantes = []
-        for contorno in contornos:
-            contorno.atualizar()
-            
-            # Verifica colisão com bola vermelha
-            if contorno.ativo and not contorno.destruido:
-                if bola_vermelha.colisao_com_contorno(contorno):
-                    if bola_vermelha.pode_destruir_contorno(contorno):
-                        contorno.destruir()
-                        contornos_destruidos_total += 1
-                    else:
-                        quiques_incompativeis += 1
-            
-            # Verifica colisão com bola azul
-            if contorno.ativo and not contorno.destruido:
-                if bola_azul.colisao_com_contorno(contorno):
-                    if bola_azul.pode_destruir_contorno(contorno):
-                        contorno.destruir()
-                        contornos_destruidos_total += 1
-                    else:
-                        quiques_incompativeis += 1
-            
-            # Mantém contornos que ainda estão ativos
-            if contorno.ativo:
-                contornos_restantes.append(contorno)
-        
-        # Atualiza lista de contornos
-        contornos = contornos_restantes
+        # Gerador de contornos, física e colisões
+        partida.avancar()
         
         # ==================== DESENHO ====================
-        # Limpa a tela com cor de fundo preta
-        TELA.fill(COR_FUNDO)
-        
-        # Desenha todos os contornos
-        for contorno in contornos:
-            contorno.desenhar(TELA)
+        # Frames descartados pela conversão para o FPS do vídeo não são desenhados
+        if DESTINO_FRAMES is None or DESTINO_FRAMES.precisa_frame():
+            desenhar_partida(TELA, partida)
         
-        # Desenha as bolas
-        bola_vermelha.desenhar(TELA)
-        bola_azul.desenhar(TELA)
-        
-        # Atualiza a tela
-        pygame.display.update()
+            # Atualiza a tela
+            pygame.display.update()
+        if DESTINO_FRAMES:
+            DESTINO_FRAMES.enviar(TELA)
+        if gravador:
+            gravador.gravar(tempo=partida.tempo_decorrido(), contornos_destruidos=partida.contornos_destruidos_total)
 
         # Controla FPS
-        clock.tick(60)
+        relogio.tick()
     
     # Finaliza o Pygame
     pygame.quit()
@@ -521,7 +460,37 @@ def main():
     finalizar_gravacao = True
     sys.exit()
 
-pygame.display.flip()
+def simulate(seed, params=None, verbose=False):
+    """
+    Simula uma partida só com física e regras (sem janela nem desenho)
+    seed: semente da partida (a mesma do --seed do vídeo no modo rápido)
+    params: constantes do jogo a sobrescrever, ex.: {"ESPESSURA_CONTORNO": 4}
+    (aplicadas depois do sorteio da configuração)
+    verbose: mantém os prints do jogo
+    Retorna a LinhaDoTempo com os eventos contorno_criado (tipo, contorno),
+    contorno_destruido (bola, contorno), quique_incompativel (bola, contorno) e fim
+    """
+    linha = simulation.LinhaDoTempo("two_balls_circles", seed, params)
+    random.seed(seed)
+    with simulation.silenciar(not verbose):
+        sortear_configuracao()
+        with simulation.parametros_jogo(sys.modules[__name__], params):
+            partida = Partida(linha)
+            while partida.tempo_decorrido() < GAME_DURATION:
+                partida.avancar()
+            
+            partida.registrar("fim", (partida.contornos_destruidos_total,))
+            linha.frames = partida.frame
+            destruidos = linha.do_tipo("contorno_destruido")
+            linha.resultado = {
+                "contornos_destruidos": partida.contornos_destruidos_total,
+                "destruidos_vermelha": sum(1 for evento in destruidos if evento.entidades[0] == "vermelho"),
+                "destruidos_azul": sum(1 for evento in destruidos if evento.entidades[0] == "azul"),
+                "quiques_incompativeis": partida.quiques_incompativeis,
+                "espessura_contorno": ESPESSURA_CONTORNO,
+                "velocidade_diminuicao": VELOCIDADE_DIMINUICAO,
+            }
+    return linha
 
 # ==================== EXECUÇÃO DO PROGRAMA ====================
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+"""
+Estágio de codificação assíncrono do gravador
+A captura (screenshot ou anel de memória compartilhada) entrega os frames a
+uma fila limitada e uma thread separada faz o out.write(). Assim a cadência
+da captura não depende do tempo de codificação: o cv2.VideoWriter libera o
+GIL enquanto codifica, então o encoder roda em outro núcleo.
+"""
+
+import queue
+import threading
+import time
+
+_FIM = object()  # Sentinela de fim da fila
+
+
+class EncoderAssincrono:
+    """Thread de codificação alimentada por uma fila limitada de frames"""
+
+    def __init__(self, writer, tamanho_fila=48, medidor=None):
+        """
+        Inicializa e inicia a thread do encoder
+        writer: objeto com write(frame) (ex.: cv2.VideoWriter)
+        tamanho_fila: máximo de frames aguardando codificação (2 s a 24 fps)
+        medidor: MedidorFrames opcional que recebe o tempo de escrita de cada frame
+        """
+        self.writer = writer
+        self.medidor = medidor
+        self.fila = queue.Queue(maxsize=tamanho_fila)
+        self.erro = None
+
+        # Estatísticas
+        self.frames_enfileirados = 0
+        self.frames_codificados = 0
+        self.tempo_codificacao = 0.0   # Tempo total dentro de writer.write()
+        self.tempo_bloqueado = 0.0     # Tempo que a captura esperou com a fila cheia
+        self.bloqueios = 0             # Quantas vezes a captura encontrou a fila cheia
+        self.profundidade_maxima = 0
+        self.soma_profundidade = 0
+
+        self.thread = threading.Thread(target=self._loop, name="encoder", daemon=True)
+        self.thread.start()
+
+    def enviar(self, frame, ao_concluir=None):
+        """
+        Enfileira um frame para codificação (lado da captura)
+        Bloqueia somente se a fila estiver cheia; o tempo bloqueado entra nas estatísticas
+        ao_concluir: função chamada após o frame ser codificado (ex.: liberar o slot do anel)
+        """
+        if self.erro:
+            raise self.erro
+
+        profundidade = self.fila.qsize()
+        self.soma_profundidade += profundidade
+        self.profundidade_maxima = max(self.profundidade_maxima, profundidade)
+
+        try:
+            self.fila.put_nowait((frame, ao_concluir))
+        except queue.Full:
+            inicio = time.perf_counter()
+            self.fila.put((frame, ao_concluir))
+            self.tempo_bloqueado += time.perf_counter() - inicio
+            self.bloqueios += 1
+        self.frames_enfileirados += 1
+
+    def _loop(self):
+        """Loop da thread do encoder"""
+        while True:
+            item = self.fila.get()
+            if item is _FIM:
+                break
+            frame, ao_concluir = item
+            try:
+                if self.erro is None:
+                    inicio = time.perf_counter()
+                    self.writer.write(frame)
+                    duracao = time.perf_counter() - inicio
+                    self.tempo_codificacao += duracao
+                    if self.medidor:
+                        self.medidor.registrar("escrita", duracao)
+                    self.frames_codificados += 1
+            except Exception as e:
+                self.erro = e
+            finally:
+                if ao_concluir:
+                    ao_concluir()
+
+    def finalizar(self):
+        """Aguarda a codificação dos frames pendentes e encerra a thread"""
+        self.fila.put(_FIM)
+        self.thread.join()
+        if self.erro:
+            raise self.erro
+
+    def profundidade(self):
+        """Frames aguardando codificação no momento"""
+        return self.fila.qsize()
+
+    def estatisticas(self):
+        """Retorna as estatísticas de fila e de bloqueio"""
+        return {
+            "frames_enfileirados": self.frames_enfileirados,
+            "frames_codificados": self.frames_codificados,
+            "profundidade_atual": self.fila.qsize(),
+            "profundidade_maxima": self.profundidade_maxima,
+            "profundidade_media": self.soma_profundidade / max(1, self.frames_enfileirados),
+            "bloqueios": self.bloqueios,
+            "tempo_bloqueado_s": self.tempo_bloqueado,
+            "tempo_codificacao_s": self.tempo_codificacao,
+        }
+
+    def imprimir_estatisticas(self):
+        """Mostra o resumo das estatísticas no console"""
+        stats = self.estatisticas()
+        print("Estatísticas do encoder:")
+        print(f"- Frames codificados: {stats['frames_codificados']}/{stats['frames_enfileirados']}")
+        print(f"- Fila: média {stats['profundidade_media']:.1f}, máxima {stats['profundidade_maxima']}")
+        print(f"- Captura bloqueada: {stats['bloqueios']}x, {stats['tempo_bloqueado_s']:.3f} s")
+        print(f"- Tempo de codificação: {stats['tempo_codificacao_s']:.3f} s")
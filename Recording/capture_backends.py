@@ -0,0 +1,221 @@
+"""
+Backends de captura de tela do gravador
+Cada backend localiza a janela do jogo, informa se ela ainda existe e captura
+somente a área do cliente como um frame BGR na resolução do vídeo.
+- BackendWindows: win32gui + pyautogui (desktop Windows)
+- BackendX11: python-xlib + mss (Linux com X11/Xvfb, janela localizada pelo PID)
+"""
+
+import sys
+import time
+
+import cv2
+import numpy as np
+
+# Títulos das janelas dos scripts pygame
+TITULOS_PYGAME = [
+    "Efeito Interativo de Bolas - Sistema de Cores",
+    "Efeito Interativo de Bolas - Contornos Móveis e Coloridos",
+    "Jogo de Bolas com Contorno Fixo"
+]
+
+
+class BackendCaptura:
+    """Interface dos backends de captura"""
+
+    def __init__(self, resolucao):
+        """
+        resolucao: (largura, altura) dos frames entregues ao encoder
+        """
+        self.resolucao = resolucao
+        self.janela = None
+        self.medidor = None  # MedidorFrames opcional (tempo de cada etapa)
+
+    def localizar_janela(self, pid):
+        """
+        Procura a janela do jogo; retorna True se encontrou
+        pid: PID do processo do jogo
+        """
+        raise NotImplementedError
+
+    def janela_existe(self):
+        """Verifica se a janela encontrada ainda existe"""
+        raise NotImplementedError
+
+    def capturar(self):
+        """
+        Captura a janela (ou a tela inteira, se a janela não foi encontrada) em BGR
+        na resolução do vídeo; registra no medidor o tempo de cada etapa
+        """
+        try:
+            inicio = time.perf_counter()
+            bruto = self._capturar_bruto()
+            capturado = time.perf_counter()
+            frame = self._converter(bruto)
+            convertido = time.perf_counter()
+            frame = self._ajustar(frame)
+            ajustado = time.perf_counter()
+        except Exception as e:
+            print(f"Erro ao capturar janela: {e}")
+            return None
+
+        if self.medidor:
+            self.medidor.registrar("captura", capturado - inicio)
+            self.medidor.registrar("conversao", convertido - capturado)
+            self.medidor.registrar("redimensionamento", ajustado - convertido)
+        return frame
+
+    def _capturar_bruto(self):
+        """Captura os pixels no formato nativo do backend"""
+        raise NotImplementedError
+
+    def _converter(self, bruto):
+        """Converte os pixels nativos para BGR"""
+        raise NotImplementedError
+
+    def fechar(self):
+        """Libera os recursos do backend"""
+
+    def _ajustar(self, frame):
+        """Redimensiona para a resolução do vídeo somente quando necessário"""
+        if (frame.shape[1], frame.shape[0]) != self.resolucao:
+            frame = cv2.resize(frame, self.resolucao)
+        return frame
+
+
+class BackendWindows(BackendCaptura):
+    """Captura pela API do Windows (win32gui) e pyautogui"""
+
+    def __init__(self, resolucao):
+        super().__init__(resolucao)
+        import pyautogui
+        import win32gui
+        self.pyautogui = pyautogui
+        self.win32gui = win32gui
+
+    def localizar_janela(self, pid):
+        """Encontra a janela do pygame pelo título"""
+        win32gui = self.win32gui
+
+        def enum_windows_callback(hwnd, windows):
+            if win32gui.IsWindowVisible(hwnd):
+                window_title = win32gui.GetWindowText(hwnd)
+                if any(titulo in window_title for titulo in TITULOS_PYGAME):
+                    windows.append(hwnd)
+            return True
+
+        windows = []
+        win32gui.EnumWindows(enum_windows_callback, windows)
+        self.janela = windows[0] if windows else None
+        return self.janela is not None
+
+    def janela_existe(self):
+        try:
+            return bool(self.win32gui.IsWindow(self.janela))
+        except Exception:
+            return False
+
+    def _capturar_bruto(self):
+        """Captura somente o conteúdo da janela (área do cliente) em RGB"""
+        if not self.janela:
+            # Fallback para captura de tela completa
+            return np.array(self.pyautogui.screenshot())
+
+        # Tamanho da área do cliente
+        left, top, right, bottom = self.win32gui.GetClientRect(self.janela)
+        width = right - left
+        height = bottom - top
+
+        # Posição do canto superior esquerdo da área do cliente na tela
+        x, y = self.win32gui.ClientToScreen(self.janela, (left, top))
+
+        return np.array(self.pyautogui.screenshot(region=(x, y, width, height)))
+
+    def _converter(self, bruto):
+        return cv2.cvtColor(bruto, cv2.COLOR_RGB2BGR)
+
+
+class BackendX11(BackendCaptura):
+    """
+    Captura em X11/Xvfb: a janela é localizada pela propriedade _NET_WM_PID
+    (definida pelo SDL) e somente a sua região é capturada com mss
+    Funciona com vários displays virtuais por servidor (DISPLAY de cada Xvfb)
+    """
+
+    def __init__(self, resolucao):
+        super().__init__(resolucao)
+        import mss
+        from Xlib import X, display, error
+        self.X = X
+        self.erro_xlib = error
+        self.display = display.Display()
+        self.raiz = self.display.screen().root
+        self.atom_pid = self.display.intern_atom("_NET_WM_PID")
+        self.mss = mss.mss()
+
+    def _janelas(self, janela):
+        """Percorre a árvore de janelas (funciona sem gerenciador de janelas, como no Xvfb)"""
+        yield janela
+        for filha in janela.query_tree().children:
+            yield from self._janelas(filha)
+
+    def localizar_janela(self, pid):
+        """Encontra a janela mapeada do pygame cujo _NET_WM_PID é o PID do jogo"""
+        self.janela = None
+        try:
+            for janela in self._janelas(self.raiz):
+                prop = janela.get_full_property(self.atom_pid, self.X.AnyPropertyType)
+                if prop is None or not prop.value or prop.value[0] != pid:
+                    continue
+                if janela.get_attributes().map_state == self.X.IsViewable:
+                    self.janela = janela
+                    break
+        except self.erro_xlib.XError:
+            # A árvore mudou durante a busca; tenta de novo na próxima chamada
+            self.janela = None
+        return self.janela is not None
+
+    def janela_existe(self):
+        try:
+            self.janela.get_geometry()
+            return True
+        except self.erro_xlib.XError:
+            return False
+
+    def _regiao(self):
+        """Retorna a região da janela em coordenadas da tela"""
+        geometria = self.janela.get_geometry()
+        # Posição do canto superior esquerdo da janela na raiz (tela)
+        origem = self.raiz.translate_coords(self.janela, 0, 0)
+        return {"left": origem.x, "top": origem.y,
+                "width": geometria.width, "height": geometria.height}
+
+    def _capturar_bruto(self):
+        regiao = self._regiao() if self.janela else self.mss.monitors[1]
+        # mss devolve BGRA
+        return np.asarray(self.mss.grab(regiao))
+
+    def _converter(self, bruto):
+        # Descarta o canal alfa
+        return cv2.cvtColor(bruto, cv2.COLOR_BGRA2BGR)
+
+    def fechar(self):
+        self.mss.close()
+        self.display.close()
+
+
+BACKENDS = {
+    "windows": BackendWindows,
+    "x11": BackendX11,
+}
+
+
+def criar_backend(nome, resolucao):
+    """
+    Cria o backend de captura pelo nome ("auto" escolhe pelo sistema operacional)
+    """
+    if nome == "auto":
+        nome = "windows" if sys.platform == "win32" else "x11"
+    if nome not in BACKENDS:
+        raise ValueError(f"Backend de captura desconhecido: {nome}")
+    return BACKENDS[nome](resolucao)
@@ -0,0 +1,114 @@
+"""
+Instrumentação de tempo por frame do gravador
+Registra a latência de cada etapa (captura, conversão, redimensionamento e
+escrita), conta frames perdidos e duplicados em relação ao FPS alvo e salva
+um relatório JSON com histogramas ao lado do vídeo.
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+ETAPAS = ("captura", "conversao", "redimensionamento", "escrita")
+
+# Limites dos intervalos dos histogramas (ms)
+LIMITES_HISTOGRAMA_MS = [0, 1, 2, 5, 10, 20, 30, 41.7, 50, 100, 200, 500]
+
+
+class MedidorFrames:
+    """Coleta os tempos por frame e as contagens de frames perdidos/duplicados"""
+
+    def __init__(self, fps_alvo):
+        """
+        fps_alvo: FPS do vídeo (o orçamento por frame é 1000 / fps_alvo ms)
+        """
+        self.fps_alvo = fps_alvo
+        self.orcamento_ms = 1000.0 / fps_alvo
+        self.inicio = time.perf_counter()
+        # listas.append é atômico no CPython: a thread do encoder registra a escrita
+        self.tempos = {etapa: [] for etapa in ETAPAS}
+        self.timestamps = []
+        self.ultimo_slot = None
+        self.perdidos = 0
+        self.duplicados = 0
+
+    def registrar(self, etapa, segundos):
+        """Registra a duração de uma etapa de um frame"""
+        self.tempos[etapa].append(segundos * 1000.0)
+
+    def marcar_frame(self, slot=None):
+        """
+        Marca um frame entregue ao encoder
+        slot: índice do frame de vídeo a que ele corresponde; por padrão é
+        calculado pelo relógio (tempo desde o início × FPS alvo)
+        Um salto de slot conta frames perdidos; o mesmo slot repetido, duplicados
+        """
+        agora = time.perf_counter() - self.inicio
+        if slot is None:
+            slot = int(round(agora * self.fps_alvo))
+        self.timestamps.append(agora)
+
+        if self.ultimo_slot is not None:
+            if slot == self.ultimo_slot:
+                self.duplicados += 1
+            elif slot > self.ultimo_slot + 1:
+                self.perdidos += slot - self.ultimo_slot - 1
+        self.ultimo_slot = slot
+
+    def _resumo(self, valores):
+        """Estatísticas e histograma de uma lista de tempos (ms)"""
+        dados = np.asarray(valores, dtype=np.float64)
+        if dados.size == 0:
+            return {"frames": 0}
+        limites = LIMITES_HISTOGRAMA_MS + [float("inf")]
+        contagens, _ = np.histogram(dados, bins=limites)
+        return {
+            "frames": int(dados.size),
+            "media_ms": float(dados.mean()),
+            "p50_ms": float(np.percentile(dados, 50)),
+            "p95_ms": float(np.percentile(dados, 95)),
+            "p99_ms": float(np.percentile(dados, 99)),
+            "max_ms": float(dados.max()),
+            "acima_do_orcamento": int((dados > self.orcamento_ms).sum()),
+            "histograma": {
+                f"{limites[i]}-{limites[i + 1]}": int(contagens[i]) for i in range(len(contagens))
+            },
+        }
+
+    def relatorio(self):
+        """Monta o relatório completo"""
+        duracao = self.timestamps[-1] if self.timestamps else 0.0
+        intervalos = np.diff(self.timestamps) * 1000.0 if len(self.timestamps) > 1 else []
+        return {
+            "fps_alvo": self.fps_alvo,
+            "orcamento_ms": self.orcamento_ms,
+            "frames": len(self.timestamps),
+            "duracao_s": duracao,
+            "fps_medio": len(self.timestamps) / duracao if duracao > 0 else 0.0,
+            "perdidos": self.perdidos,
+            "duplicados": self.duplicados,
+            "etapas": {etapa: self._resumo(self.tempos[etapa]) for etapa in ETAPAS},
+            "intervalo_entre_frames": self._resumo(intervalos),
+            "por_frame": {
+                "timestamp_s": [round(t, 6) for t in self.timestamps],
+                **{f"{etapa}_ms": [round(t, 3) for t in self.tempos[etapa]] for etapa in ETAPAS},
+            },
+        }
+
+    def salvar(self, caminho_video):
+        """Salva o relatório como <vídeo>.timing.json e retorna o caminho"""
+        caminho = os.path.splitext(caminho_video)[0] + ".timing.json"
+        relatorio = self.relatorio()
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent=2)
+
+        print(f"Relatório de tempo por frame: {caminho}")
+        print(f"- Frames: {relatorio['frames']} ({relatorio['fps_medio']:.1f} fps, alvo {self.fps_alvo:g})")
+        print(f"- Perdidos: {self.perdidos}, duplicados: {self.duplicados}")
+        for etapa in ETAPAS:
+            resumo = relatorio["etapas"][etapa]
+            if resumo["frames"]:
+                print(f"- {etapa}: média {resumo['media_ms']:.2f} ms, p95 {resumo['p95_ms']:.2f} ms")
+        return caminho
@@ -0,0 +1,186 @@
+"""
+Cache de renderizações endereçado por conteúdo
+Uma execução no modo rápido é definida por (script, semente, constantes, assets):
+com as mesmas entradas ela gera os mesmos frames, então renderizar de novo é
+trabalho desperdiçado. Cada entrada do cache guarda os artefatos (vídeo
+gravado, logs de eventos, vídeo editado) em uma pasta com o nome do hash das
+entradas; as entradas menos usadas são removidas quando o cache passa do
+tamanho máximo (LRU por tamanho).
+
+Estrutura:
+    <pasta>/<chave>/manifesto.json  -> artefatos, tamanho e último acesso
+    <pasta>/<chave>/<artefato>
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+PASTA_PADRAO = os.environ.get("TOKAI_CACHE", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                          ".render_cache"))
+TAMANHO_MAXIMO_PADRAO = 5 * 1024 ** 3  # 5 GB
+
+# Hash por (caminho, tamanho, mtime): os assets são lidos uma única vez por processo
+_hashes_arquivos = {}
+
+
+def hash_arquivo(caminho):
+    """SHA-256 do conteúdo de um arquivo"""
+    stat = os.stat(caminho)
+    memo = (os.path.abspath(caminho), stat.st_size, stat.st_mtime_ns)
+    if memo not in _hashes_arquivos:
+        sha = hashlib.sha256()
+        with open(caminho, "rb") as arquivo:
+            for bloco in iter(lambda: arquivo.read(1024 * 1024), b""):
+                sha.update(bloco)
+        _hashes_arquivos[memo] = sha.hexdigest()
+    return _hashes_arquivos[memo]
+
+
+def hash_entradas(base, **entradas):
+    """
+    Calcula a chave de uma renderização
+    base: pasta de referência dos caminhos (os caminhos entram relativos no hash)
+    entradas: valores simples (semente, constantes) e listas de arquivos/pastas em
+    entradas["arquivos"], cujo conteúdo entra no hash
+    """
+    sha = hashlib.sha256()
+    arquivos = entradas.pop("arquivos", [])
+    sha.update(json.dumps(entradas, sort_keys=True, default=str).encode())
+
+    for caminho in sorted(arquivos):
+        completo = os.path.join(base, caminho)
+        if os.path.isdir(completo):
+            for pasta, subpastas, nomes in os.walk(completo):
+                subpastas[:] = sorted(d for d in subpastas if d != "__pycache__")
+                for nome in sorted(nomes):
+                    arquivo = os.path.join(pasta, nome)
+                    sha.update(os.path.relpath(arquivo, base).replace(os.sep, "/").encode())
+                    sha.update(hash_arquivo(arquivo).encode())
+        elif os.path.exists(completo):
+            sha.update(caminho.replace(os.sep, "/").encode())
+            sha.update(hash_arquivo(completo).encode())
+        else:
+            sha.update(f"{caminho}:ausente".encode())
+    return sha.hexdigest()
+
+
+class CacheRenderizacao:
+    """Cache de artefatos de renderização com remoção LRU por tamanho"""
+
+    def __init__(self, pasta=PASTA_PADRAO, tamanho_maximo=TAMANHO_MAXIMO_PADRAO):
+        """
+        pasta: pasta do cache (TOKAI_CACHE ou .render_cache na raiz do projeto)
+        tamanho_maximo: tamanho total em bytes a partir do qual as entradas
+        menos usadas são removidas
+        """
+        self.pasta = pasta
+        self.tamanho_maximo = tamanho_maximo
+        os.makedirs(self.pasta, exist_ok=True)
+
+    def _manifesto(self, chave):
+        return os.path.join(self.pasta, chave, "manifesto.json")
+
+    def _ler_manifesto(self, chave):
+        try:
+            with open(self._manifesto(chave), encoding="utf-8") as arquivo:
+                return json.load(arquivo)
+        except (OSError, ValueError):
+            return None
+
+    def buscar(self, chave, pasta_destino):
+        """
+        Copia os artefatos da entrada para pasta_destino
+        Retorna {nome do artefato: caminho copiado} ou None se a chave não está no cache
+        """
+        manifesto = self._ler_manifesto(chave)
+        if manifesto is None:
+            return None
+
+        os.makedirs(pasta_destino, exist_ok=True)
+        copiados = {}
+        try:
+            for nome, arquivo in manifesto["artefatos"].items():
+                destino = os.path.join(pasta_destino, arquivo)
+                # Cópia (não hardlink): o ffmpeg -y sobrescreve o arquivo no lugar e corromperia o cache
+                shutil.copyfile(os.path.join(self.pasta, chave, arquivo), destino)
+                copiados[nome] = destino
+        except OSError:
+            # Entrada removida por outro processo durante a cópia
+            return None
+
+        # Atualiza o último acesso (ordem do LRU)
+        manifesto["ultimo_acesso"] = time.time()
+        self._gravar_manifesto(chave, manifesto)
+        return copiados
+
+    def guardar(self, chave, artefatos, info=None):
+        """
+        Guarda os artefatos de uma renderização
+        artefatos: {nome do artefato: caminho do arquivo}; arquivos inexistentes são ignorados
+        info: dicionário com dados da execução (script, semente...) salvo no manifesto
+        """
+        if os.path.exists(self._manifesto(chave)):
+            return
+
+        # Escreve em uma pasta temporária e renomeia: outros processos (modo batch)
+        # nunca veem uma entrada incompleta
+        temporaria = os.path.join(self.pasta, f"{chave}.tmp-{os.getpid()}")
+        os.makedirs(temporaria, exist_ok=True)
+        manifesto = {"artefatos": {}, "info": info or {}, "tamanho": 0,
+                     "criado": time.time(), "ultimo_acesso": time.time()}
+        for nome, caminho in artefatos.items():
+            if not caminho or not os.path.exists(caminho):
+                continue
+            arquivo = os.path.basename(caminho)
+            shutil.copyfile(caminho, os.path.join(temporaria, arquivo))
+            manifesto["artefatos"][nome] = arquivo
+            manifesto["tamanho"] += os.path.getsize(caminho)
+
+        with open(os.path.join(temporaria, "manifesto.json"), "w", encoding="utf-8") as arquivo:
+            json.dump(manifesto, arquivo, indent=2)
+        try:
+            os.rename(temporaria, os.path.join(self.pasta, chave))
+        except OSError:
+            # Outro processo guardou a mesma chave primeiro
+            shutil.rmtree(temporaria, ignore_errors=True)
+
+        self.remover_excedente()
+
+    def _gravar_manifesto(self, chave, manifesto):
+        temporario = f"{self._manifesto(chave)}.{os.getpid()}"
+        try:
+            with open(temporario, "w", encoding="utf-8") as arquivo:
+                json.dump(manifesto, arquivo, indent=2)
+            os.replace(temporario, self._manifesto(chave))
+        except OSError:
+            pass
+
+    def entradas(self):
+        """Lista (chave, manifesto) das entradas completas do cache"""
+        resultado = []
+        for chave in os.listdir(self.pasta):
+            if ".tmp-" in chave:
+                continue
+            manifesto = self._ler_manifesto(chave)
+            if manifesto is not None:
+                resultado.append((chave, manifesto))
+        return resultado
+
+    def tamanho_total(self):
+        return sum(manifesto["tamanho"] for _, manifesto in self.entradas())
+
+    def remover_excedente(self):
+        """Remove as entradas menos usadas até o cache caber no tamanho máximo"""
+        entradas = sorted(self.entradas(), key=lambda item: item[1]["ultimo_acesso"])
+        total = sum(manifesto["tamanho"] for _, manifesto in entradas)
+        removidas = 0
+        for chave, manifesto in entradas:
+            if total <= self.tamanho_maximo:
+                break
+            shutil.rmtree(os.path.join(self.pasta, chave), ignore_errors=True)
+            total -= manifesto["tamanho"]
+            removidas += 1
+        return removidas
@@ -0,0 +1,103 @@
+"""
+Single-pass ffmpeg writer
+Streams raw BGR frames to one ffmpeg process over stdin (rawvideo), muxes
+the audio track in the same run and writes the final H.264 MP4. Replaces the
+XVID -> mp4v -> libx264 chain, so each video goes through one lossy encode.
+"""
+
+import os
+import subprocess
+
+
+def get_ffmpeg_path():
+    """Return the ffmpeg binary (the one bundled with moviepy/imageio, or ffmpeg from PATH)"""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except (ImportError, RuntimeError):
+        return "ffmpeg"
+
+
+class FFmpegPipeWriter:
+    """
+    Video writer with the cv2.VideoWriter interface (write / isOpened / release)
+    backed by an ffmpeg process that reads rawvideo from stdin
+    """
+
+    def __init__(self, output_path, size, fps,
+                 audio_path=None,
+                 loop_audio=False,
+                 audio_filters=None,
+                 duration=None,
+                 video_codec="libx264",
+                 preset="medium",
+                 crf=20,
+                 metadata=None):
+        """
+        output_path: final video file
+        size: (width, height) of the frames
+        fps: frame rate of the frames written
+        audio_path: audio (or video with audio) muxed in the same run (optional)
+        loop_audio: repeat the audio until the video ends (output stops with the video)
+        audio_filters: list of ffmpeg audio filters (e.g. ["volume=0.8", "afade=t=in:d=1"])
+        duration: cut the output to this many seconds (optional)
+        video_codec: "libx264" for the final video, "ffv1" for a lossless intermediate
+        metadata: container tags (e.g. {"comment": "seed=42"})
+        """
+        self.output_path = output_path
+        self.width, self.height = size
+        self.fps = fps
+        self.frame_size = self.width * self.height * 3
+
+        command = [
+            get_ffmpeg_path(), "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "bgr24",
+            "-s", f"{self.width}x{self.height}", "-r", str(fps),
+            "-i", "-",
+        ]
+
+        if audio_path:
+            if loop_audio:
+                command += ["-stream_loop", "-1"]
+            command += ["-i", audio_path, "-map", "0:v:0", "-map", "1:a:0"]
+            if audio_filters:
+                command += ["-af", ",".join(audio_filters)]
+            command += ["-c:a", "aac"]
+            if loop_audio:
+                command += ["-shortest"]
+
+        if video_codec == "libx264":
+            command += ["-c:v", "libx264", "-preset", preset, "-crf", str(crf),
+                        "-pix_fmt", "yuv420p", "-movflags", "+faststart"]
+        else:
+            command += ["-c:v", video_codec]
+
+        if duration is not None:
+            command += ["-t", f"{duration:.3f}"]
+
+        for key, value in (metadata or {}).items():
+            command += ["-metadata", f"{key}={value}"]
+
+        command += ["-avoid_negative_ts", "make_zero", output_path]
+
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        self.frames_written = 0
+
+    def isOpened(self):
+        return self.process.poll() is None
+
+    def write(self, frame):
+        """Write one BGR frame (height, width, 3) uint8 without copying it"""
+        if frame.nbytes != self.frame_size:
+            raise ValueError(f"Frame {frame.shape} does not match {self.width}x{self.height}")
+        self.process.stdin.write(memoryview(frame if frame.flags.c_contiguous else frame.copy()))
+        self.frames_written += 1
+
+    def release(self):
+        """Close stdin and wait for ffmpeg to finish the file"""
+        if self.process.stdin and not self.process.stdin.closed:
+            self.process.stdin.close()
+        return_code = self.process.wait()
+        if return_code != 0:
+            raise RuntimeError(f"ffmpeg exited with code {return_code} writing {self.output_path}")
+        return os.path.exists(self.output_path)
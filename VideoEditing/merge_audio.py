@@ -1,7 +1,10 @@
-from moviepy.editor import VideoFileClip, AudioFileClip
+import argparse
 import os
+import subprocess
 
-def merge_video_with_audio(video_path, audio_path, output_path):
+from ffmpeg_writer import get_ffmpeg_path
+
+def merge_video_with_audio(video_path, audio_path, output_path, seed=None):
     """
     Mescla um arquivo de vídeo com um arquivo de áudio,
     ajustando a duração do áudio para corresponder ao vídeo.
@@ -10,65 +13,33 @@ def merge_video_with_audio(video_path, audio_path, output_path):
         video_path (str): Caminho para o arquivo de vídeo
         audio_path (str): Caminho para o arquivo de áudio
         output_path (str): Caminho para o arquivo de saída
+        seed (int): Semente da execução do jogo, gravada nos metadados (opcional)
     """
     
     try:
-        # Carrega o vídeo
-        print("Carregando vídeo...")
-        video = VideoFileClip(video_path)
-        video_duration = video.duration
-        print(f"Duração do vídeo: {video_duration:.2f} segundos")
-        
-        # Carrega o áudio
-        print("Carregando áudio...")
-        audio = AudioFileClip(audio_path)
-        audio_duration = audio.duration
-        print(f"Duração do áudio original: {audio_duration:.2f} segundos")
-        
-        # Ajusta o áudio para a duração do vídeo
-        if audio_duration > video_duration:
-            # Se o áudio é mais longo, corta para a duração do vídeo
-            print("Cortando áudio para corresponder à duração do vídeo...")
-            adjusted_audio = audio.subclip(0, video_duration)
-        elif audio_duration < video_duration:
-            # Se o áudio é mais curto, repete até preencher a duração do vídeo
-            print("Repetindo áudio para corresponder à duração do vídeo...")
-            loops_needed = int(video_duration / audio_duration) + 1
-            repeated_audio = audio
-            for _ in range(loops_needed - 1):
-                repeated_audio = repeated_audio.concatenate_audioclip(audio)
-            adjusted_audio = repeated_audio.subclip(0, video_duration)
-        else:
-            # Se as durações são iguais, usa o áudio original
-            print("Durações são iguais, usando áudio original...")
-            adjusted_audio = audio
-        
-        # Remove o áudio original do vídeo (se houver) e adiciona o novo áudio
+        # Uma única execução do ffmpeg: o áudio é repetido (-stream_loop) e
+        # cortado (-shortest) para a duração do vídeo, e o vídeo é codificado
+        # uma única vez, sem decodificar os frames em Python
         print("Mesclando vídeo com áudio...")
-        final_video = video.set_audio(adjusted_audio)
-        
-        # Salva o resultado
+        command = [
+            get_ffmpeg_path(), "-y", "-loglevel", "error",
+            "-i", video_path,
+            "-stream_loop", "-1", "-i", audio_path,
+            "-map", "0:v:0", "-map", "1:a:0",
+            "-c:v", "libx264", "-preset", "medium", "-crf", "20", "-pix_fmt", "yuv420p",
+            "-c:a", "aac",
+            "-shortest", "-movflags", "+faststart",
+        ]
+        if seed is not None:
+            command += ["-metadata", f"comment=seed={seed}"]
+        command.append(output_path)
         print(f"Salvando vídeo final em: {output_path}")
-        final_video.write_videofile(
-            output_path,
-            codec='libx264',
-            audio_codec='aac',
-            temp_audiofile='temp-audio.m4a',
-            remove_temp=True,
-            verbose=False,
-            logger=None
-        )
-        
-        # Libera recursos
-        video.close()
-        audio.close()
-        adjusted_audio.close()
-        final_video.close()
+        subprocess.run(command, check=True)
         
         print("✅ Vídeo final criado com sucesso!")
         print(f"Arquivo salvo: {output_path}")
         try:
-            os.remove("output.avi")
+            os.remove(video_path)
             os.remove("subtitles.srt")
         except FileNotFoundError:
             print(f"File not found.")
@@ -80,9 +51,16 @@ def merge_video_with_audio(video_path, audio_path, output_path):
 
 def main():
     # Caminhos dos arquivos
-    video_path = "output.avi"
-    audio_path = "MusicsColiseum/musica_aleatoria.mp3"
-    output_path = "video_final.mp4"
+    parser = argparse.ArgumentParser(description='Mescla o vídeo gravado com a música')
+    parser.add_argument('--video', default='output.avi', help='Vídeo gravado')
+    parser.add_argument('--audio', default='MusicsColiseum/musica_aleatoria.mp3', help='Arquivo de áudio')
+    parser.add_argument('--output', default='video_final.mp4', help='Vídeo final')
+    parser.add_argument('--seed', type=int, help='Semente da execução do jogo (gravada nos metadados)')
+    args = parser.parse_args()
+
+    video_path = args.video
+    audio_path = args.audio
+    output_path = args.output
     
     # Verifica se os arquivos existem
     if not os.path.exists(video_path):
@@ -94,7 +72,7 @@ def main():
         return
     
     # Executa a mesclagem
-    merge_video_with_audio(video_path, audio_path, output_path)
+    merge_video_with_audio(video_path, audio_path, output_path, args.seed)
 
 if __name__ == "__main__":
     main()
@@ -14,18 +14,16 @@ import re
 import textwrap
 from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont
-from moviepy.editor import VideoFileClip, CompositeAudioClip
 import assemblyai as aai
+from ffmpeg_writer import FFmpegPipeWriter
 
 class UnifiedVideoEditor:
-    def __init__(self):
-        self.temp_files = []
-        # Removido target_fps - usar FPS original do vídeo
-        
+    # Sem target_fps: o FPS original do vídeo é mantido
+    
     def load_api_key(self):
         """Load AssemblyAI API key"""
         try:
-            with open("VideoEditing/api_assembly.json", "r") as file:
+            with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "api_assembly.json"), "r") as file:
                 api_data = json.load(file)
                 return api_data['api_key']
         except FileNotFoundError:
@@ -155,8 +153,8 @@ class UnifiedVideoEditor:
         # Convert back to OpenCV format
         return cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
 
-    def generate_subtitles(self, video_path):
-        """Generate subtitles using AssemblyAI"""
+    def generate_subtitles(self, video_path, srt_path="subtitles.srt"):
+        """Generate subtitles using AssemblyAI (the SRT is saved to srt_path)"""
         print("🎤 Generating subtitles with AssemblyAI...")
         
         try:
@@ -174,7 +172,7 @@ class UnifiedVideoEditor:
             srt_content = transcript.export_subtitles_srt(chars_per_caption=30)
             
             # Save SRT file for reference
-            with open("subtitles.srt", "w", encoding="utf-8") as f:
+            with open(srt_path, "w", encoding="utf-8") as f:
                 f.write(srt_content)
             
             segments = self.parse_srt_content(srt_content)
@@ -186,19 +184,21 @@ class UnifiedVideoEditor:
             return []
 
     def process_complete_video(self, 
-                             base_video="output.avi",
+                             base_video="output.mkv",
                              overlay_video="input.mp4", 
                              audio_source="input.mp4",
                              output_path="final_video_complete.mp4",
                              volume_factor=1.0,
                              fade_in_duration=0,
-                             fade_out_duration=0):
+                             fade_out_duration=0,
+                             seed=None):
         """
         Complete video processing pipeline:
         1. Overlay videos
-        2. Apply processed audio
-        3. Generate and apply subtitles
+        2. Generate and apply subtitles
+        3. Mux processed audio in the same ffmpeg pass
         CORREÇÕES: Manter FPS original e sincronização precisa
+        seed: seed of the game run, stored in the output metadata
         """
         
         print("🎬 Starting Unified Video Processing Pipeline (SYNC FIXED VERSION)")
@@ -212,7 +212,9 @@ class UnifiedVideoEditor:
         
         # Step 1: Generate subtitles from audio source
         print("\n📝 STEP 1: Generating Subtitles")
-        subtitle_segments = self.generate_subtitles(audio_source)
+        # SRT next to the output, so parallel jobs do not overwrite each other
+        srt_path = os.path.join(os.path.dirname(os.path.abspath(output_path)), "subtitles.srt")
+        subtitle_segments = self.generate_subtitles(audio_source, srt_path)
         
         # Step 2: Process video with overlay and subtitles
         print("\n🎥 STEP 2: Processing Video with Overlay and Subtitles")
@@ -221,11 +223,12 @@ class UnifiedVideoEditor:
         cap_base = cv2.VideoCapture(base_video)
         cap_overlay = cv2.VideoCapture(overlay_video)
         
-        if not cap_base.isOpened() or not cap_overlay.isOpened():
-            print("❌ Error opening video files")
-            return False
-        
+        out = None
         try:
+            if not cap_base.isOpened() or not cap_overlay.isOpened():
+                print("❌ Error opening video files")
+                return False
+            
             # Get video properties - CORREÇÃO: Usar FPS original
             base_width = int(cap_base.get(cv2.CAP_PROP_FRAME_WIDTH))
             base_height = int(cap_base.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -243,16 +246,32 @@ class UnifiedVideoEditor:
             overlay_x = (base_width - overlay_width) // 2
             overlay_y = 0
             
-            # Create temporary video with overlay and subtitles
-            temp_video_path = "temp_processed_video.mp4"
-            self.temp_files.append(temp_video_path)
-            
-            # CORREÇÃO: Usar FPS original do vídeo base
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(temp_video_path, fourcc, base_fps, (base_width, base_height))
-            
             frame_count = 0
             max_frames = min(base_frames, overlay_frames)
+            video_duration = max_frames / base_fps
+            
+            # Audio effects applied by ffmpeg while muxing
+            audio_filters = []
+            if volume_factor != 1.0:
+                print(f"🔊 Adjusting volume to {volume_factor * 100}%")
+                audio_filters.append(f"volume={volume_factor}")
+            if fade_in_duration > 0:
+                print(f"📈 Applying fade in: {fade_in_duration}s")
+                audio_filters.append(f"afade=t=in:st=0:d={fade_in_duration}")
+            if fade_out_duration > 0:
+                print(f"📉 Applying fade out: {fade_out_duration}s")
+                fade_out_start = max(0, video_duration - fade_out_duration)
+                audio_filters.append(f"afade=t=out:st={fade_out_start:.3f}:d={fade_out_duration}")
+            
+            # Single lossy pass: frames go straight to ffmpeg, which muxes the
+            # audio of the source and writes the final H.264 MP4
+            # (audio is trimmed to the video; a shorter audio is kept as is)
+            print(f"💾 Exporting final video: {output_path}")
+            out = FFmpegPipeWriter(output_path, (base_width, base_height), base_fps,
+                                   audio_path=audio_source,
+                                   audio_filters=audio_filters,
+                                   duration=video_duration,
+                                   metadata={"comment": f"seed={seed}"} if seed is not None else None)
             
             print(f"⚙️ Processing {max_frames} frames with original timing...")
             
@@ -296,84 +315,12 @@ class UnifiedVideoEditor:
                     progress = (frame_count / max_frames) * 100
                     print(f"⏳ Progress: {progress:.1f}%")
             
-            cap_base.release()
-            cap_overlay.release()
-            out.release()
-            cv2.destroyAllWindows()
+            # Closed here so an ffmpeg failure is reported as a failed run
+            writer, out = out, None
+            writer.release()
             
             print(f"✅ Video processing completed: {frame_count} frames at {base_fps:.2f} FPS")
             
-            # Step 3: Apply processed audio with precise sync
-            print("\n🔊 STEP 3: Applying Processed Audio with Precise Sync")
-            
-            # CORREÇÃO: Carregar vídeos com duração exata
-            temp_video_clip = VideoFileClip(temp_video_path)
-            audio_source_clip = VideoFileClip(audio_source)
-            
-            # Get exact durations
-            video_duration = temp_video_clip.duration
-            audio_duration = audio_source_clip.audio.duration if audio_source_clip.audio else 0
-            
-            print(f"📏 Video duration: {video_duration:.3f}s")
-            print(f"📏 Audio duration: {audio_duration:.3f}s")
-            
-            # Extract and process audio
-            audio_to_apply = audio_source_clip.audio
-            
-            if audio_to_apply is None:
-                print("⚠️ No audio found in source file")
-                return False
-            
-            # CORREÇÃO: Ajustar áudio para duração exata do vídeo
-            if abs(audio_duration - video_duration) > 0.1:  # Diferença > 100ms
-                print(f"⚠️ Duration mismatch detected. Adjusting audio...")
-                if audio_duration > video_duration:
-                    audio_to_apply = audio_to_apply.subclip(0, video_duration)
-                    print(f"🔧 Audio trimmed to {video_duration:.3f}s")
-                else:
-                    # Se áudio for mais curto, não estender (pode causar dessinc)
-                    print(f"⚠️ Audio is shorter than video. Keeping original duration.")
-            
-            # Apply audio effects
-            if volume_factor != 1.0:
-                print(f"🔊 Adjusting volume to {volume_factor * 100}%")
-                # audio_to_apply = audio_to_apply.set_volume(volume_factor)  # MoviePy method
-                audio_to_apply = audio_to_apply.volumex(volume_factor)  # Alternative method
-            
-            if fade_in_duration > 0:
-                print(f"📈 Applying fade in: {fade_in_duration}s")
-                # audio_to_apply = audio_to_apply.fadein(fade_in_duration)  # MoviePy method
-                audio_to_apply = audio_to_apply.audio_fadein(fade_in_duration)  # Alternative method
-            
-            if fade_out_duration > 0:
-                print(f"📉 Applying fade out: {fade_out_duration}s")
-                # audio_to_apply = audio_to_apply.fadeout(fade_out_duration)  # MoviePy method
-                audio_to_apply = audio_to_apply.audio_fadeout(fade_out_duration)  # Alternative method
-            
-            # Apply audio to video
-            final_video = temp_video_clip.set_audio(audio_to_apply)
-            
-            # CORREÇÃO: Export com configurações precisas para sync
-            print(f"💾 Exporting final video: {output_path}")
-            final_video.write_videofile(
-                output_path,
-                codec='libx264',
-                audio_codec='aac',
-                fps=base_fps,  # Usar FPS original
-                temp_audiofile='temp-audio.m4a',
-                remove_temp=True,
-                verbose=False,
-                logger=None,
-                # CORREÇÃO: Configurações adicionais para sync
-                preset='medium',
-                ffmpeg_params=['-avoid_negative_ts', 'make_zero']
-            )
-            
-            # Cleanup
-            temp_video_clip.close()
-            audio_source_clip.close()
-            final_video.close()
-            
             print("\n🎉 PIPELINE COMPLETED SUCCESSFULLY!")
             print(f"📁 Final video saved as: {output_path}")
             print(f"⏱️ Duration: {video_duration:.3f}s")
@@ -383,6 +330,7 @@ class UnifiedVideoEditor:
             print("   ✅ Precise duration matching")
             print("   ✅ Text positioned 160px above center")
             print("   ✅ FFmpeg sync parameters added")
+            print("   ✅ Single encode (frames piped to ffmpeg with the audio)")
             
             return True
             
@@ -391,31 +339,29 @@ class UnifiedVideoEditor:
             return False
         
         finally:
-            # Cleanup temporary files
-            self.cleanup_temp_files()
-
-    def cleanup_temp_files(self):
-        """Clean up temporary files"""
-        for temp_file in self.temp_files:
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-                    print(f"🗑️ Cleaned up: {temp_file}")
-            except Exception as e:
-                print(f"⚠️ Could not remove {temp_file}: {e}")
+            # Released on every path, also when a frame or the encoder fails
+            cap_base.release()
+            cap_overlay.release()
+            if out is not None:
+                try:
+                    out.release()
+                except Exception as e:
+                    print(f"⚠️ Could not finish {output_path}: {e}")
+            cv2.destroyAllWindows()
 
 def main():
     """Main function with command line interface"""
     import argparse
     
     parser = argparse.ArgumentParser(description='Unified Video Editor - Complete Pipeline (SYNC FIXED)')
-    parser.add_argument('--base', default='output.avi', help='Base video file')
+    parser.add_argument('--base', default='output.mkv', help='Base video file')
     parser.add_argument('--overlay', default='input.mp4', help='Overlay video file')
     parser.add_argument('--audio', default='input.mp4', help='Audio source file')
     parser.add_argument('--output', default='final_video_complete.mp4', help='Output file')
     parser.add_argument('--volume', type=float, default=1.0, help='Volume factor (1.0 = 100%)')
     parser.add_argument('--fade-in', type=float, default=0, help='Fade in duration (seconds)')
     parser.add_argument('--fade-out', type=float, default=0, help='Fade out duration (seconds)')
+    parser.add_argument('--seed', type=int, help='Seed of the game run (stored in the output metadata)')
     
     args = parser.parse_args()
     
@@ -428,14 +374,15 @@ def main():
         output_path=args.output,
         volume_factor=args.volume,
         fade_in_duration=args.fade_in,
-        fade_out_duration=args.fade_out
+        fade_out_duration=args.fade_out,
+        seed=args.seed
     )
     
     if success:
         print("\n✅ All processing completed successfully!")
         try:
-            os.remove("output.avi")
-            os.remove("subtitles.srt")
+            os.remove(args.base)
+            os.remove(os.path.join(os.path.dirname(os.path.abspath(args.output)), "subtitles.srt"))
         except FileNotFoundError:
             print(f"File not found.")
     else:
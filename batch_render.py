@@ -0,0 +1,149 @@
+"""
+Renderização em lote: gera N vídeos em paralelo com um pool de processos
+Cada job roda um jogo em modo headless rápido, grava em sua própria pasta de
+trabalho e faz a edição do vídeo; no final mostra os vídeos por hora.
+
+Exemplo:
+    python batch_render.py --count 100 --mix ball_circles=1,two_balls_circles=1,img_coliseum=2 --workers 4
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import execute
+from Recording.render_cache import CacheRenderizacao
+
+
+def ler_mix(texto):
+    """
+    Converte "jogo=peso,jogo=peso" em {script: peso}
+    Os nomes são os arquivos de MarbleGames sem a extensão
+    """
+    mix = {}
+    for item in texto.split(","):
+        nome, _, peso = item.partition("=")
+        script = f"MarbleGames/{nome.strip()}.py"
+        if script not in execute.scripts_disponiveis:
+            raise ValueError(f"Jogo desconhecido no mix: {nome}")
+        mix[script] = float(peso) if peso else 1.0
+    return mix
+
+
+def distribuir_jobs(total, mix):
+    """
+    Distribui os jobs entre os jogos proporcionalmente aos pesos do mix
+    (método do maior resto) e embaralha a ordem de execução
+    """
+    soma = sum(mix.values())
+    cotas = {script: total * peso / soma for script, peso in mix.items()}
+    contagem = {script: int(cota) for script, cota in cotas.items()}
+    restantes = total - sum(contagem.values())
+    for script in sorted(cotas, key=lambda s: cotas[s] - contagem[s], reverse=True)[:restantes]:
+        contagem[script] += 1
+
+    jobs = [script for script, quantidade in contagem.items() for _ in range(quantidade)]
+    random.shuffle(jobs)
+    return jobs
+
+
+def renderizar_job(indice, script, pasta_base, entrada, semente, pasta_cache=None,
+                   fps_video=execute.fps, subpassos=execute.subpassos, replay=False):
+    """
+    Executa um job completo no processo do pool (renderização + edição)
+    Retorna um dicionário com o resultado do job
+    semente: semente do jogo (gravada em <vídeo>.run.json e nos metadados)
+    pasta_cache: pasta do cache de renderizações (None = sem cache)
+    fps_video, subpassos, replay: configuração do gravador (definida aqui porque o job roda em outro processo)
+    """
+    execute.fps = fps_video
+    execute.subpassos = subpassos
+    execute.gravar_replay = replay
+    inicio = time.time()
+    pasta_job = os.path.join(pasta_base, f"job_{indice:05d}")
+    os.makedirs(pasta_job, exist_ok=True)
+    cache = CacheRenderizacao(pasta_cache) if pasta_cache else None
+
+    resultado = {"job": indice, "script": script, "seed": semente, "pasta": pasta_job, "ok": False}
+    with open(os.path.join(pasta_job, "render.log"), "w") as log, contextlib.redirect_stdout(log):
+        try:
+            caminho_video, video_final, chave = execute.gravar_com_cache(script, pasta_job, semente, cache, log)
+
+            if video_final:
+                saida = caminho_video
+            else:
+                saida = execute.pos_processar_com_cache(script, caminho_video, chave, cache, pasta_job, entrada,
+                                                        semente, log)
+
+            resultado["ok"] = os.path.exists(saida)
+            resultado["video"] = saida
+        except Exception as e:
+            resultado["erro"] = str(e)
+
+    resultado["segundos"] = time.time() - inicio
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Renderiza vários vídeos em paralelo')
+    parser.add_argument('--count', type=int, required=True, help='Quantidade de vídeos')
+    parser.add_argument('--mix', default='ball_circles=1,two_balls_circles=1,img_coliseum=1',
+                        help='Pesos dos jogos, ex.: ball_circles=1,img_coliseum=2')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Processos em paralelo')
+    parser.add_argument('--out', default='renders', help='Pasta com uma subpasta por job')
+    parser.add_argument('--input', default='input.mp4',
+                        help='Vídeo sobreposto e fonte do áudio dos jogos de contornos')
+    parser.add_argument('--seed', type=int,
+                        help='Semente do lote: o job N usa a semente seed + N (repete o lote inteiro)')
+    parser.add_argument('--no-cache', action='store_true', help='Não usa o cache de renderizações')
+    parser.add_argument('--fps', type=float, default=execute.fps, help='FPS dos vídeos (ex.: 24, 30 ou 60)')
+    parser.add_argument('--substeps', type=int, default=execute.subpassos,
+                        help='Subpassos de física por frame do jogo')
+    parser.add_argument('--replay', action='store_true',
+                        help='Grava também o replay de cada partida (<vídeo>.replay.npy)')
+    args = parser.parse_args()
+
+    semente_lote = args.seed if args.seed is not None else execute.nova_semente()
+    random.seed(semente_lote)
+    jobs = distribuir_jobs(args.count, ler_mix(args.mix))
+    pasta_base = os.path.abspath(args.out)
+    entrada = os.path.abspath(args.input)
+    os.makedirs(pasta_base, exist_ok=True)
+    pasta_cache = None if args.no_cache else CacheRenderizacao().pasta
+
+    print(f"Renderizando {len(jobs)} vídeos com {args.workers} processos (semente {semente_lote})...")
+    inicio = time.time()
+    concluidos = 0
+    falhas = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futuros = [pool.submit(renderizar_job, indice, script, pasta_base, entrada, semente_lote + indice,
+                               pasta_cache, args.fps, max(1, args.substeps), args.replay)
+                   for indice, script in enumerate(jobs, 1)]
+        for futuro in as_completed(futuros):
+            resultado = futuro.result()
+            if resultado["ok"]:
+                concluidos += 1
+                print(f"✅ Job {resultado['job']} ({resultado['script']}, semente {resultado['seed']}) "
+                      f"em {resultado['segundos']:.1f}s: "
+                      f"{resultado['video']}")
+            else:
+                falhas += 1
+                print(f"❌ Job {resultado['job']} ({resultado['script']}) falhou: "
+                      f"{resultado.get('erro', 'ver render.log')}")
+
+    decorrido = time.time() - inicio
+    print(f"\nVídeos gerados: {concluidos}/{len(jobs)} ({falhas} falhas) em {decorrido:.1f}s")
+    print(f"Vazão: {concluidos / decorrido * 3600:.1f} vídeos/hora")
+
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
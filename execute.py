@@ -1,89 +1,45 @@
+import argparse
+import json
 import os
 import random
 import subprocess
 import sys
 import threading
 import time
-import pyautogui
-import cv2
-import numpy as np
 import psutil
-import win32gui
-import win32con
-import win32api
+
+from MarbleGames.shm_ring import AnelFrames
+from Recording.async_encoder import EncoderAssincrono
+from Recording.capture_backends import criar_backend
+from Recording.frame_timing import MedidorFrames
+from Recording.render_cache import CacheRenderizacao, hash_arquivo, hash_entradas
+from VideoEditing.ffmpeg_writer import FFmpegPipeWriter
 
 # Lista de scripts disponíveis para execução aleatória
 scripts_disponiveis = ["MarbleGames/two_balls_circles.py","MarbleGames/ball_circles.py", "MarbleGames/img_coliseum.py"]
 
-if not scripts_disponiveis:
-    print("Nenhum script disponível na lista.")
-    sys.exit(1)
-
-# Escolhe um script aleatoriamente
-script_escolhido = random.choice(scripts_disponiveis)
-caminho_completo_script = os.path.join(os.path.dirname(__file__), script_escolhido)
-
-print(f"Executando aleatoriamente o script: {script_escolhido}")
-
 # Configurações de gravação
 resolution = (480,854)
-filename = "output.avi"
+filename = "output.mkv"  # Vídeo intermediário sem perdas (FFV1) para a edição
 fps = 24.0  # FPS mais baixo para duração correta
+subpassos = 1  # Subpassos de física por frame do jogo (precisão da simulação, independente do FPS do vídeo)
+gravar_replay = False  # Grava também <vídeo>.replay.npy (estado de cada frame, redesenhável pelo MarbleGames/replay.py)
 
-# Configuração do codec
-fourcc = cv2.VideoWriter_fourcc(*'XVID')  # type: ignore
-out = cv2.VideoWriter(filename, fourcc, fps, resolution)
-
-if not out.isOpened():
-    print("Erro: Não foi possível configurar o codec de vídeo")
-    sys.exit(1)
+# O img_coliseum não passa pela edição: o gravador já gera o MP4 final com a música
+musica_coliseum = "MusicsColiseum/musica_aleatoria.mp3"
+video_final_coliseum = "video_final.mp4"
 
-print("Codec XVID configurado com sucesso")
+# Entradas que definem o conteúdo de uma renderização (chave do cache), além da semente:
+# os módulos dos jogos, o writer e os assets usados por cada jogo
+PASTA_PROJETO = os.path.dirname(os.path.abspath(__file__))
+ARQUIVOS_RENDERIZACAO = ["MarbleGames", "VideoEditing/ffmpeg_writer.py"]
+ASSETS_JOGOS = {
+    "MarbleGames/img_coliseum.py": ["ImagesColiseum", "BackgroundColiseum", "MusicsColiseum"],
+}
 
 # Variáveis de controle
 script_process = None
-pygame_window_handle = None
-
-def find_pygame_window():
-    """Encontra a janela do pygame"""
-    def enum_windows_callback(hwnd, windows):
-        if win32gui.IsWindowVisible(hwnd):
-            window_title = win32gui.GetWindowText(hwnd)
-            # Lista de títulos possíveis dos scripts pygame
-            titulos_pygame = [
-                "Efeito Interativo de Bolas - Sistema de Cores",
-                "Efeito Interativo de Bolas - Contornos Móveis e Coloridos", 
-                "Jogo de Bolas com Contorno Fixo"
-            ]
-            if any(titulo in window_title for titulo in titulos_pygame):
-                windows.append(hwnd)
-        return True
-    
-    windows = []
-    win32gui.EnumWindows(enum_windows_callback, windows)
-    return windows[0] if windows else None
-
-def get_window_screenshot(hwnd):
-    """Captura somente o conteúdo da janela (área do cliente)"""
-    try:
-        # Tamanho da área do cliente
-        left, top, right, bottom = win32gui.GetClientRect(hwnd)
-        width = right - left
-        height = bottom - top
-
-        # Posição do canto superior esquerdo da área do cliente na tela
-        point = win32gui.ClientToScreen(hwnd, (left, top))
-        x, y = point
-
-        screenshot = pyautogui.screenshot(region=(x, y, width, height))
-        frame = np.array(screenshot)
-        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-        # Redimensiona para a resolução desejada
-        frame = cv2.resize(frame, resolution)
-        return frame
-    except Exception as e:
-        print(f"Erro ao capturar janela: {e}")
-        return None
+backend_captura = None
 
 def check_finalizar_gravacao():
     """Verifica se deve finalizar a gravação"""
@@ -91,101 +47,393 @@ def check_finalizar_gravacao():
         # Verifica se o processo do script ainda está rodando
         if script_process and script_process.poll() is not None:
             return True
-        
+
         # Verifica se a janela do pygame ainda existe
-        if pygame_window_handle:
-            try:
-                if not win32gui.IsWindow(pygame_window_handle):
-                    return True
-            except:
-                return True
-        
+        if backend_captura and backend_captura.janela and not backend_captura.janela_existe():
+            return True
+
         return False
     except:
         return False
 
-# Inicia o script
-script_process = subprocess.Popen([sys.executable, caminho_completo_script])
-
-print("Iniciando gravação...")
-
-# Aguarda um pouco para o script inicializar
-time.sleep(2)
-
-# Aguarda a janela do pygame aparecer
-print("Aguardando janela do pygame...")
-for _ in range(50):  # Tenta por 5 segundos
-    pygame_window_handle = find_pygame_window()
-    if pygame_window_handle:
-        print("Janela do pygame encontrada!")
-        break
-    time.sleep(0.1)
-
-if not pygame_window_handle:
-    print("Aviso: Janela do pygame não encontrada, usando captura de tela completa")
-
-# Loop principal de gravação
-frame_count = 0
-last_time = time.time()
-try:
-    while True:
-        # Captura o frame
-        if pygame_window_handle:
-            frame = get_window_screenshot(pygame_window_handle)
-        else:
-            # Fallback para captura de tela completa
-            img = pyautogui.screenshot()
-            frame = np.array(img)
-            frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-            frame = cv2.resize(frame, resolution)
-        
-        if frame is not None:
-            # Escreve o frame no vídeo
-            success = out.write(frame)
-            if not success:
-                print("Aviso: Falha ao escrever frame")
-            
+def nova_semente():
+    """Sorteia a semente de uma execução (independente do estado do random)"""
+    return random.SystemRandom().randrange(2 ** 32)
+
+def salvar_info_execucao(caminho_video, script_escolhido, semente, rapido=False):
+    """
+    Grava <vídeo>.run.json com o que define a execução (jogo e semente)
+    Com o mesmo jogo e a mesma semente o jogo repete as mesmas cores, constantes e placares
+    """
+    caminho = os.path.splitext(caminho_video)[0] + ".run.json"
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump({"script": script_escolhido, "seed": semente, "fps": fps, "subpassos": subpassos,
+                   "rapido": rapido},
+                  arquivo, indent=2)
+    return caminho
+
+def caminho_replay(caminho_video):
+    """Replay gravado ao lado do vídeo: <vídeo>.replay.npy (+ <vídeo>.replay.json)"""
+    return os.path.splitext(caminho_video)[0] + ".replay.npy"
+
+def gera_video_final(script_escolhido):
+    """True se o gravador já gera o vídeo final do jogo (sem a etapa de edição)"""
+    return script_escolhido == "MarbleGames/img_coliseum.py" and os.path.exists(musica_coliseum)
+
+def criar_writer(script_escolhido, pasta_saida=".", semente=None):
+    """
+    Cria o writer ffmpeg (rawvideo via stdin) do vídeo gravado
+    Retorna (writer, caminho do vídeo, True se o vídeo já é o final)
+    - img_coliseum: H.264 final com a música em uma única passada
+    - demais jogos: intermediário FFV1 sem perdas; a única codificação com perdas
+      acontece no final da edição (unified_treatment.py)
+    pasta_saida: pasta onde o vídeo é gravado (uma por job no modo batch)
+    semente: semente do jogo, gravada nos metadados do vídeo
+    """
+    metadados = {"comment": f"seed={semente}"} if semente is not None else None
+    if gera_video_final(script_escolhido):
+        caminho_video = os.path.join(pasta_saida, video_final_coliseum)
+        out = FFmpegPipeWriter(caminho_video, resolution, fps,
+                               audio_path=musica_coliseum, loop_audio=True, metadata=metadados)
+        return out, caminho_video, True
+
+    caminho_video = os.path.join(pasta_saida, filename)
+    out = FFmpegPipeWriter(caminho_video, resolution, fps, video_codec="ffv1", metadata=metadados)
+    return out, caminho_video, False
+
+def gravar_headless(caminho_completo_script, out, caminho_video, rapido=False, log=None, semente=None):
+    """
+    Roda o jogo sem janela: o jogo escreve cada frame da TELA em um anel de
+    memória compartilhada e o gravador codifica os slots direto das views NumPy
+    Não há captura de tela nem cv2.resize, então funciona em servidores Linux
+    out: writer do vídeo (ver criar_writer)
+    rapido: passo fixo de 1/60 s sem dormir (termina o mais rápido que a CPU permitir)
+    log: arquivo aberto que recebe a saída do jogo (None = console)
+    semente: semente do jogo (None = o jogo sorteia a sua)
+    Retorna True se o jogo terminou normalmente
+    """
+    anel = AnelFrames.criar(altura=resolution[1], largura=resolution[0])
+
+    env = dict(os.environ)
+    env["TOKAI_HEADLESS"] = "1"
+    if rapido:
+        env["TOKAI_RAPIDO"] = "1"
+    env["TOKAI_SHM"] = anel.nome
+    env["TOKAI_FPS_VIDEO"] = str(fps)
+    env["TOKAI_SUBPASSOS"] = str(subpassos)
+    if gravar_replay:
+        env["TOKAI_REPLAY"] = caminho_replay(caminho_video)
+    if semente is not None:
+        env["TOKAI_SEED"] = str(semente)
+
+    print("Iniciando renderização headless...")
+    processo = subprocess.Popen([sys.executable, caminho_completo_script], env=env,
+                                stdout=log, stderr=subprocess.STDOUT if log else None)
+
+    # O slot só volta para o jogo depois que o encoder terminar de usá-lo
+    medidor = MedidorFrames(fps)
+    encoder = EncoderAssincrono(out, medidor=medidor)
+    frame_count = 0
+    try:
+        while True:
+            inicio = time.perf_counter()
+            item = anel.proximo(timeout=0.5)
+            if item is None:
+                # Fim normal (anel finalizado) ou jogo encerrado sem finalizar o anel
+                if anel.finalizado() or processo.poll() is not None:
+                    break
+                continue
+
+            sequencia, frame = item
+            # Sem conversão nem redimensionamento: a captura é a espera pelo jogo
+            medidor.registrar("captura", time.perf_counter() - inicio)
+            # O número de sequência é o slot do vídeo (o jogo já decima para o FPS do vídeo)
+            medidor.marcar_frame(sequencia)
+            encoder.enviar(frame, ao_concluir=anel.liberar)  # O slot é lido sem cópia
+
             frame_count += 1
-            if frame_count % int(fps) == 0:  # Print a cada segundo
-                print(f"Frames gravados: {frame_count}")
-        
-        # Verifica se deve finalizar
-        if check_finalizar_gravacao():
-            print("Sinal de finalização recebido")
-            break
-        
-        # Espera para manter o FPS estável
-        elapsed = time.time() - last_time
-        sleep_time = max(0, (1/fps) - elapsed)
-        time.sleep(sleep_time)
-        last_time = time.time()
-
-except KeyboardInterrupt:
-    print("Gravação interrompida pelo usuário")
-except Exception as e:
-    print(f"Erro durante a gravação: {e}")
-finally:
-    # Finaliza o processo do script se ainda estiver rodando
-    if script_process and script_process.poll() is None:
-        print("Finalizando processo do script...")
-        script_process.terminate()
+            if frame_count % int(fps) == 0:  # Print a cada segundo de vídeo
+                print(f"Frames gravados: {frame_count} (fila do encoder: {encoder.profundidade()})")
+
+    except KeyboardInterrupt:
+        print("Gravação interrompida pelo usuário")
+    finally:
+        # Normalmente o jogo já está saindo; se a gravação foi interrompida, o jogo
+        # bloqueado no anel cheio recebe o aviso e sai sozinho
+        anel.encerrar()
         try:
-            script_process.wait(timeout=5)
+            processo.wait(timeout=10)
         except subprocess.TimeoutExpired:
-            script_process.kill()
-    
-    # Limpeza final
-    if out and out.isOpened():
-        out.release()
-    
-    print(f"Gravação finalizada. Arquivo salvo como: {filename}")
-    print(f"Total de frames gravados: {frame_count}")
-
-if script_escolhido == "MarbleGames/two_balls_circles.py":
-    subprocess.Popen([sys.executable, os.path.join(os.path.dirname(__file__), "VideoEditing/unified_treatment.py")])
-
-elif script_escolhido == "MarbleGames/ball_circles.py":
-    subprocess.Popen([sys.executable, os.path.join(os.path.dirname(__file__), "VideoEditing/unified_treatment.py")])
-
-elif script_escolhido == "MarbleGames/img_coliseum.py":
-    subprocess.Popen([sys.executable, os.path.join(os.path.dirname(__file__), "VideoEditing/merge_audio.py")])
\ No newline at end of file
+            print("Finalizando processo do script...")
+            processo.kill()
+            processo.wait()
+        if processo.returncode != 0:
+            print(f"Aviso: o jogo terminou com código {processo.returncode}")
+
+        # finalizar() repassa o erro do encoder; o vídeo e o anel são fechados mesmo assim
+        try:
+            encoder.finalizar()
+            encoder.imprimir_estatisticas()
+        finally:
+            out.release()
+            anel.fechar()
+            medidor.salvar(caminho_video)
+
+        print(f"Renderização finalizada. Arquivo salvo como: {caminho_video}")
+        print(f"Total de frames gravados: {frame_count}")
+
+    return processo.returncode == 0
+
+def gravar_captura_tela(caminho_completo_script, out, caminho_video, backend="auto", semente=None):
+    """
+    Roda o jogo em uma janela e grava capturando a tela a 24 fps
+    out: writer do vídeo (ver criar_writer)
+    backend: backend de captura ("auto", "windows" ou "x11")
+    semente: semente do jogo (None = o jogo sorteia a sua)
+    """
+    global script_process, backend_captura
+
+    try:
+        backend_captura = criar_backend(backend, resolution)
+    except Exception as e:
+        print(f"Erro: captura de tela indisponível neste sistema ({e}); use --headless")
+        sys.exit(1)
+
+    # Inicia o script
+    env = dict(os.environ)
+    env["TOKAI_SUBPASSOS"] = str(subpassos)
+    if gravar_replay:
+        env["TOKAI_REPLAY"] = caminho_replay(caminho_video)
+    if semente is not None:
+        env["TOKAI_SEED"] = str(semente)
+    script_process = subprocess.Popen([sys.executable, caminho_completo_script], env=env)
+
+    print("Iniciando gravação...")
+
+    # Aguarda um pouco para o script inicializar
+    time.sleep(2)
+
+    # Aguarda a janela do pygame aparecer
+    print("Aguardando janela do pygame...")
+    for _ in range(50):  # Tenta por 5 segundos
+        if backend_captura.localizar_janela(script_process.pid):
+            print("Janela do pygame encontrada!")
+            break
+        time.sleep(0.1)
+
+    if not backend_captura.janela:
+        print("Aviso: Janela do pygame não encontrada, usando captura de tela completa")
+
+    # Loop principal de gravação (captura); a codificação roda na thread do encoder
+    medidor = MedidorFrames(fps)
+    backend_captura.medidor = medidor
+    encoder = EncoderAssincrono(out, medidor=medidor)
+    frame_count = 0
+    last_time = time.time()
+    try:
+        while True:
+            # Captura o frame (tela completa se a janela não foi encontrada)
+            frame = backend_captura.capturar()
+
+            if frame is not None:
+                # O slot do vídeo é calculado pelo relógio: saltos são frames perdidos
+                medidor.marcar_frame()
+                # Envia o frame para a fila do encoder
+                encoder.enviar(frame)
+
+                frame_count += 1
+                if frame_count % int(fps) == 0:  # Print a cada segundo
+                    print(f"Frames gravados: {frame_count} (fila do encoder: {encoder.profundidade()})")
+
+            # Verifica se deve finalizar
+            if check_finalizar_gravacao():
+                print("Sinal de finalização recebido")
+                break
+
+            # Espera para manter o FPS estável
+            elapsed = time.time() - last_time
+            sleep_time = max(0, (1/fps) - elapsed)
+            time.sleep(sleep_time)
+            last_time = time.time()
+
+    except KeyboardInterrupt:
+        print("Gravação interrompida pelo usuário")
+    except Exception as e:
+        print(f"Erro durante a gravação: {e}")
+    finally:
+        # Finaliza o processo do script se ainda estiver rodando
+        if script_process and script_process.poll() is None:
+            print("Finalizando processo do script...")
+            script_process.terminate()
+            try:
+                script_process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                script_process.kill()
+
+        # Aguarda os frames pendentes na fila do encoder (repassa o erro do encoder)
+        try:
+            encoder.finalizar()
+            encoder.imprimir_estatisticas()
+        finally:
+            # Limpeza final
+            if out and out.isOpened():
+                out.release()
+            backend_captura.fechar()
+            medidor.salvar(caminho_video)
+
+        print(f"Gravação finalizada. Arquivo salvo como: {caminho_video}")
+        print(f"Total de frames gravados: {frame_count}")
+
+def comando_pos_processamento(script_escolhido, caminho_video, pasta_saida=".", entrada="input.mp4",
+                              semente=None):
+    """
+    Monta o comando da edição do vídeo gravado de acordo com o jogo
+    Retorna (comando, caminho do vídeo final)
+    entrada: vídeo sobreposto e fonte do áudio dos jogos de contornos
+    semente: semente do jogo, repassada para os metadados do vídeo final
+    """
+    extra = ["--seed", str(semente)] if semente is not None else []
+    if script_escolhido in ("MarbleGames/two_balls_circles.py", "MarbleGames/ball_circles.py"):
+        saida = os.path.join(pasta_saida, "final_video_complete.mp4")
+        return [sys.executable, os.path.join(os.path.dirname(__file__), "VideoEditing/unified_treatment.py"),
+                "--base", caminho_video, "--overlay", entrada, "--audio", entrada, "--output", saida] + extra, saida
+
+    saida = os.path.join(pasta_saida, video_final_coliseum)
+    return [sys.executable, os.path.join(os.path.dirname(__file__), "VideoEditing/merge_audio.py"),
+            "--video", caminho_video, "--audio", musica_coliseum, "--output", saida] + extra, saida
+
+def chave_renderizacao(script_escolhido, semente):
+    """Chave do cache da gravação: hash do script, semente, constantes do gravador e assets"""
+    return hash_entradas(PASTA_PROJETO, etapa="gravacao", script=script_escolhido, semente=semente,
+                         resolucao=resolution, fps=fps, subpassos=subpassos, replay=gravar_replay, video=filename,
+                         arquivos=ARQUIVOS_RENDERIZACAO + ASSETS_JOGOS.get(script_escolhido, []))
+
+def gravar_com_cache(script_escolhido, pasta_saida, semente, cache, log=None):
+    """
+    Gravação headless rápida (reproduzível pela semente) passando pelo cache
+    Retorna (caminho do vídeo, True se o vídeo já é o final, chave do cache)
+    """
+    os.makedirs(pasta_saida, exist_ok=True)
+    chave = chave_renderizacao(script_escolhido, semente)
+    artefatos = cache.buscar(chave, pasta_saida) if cache else None
+    if artefatos:
+        print(f"Gravação encontrada no cache ({chave[:12]}): {artefatos['video']}")
+        return artefatos["video"], gera_video_final(script_escolhido), chave
+
+    caminho_completo_script = os.path.join(PASTA_PROJETO, script_escolhido)
+    out, caminho_video, video_final = criar_writer(script_escolhido, pasta_saida, semente)
+    caminho_info = salvar_info_execucao(caminho_video, script_escolhido, semente, rapido=True)
+    concluido = gravar_headless(caminho_completo_script, out, caminho_video, rapido=True, log=log, semente=semente)
+
+    # Só guarda gravações completas
+    if cache and concluido:
+        artefatos = {
+            "video": caminho_video,
+            "execucao": caminho_info,
+            "tempos": os.path.splitext(caminho_video)[0] + ".timing.json",
+        }
+        if gravar_replay:
+            artefatos["replay"] = caminho_replay(caminho_video)
+            artefatos["replay_metadados"] = os.path.splitext(artefatos["replay"])[0] + ".json"
+        cache.guardar(chave, artefatos, info={"script": script_escolhido, "seed": semente})
+    return caminho_video, video_final, chave
+
+def pos_processar_com_cache(script_escolhido, caminho_video, chave_gravacao, cache, pasta_saida=".",
+                            entrada="input.mp4", semente=None, log=None):
+    """
+    Executa a edição do vídeo gravado (aguardando o fim) passando pelo cache
+    A chave combina a chave da gravação (que já identifica o vídeo gravado) com os
+    scripts de edição e o conteúdo do vídeo de entrada, sem o seu caminho: a mesma
+    entrada em outra pasta reaproveita a edição
+    Retorna o caminho do vídeo final
+    """
+    comando, saida = comando_pos_processamento(script_escolhido, caminho_video, pasta_saida, entrada, semente)
+    conteudo_entrada = hash_arquivo(entrada) if os.path.exists(entrada) else None
+    chave = hash_entradas(PASTA_PROJETO, etapa="edicao", gravacao=chave_gravacao, saida=os.path.basename(saida),
+                          entrada=conteudo_entrada, arquivos=["VideoEditing", musica_coliseum])
+
+    artefatos = cache.buscar(chave, pasta_saida) if cache else None
+    if artefatos:
+        print(f"Edição encontrada no cache ({chave[:12]}): {artefatos['video']}")
+        # Como na edição, o vídeo gravado intermediário não é mantido
+        if os.path.exists(caminho_video) and os.path.abspath(caminho_video) != os.path.abspath(saida):
+            os.remove(caminho_video)
+        return artefatos["video"]
+
+    if log:
+        log.flush()
+    subprocess.run(comando, stdout=log, stderr=subprocess.STDOUT if log else None, check=True)
+    if cache:
+        cache.guardar(chave, {"video": saida}, info={"script": script_escolhido, "seed": semente})
+    return saida
+
+def iniciar_pos_processamento(script_escolhido, caminho_video, semente=None):
+    """Inicia a edição do vídeo gravado de acordo com o jogo"""
+    comando, _ = comando_pos_processamento(script_escolhido, caminho_video, semente=semente)
+    subprocess.Popen(comando)
+
+def main():
+    global fps, subpassos, gravar_replay
+    parser = argparse.ArgumentParser(description='Grava um jogo aleatório e inicia a edição do vídeo')
+    parser.add_argument('--headless', action='store_true',
+                        help='Renderiza sem janela, enviando os frames do jogo direto para o vídeo')
+    parser.add_argument('--fast', action='store_true',
+                        help='Renderização headless com passo fixo, mais rápida que o tempo real')
+    parser.add_argument('--backend', choices=['auto', 'windows', 'x11'], default='auto',
+                        help='Backend da captura de tela (auto = pelo sistema operacional)')
+    parser.add_argument('--seed', type=int,
+                        help='Semente da execução (escolha do jogo e conteúdo); reproduz bit a bit com --fast')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Não usa o cache de renderizações do modo --fast')
+    parser.add_argument('--fps', type=float, default=fps,
+                        help='FPS do vídeo (ex.: 24, 30 ou 60); o jogo continua simulando a 60 fps')
+    parser.add_argument('--substeps', type=int, default=subpassos,
+                        help='Subpassos de física por frame do jogo (evita que bolas rápidas atravessem contornos)')
+    parser.add_argument('--replay', action='store_true',
+                        help='Grava também o replay da partida (<vídeo>.replay.npy), redesenhável sem física')
+    args = parser.parse_args()
+
+    fps = args.fps
+    subpassos = max(1, args.substeps)
+    gravar_replay = args.replay
+
+    if not scripts_disponiveis:
+        print("Nenhum script disponível na lista.")
+        sys.exit(1)
+
+    # A mesma semente escolhe o mesmo script e é repassada para o jogo
+    semente = args.seed if args.seed is not None else nova_semente()
+    random.seed(semente)
+
+    # Escolhe um script aleatoriamente
+    script_escolhido = random.choice(scripts_disponiveis)
+    caminho_completo_script = os.path.join(os.path.dirname(__file__), script_escolhido)
+
+    print(f"Executando aleatoriamente o script: {script_escolhido} (semente {semente})")
+
+    if args.fast:
+        # Execução reproduzível: gravação e edição são reaproveitadas do cache quando a chave coincide
+        cache = None if args.no_cache else CacheRenderizacao()
+        caminho_video, video_final, chave = gravar_com_cache(script_escolhido, ".", semente, cache)
+        if video_final:
+            print(f"Vídeo final gerado em uma única passada: {caminho_video}")
+        else:
+            saida = pos_processar_com_cache(script_escolhido, caminho_video, chave, cache, semente=semente)
+            print(f"Vídeo final: {saida}")
+        return
+
+    out, caminho_video, video_final = criar_writer(script_escolhido, semente=semente)
+    salvar_info_execucao(caminho_video, script_escolhido, semente)
+
+    if args.headless:
+        gravar_headless(caminho_completo_script, out, caminho_video, semente=semente)
+    else:
+        gravar_captura_tela(caminho_completo_script, out, caminho_video, args.backend, semente=semente)
+
+    if video_final:
+        print(f"Vídeo final gerado em uma única passada: {caminho_video}")
+    else:
+        iniciar_pos_processamento(script_escolhido, caminho_video, semente)
+
+if __name__ == "__main__":
+    main()
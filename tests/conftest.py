@@ -0,0 +1,15 @@
+"""
+Configuração dos testes: os módulos do MarbleGames se importam como scripts
+(import render_mode, import physics...), então a pasta entra no sys.path, e o
+pygame usa os drivers dummy (sem janela nem áudio)
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+PASTA_JOGOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "MarbleGames")
+if PASTA_JOGOS not in sys.path:
+    sys.path.insert(0, PASTA_JOGOS)
@@ -0,0 +1,89 @@
+"""Testes da preparação e do cache de imagens do img_coliseum"""
+
+import numpy as np
+import pygame
+
+import assets
+
+
+def _retangulo(largura, altura):
+    imagem = pygame.Surface((largura, altura), pygame.SRCALPHA, 32)
+    imagem.fill((200, 30, 30, 255))
+    return imagem
+
+
+def test_atlas_nao_quadrado_mantem_forma():
+    """Uma imagem retangular gira sem trocar de forma: todos os quadros cobrem o círculo todo"""
+    raio, quadros = 12, 8
+    atlas = assets.preparar_atlas(_retangulo(90, 30), (raio, quadros))
+    lado = raio * 2
+    alpha = pygame.surfarray.array_alpha(atlas)
+    centros = np.arange(lado) + 0.5 - raio
+    distancia = np.sqrt(centros[:, None] ** 2 + centros[None, :] ** 2)
+    for quadro in range(quadros):
+        alpha_quadro = alpha[:, quadro * lado:(quadro + 1) * lado]
+        assert (alpha_quadro[distancia < raio - 1.5] == 255).all()
+        assert (alpha_quadro[distancia > raio] == 0).all()
+
+
+def _usar_pasta_assets(monkeypatch, pasta):
+    monkeypatch.setattr(assets, "PASTA_ASSETS", str(pasta))
+    monkeypatch.setattr(assets, "_manifesto", None)
+
+
+def _gravar_imagem(caminho, cor):
+    imagem = _retangulo(40, 40)
+    imagem.fill(cor)
+    pygame.image.save(imagem, str(caminho))
+
+
+def test_mesmo_nome_em_pastas_diferentes(tmp_path, monkeypatch):
+    _usar_pasta_assets(monkeypatch, tmp_path / ".assets")
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    _gravar_imagem(tmp_path / "a" / "time.png", (255, 0, 0, 255))
+    _gravar_imagem(tmp_path / "b" / "time.png", (0, 0, 255, 255))
+
+    vermelha = assets.carregar_imagem(str(tmp_path / "a" / "time.png"), "bola", 10)
+    azul = assets.carregar_imagem(str(tmp_path / "b" / "time.png"), "bola", 10)
+    assert len(list((tmp_path / ".assets").glob("bola_time.png_*"))) == 2
+
+    # Lidas de .assets/ (manifesto recarregado do disco)
+    monkeypatch.setattr(assets, "_manifesto", None)
+    assert assets.carregar_imagem(str(tmp_path / "a" / "time.png"), "bola", 10).get_at((10, 10)) == vermelha.get_at((10, 10))
+    assert assets.carregar_imagem(str(tmp_path / "b" / "time.png"), "bola", 10).get_at((10, 10)) == azul.get_at((10, 10))
+    assert vermelha.get_at((10, 10)) != azul.get_at((10, 10))
+
+
+def test_chave_muda_com_parametros_da_preparacao(monkeypatch):
+    chave = assets.chave_imagem("atlas", "imagens/time.png", (25, 64))
+    monkeypatch.setattr(assets, "SUPERAMOSTRAGEM", assets.SUPERAMOSTRAGEM + 1)
+    assert assets.chave_imagem("atlas", "imagens/time.png", (25, 64)) != chave
+    chave_bola = assets.chave_imagem("bola", "imagens/time.png", 25)
+    monkeypatch.setattr(assets, "VERSAO_PREPARACAO", assets.VERSAO_PREPARACAO + 1)
+    assert assets.chave_imagem("bola", "imagens/time.png", 25) != chave_bola
+
+
+def test_listar_imagens(tmp_path, monkeypatch):
+    _usar_pasta_assets(monkeypatch, tmp_path / ".assets")
+    pasta = tmp_path / "times"
+    pasta.mkdir()
+    for nome in ("b.jpg", "a.png", ".oculta.png", "notas.txt"):
+        (pasta / nome).write_bytes(b"")
+    assert assets.listar_imagens(str(pasta)) == [str(pasta / "a.png"), str(pasta / "b.jpg")]
+    assert assets.listar_imagens(str(tmp_path / "inexistente")) == []
+
+
+def test_listar_imagens_manifesto(tmp_path, monkeypatch):
+    """A lista do manifesto vale enquanto a pasta não mudar; depois a pasta é listada de novo"""
+    _usar_pasta_assets(monkeypatch, tmp_path / ".assets")
+    pasta = tmp_path / "times"
+    pasta.mkdir()
+    (pasta / "a.png").write_bytes(b"")
+    assets._manifesto = {"versao": assets.VERSAO_MANIFESTO, "imagens": {}, "times": {
+        assets.caminho_relativo(str(pasta)): {"assinatura": assets.assinatura(str(pasta)), "imagens": ["z.png"]},
+    }}
+    assert assets.listar_imagens(str(pasta)) == [str(pasta / "z.png")]
+
+    (pasta / "b.png").write_bytes(b"")  # Muda o mtime da pasta
+    assert assets.listar_imagens(str(pasta)) == [str(pasta / "a.png"), str(pasta / "b.png")]
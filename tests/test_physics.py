@@ -0,0 +1,92 @@
+"""Testes da detecção contínua de colisões com os contornos"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import physics
+
+
+def _impacto(x1, raio, raio_inicio=None):
+    """Bola de raio 10 saindo do centro de um contorno de espessura 10 até (x1, 0)"""
+    araio0 = None if raio_inicio is None else np.array([raio_inicio])
+    return physics.tempos_impacto_aneis(np.array([0.0]), np.array([0.0]), np.array([x1]), np.array([0.0]),
+                                        np.array([10.0]), np.array([0.0]), np.array([0.0]),
+                                        np.array([raio]), 10, araio0)
+
+
+def test_tempo_impacto_raio_constante():
+    t, anel = _impacto(200.0, 100.0)
+    assert anel[0] == 0
+    assert t[0] == pytest.approx(90 / 200)  # Meio da faixa: 100 - (10 + 10) / 2
+
+
+def test_tempo_impacto_raio_interpolado():
+    # O contorno diminui de 110 para 100 durante o passo: |200 t| = 100 - 10 t
+    t, anel = _impacto(200.0, 100.0, raio_inicio=110.0)
+    assert anel[0] == 0
+    assert t[0] == pytest.approx(100 / 210)
+
+
+def test_sem_travessia():
+    t, anel = _impacto(50.0, 100.0)
+    assert anel[0] == -1
+    assert np.isinf(t[0])
+
+
+def test_corrigir_e_avancar_restante():
+    sistema = physics.SistemaBolas(1, 2000, 2000, gravidade=0.0, forca_quique=1.0, aceleracao_quique=1.0,
+                                   velocidade_maxima=1000.0)
+    sistema.adicionar(1000.0, 1000.0, 10.0, vx=200.0)
+    contorno = SimpleNamespace(x=1000.0, y=1000.0, raio=100.0, raio_inicio=100.0)
+    sistema.marcar_inicio_passo()
+    sistema.integrar()
+
+    bolas, t = physics.corrigir_tunelamento(sistema, [contorno], 10)
+    assert list(bolas) == [0]
+    assert sistema.x[0] == pytest.approx(1090.0)
+
+    # Quique no contorno (reflexão) e o restante do passo com a nova velocidade
+    sistema.vx[0] = -200.0
+    physics.avancar_restante(sistema, bolas, t)
+    assert sistema.x[0] == pytest.approx(1090.0 - 200.0 * (1 - t[0]))
+
+
+def test_bolas_lentas_nao_corrigidas():
+    sistema = physics.SistemaBolas(1, 2000, 2000, gravidade=0.0, forca_quique=1.0, aceleracao_quique=1.0,
+                                   velocidade_maxima=1000.0)
+    sistema.adicionar(1000.0, 1000.0, 10.0, vx=5.0)
+    sistema.marcar_inicio_passo()
+    sistema.integrar()
+    bolas, t = physics.corrigir_tunelamento(sistema, [SimpleNamespace(x=0.0, y=0.0, raio=5.0, raio_inicio=5.0)], 10)
+    assert bolas.size == 0 and t.size == 0
+
+
+def test_avancar_restante_perto_da_borda():
+    """Uma bola que quica no contorno perto da borda não termina o passo fora da tela"""
+    sistema = physics.SistemaBolas(1, 1000, 1000, gravidade=0.0, forca_quique=1.0, aceleracao_quique=1.0,
+                                   velocidade_maxima=10000.0)
+    sistema.adicionar(20.0, 500.0, 10.0, vx=250.0)
+    contorno = SimpleNamespace(x=100.0, y=500.0, raio=100.0, raio_inicio=100.0)
+    sistema.atualizar()
+
+    bolas, t = physics.corrigir_tunelamento(sistema, [contorno], 10)
+    assert sistema.x[0] == pytest.approx(190.0)
+    # Quique no contorno com aceleração forte: o restante do passo passaria da borda esquerda
+    sistema.vx[0] = -5000.0
+    physics.avancar_restante(sistema, bolas, t)
+    assert sistema.x[0] == 10.0
+    assert sistema.vx[0] == 5000.0
+    assert sistema.quiques[0] == 1
+
+
+def test_colisao_bordas_selecionadas_indo_para_dentro():
+    """No teste das bolas selecionadas, uma bola na borda que já volta para dentro não quica de novo"""
+    sistema = physics.SistemaBolas(2, 1000, 1000, gravidade=0.0, forca_quique=1.0, aceleracao_quique=1.0,
+                                   velocidade_maxima=1000.0)
+    sistema.adicionar(5.0, 500.0, 10.0, vx=30.0)
+    sistema.adicionar(5.0, 500.0, 10.0, vx=-30.0)
+    sistema.colisao_bordas([0])
+    assert (sistema.x[0], sistema.vx[0]) == (5.0, 30.0)
+    assert (sistema.x[1], sistema.vx[1]) == (5.0, -30.0)  # Fora da seleção
@@ -0,0 +1,150 @@
+"""Testes da gravação e da leitura de replays"""
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pygame
+import pytest
+
+import replay
+from ring_pool import PoolContornos
+
+
+def test_float32_piso_nunca_arredonda_para_cima():
+    valores = np.random.default_rng(0).uniform(-2000, 2000, 10000)
+    convertidos = replay.float32_piso(valores)
+    assert convertidos.dtype == np.float32
+    assert (convertidos.astype(np.float64) <= valores).all()
+    # É o maior float32 que não passa do valor
+    assert (np.nextafter(convertidos, np.float32(np.inf)).astype(np.float64) > valores).all()
+    assert (np.floor(convertidos) == np.floor(valores)).all()
+
+
+def test_float32_piso_escalar_igual_ao_array():
+    valores = [0.1, 99.99999999, 100.0, -0.30000001, 853.9999999999, 1e-9]
+    esperado = replay.float32_piso(valores)
+    for valor, convertido in zip(valores, esperado):
+        assert replay.float32_piso_escalar(valor) == convertido
+
+
+def _jogo_teste():
+    return SimpleNamespace(__file__="/jogos/jogo_teste.py", LARGURA=480, ALTURA=854,
+                           COR_FUNDO=(10, 20, 30), PASTA_PROJETO="/maquina/da/gravacao")
+
+
+def test_gravar_e_ler(tmp_path):
+    caminho = str(tmp_path / "partida.npy")
+    bolas = [SimpleNamespace(x=10.7, y=20.2, cor=(255, 0, 0)), SimpleNamespace(x=300.0, y=400.9, cor=(0, 0, 255))]
+    pool = PoolContornos(4, raio_minimo=5, velocidade_diminuicao=1.0)
+    pool.criar(240.5, 427.25, 150.9, cor=(1, 2, 3))
+    destruido = pool.criar(240.0, 427.0, 90.0, cor=(4, 5, 6), tipo=0)
+    destruido.destruir()
+
+    gravador = replay.GravadorReplay(caminho, _jogo_teste(), bolas, pool, campos=("tempo",),
+                                     metadados={"nomes": ["A", "B"]})
+    posicoes = []
+    for frame in range(3):
+        bolas[0].x += 7.3
+        bolas[1].y -= 3.1
+        posicoes.append([(bola.x, bola.y) for bola in bolas])
+        gravador.gravar(tempo=frame / 60)
+    gravador.marcar_tela("fim", vencedor=1)
+    gravador.fechar()
+
+    lido = replay.Replay(caminho)
+    assert len(lido) == 3
+    assert lido.jogo == "jogo_teste"
+    assert lido.metadados["nomes"] == ["A", "B"]
+    assert lido.metadados["constantes"]["COR_FUNDO"] == [10, 20, 30]
+    assert "PASTA_PROJETO" not in lido.metadados["constantes"]  # Caminho absoluto da gravação
+    assert lido.telas() == {3: [{"frame": 3, "tipo": "fim", "vencedor": 1}]}
+
+    copias = [SimpleNamespace(x=0.0, y=0.0, cor=None) for _ in bolas]
+    for frame in range(3):
+        lido.restaurar_bolas(frame, copias)
+        # Os jogos desenham com int(): o valor gravado dá o mesmo pixel
+        assert [(int(bola.x), int(bola.y)) for bola in copias] == [(int(x), int(y)) for x, y in posicoes[frame]]
+        assert lido.campo(frame, "tempo") == pytest.approx(frame / 60)
+    assert [bola.cor for bola in copias] == [(255, 0, 0), (0, 0, 255)]
+
+    restaurado = PoolContornos(4, raio_minimo=5, velocidade_diminuicao=1.0)
+    lido.restaurar_contornos(2, restaurado)
+    assert list(restaurado.ativo) == list(pool.ativo)
+    assert list(restaurado.destruido) == list(pool.destruido)
+    assert int(restaurado.raio[0]) == 150
+    assert restaurado.contornos[1].cor == (4, 5, 6)
+
+
+def test_versao_nao_suportada(tmp_path):
+    caminho = str(tmp_path / "partida.npy")
+    gravador = replay.GravadorReplay(caminho, _jogo_teste(), [SimpleNamespace(x=1.0, y=2.0, cor=(0, 0, 0))])
+    gravador.gravar()
+    gravador.fechar()
+    with open(replay.caminho_metadados(caminho), "r+", encoding="utf-8") as arquivo:
+        metadados = json.load(arquivo)
+        metadados["versao"] = replay.VERSAO + 1
+        arquivo.seek(0)
+        arquivo.truncate()
+        json.dump(metadados, arquivo)
+    with pytest.raises(ValueError):
+        replay.Replay(caminho)
+
+
+def test_buffer_circular_sobrescreve_os_mais_antigos():
+    bola = SimpleNamespace(x=0.0, y=0.0, cor=(9, 8, 7))
+    buffer = replay.BufferCircular(3, [bola], campos=("placar",))
+    for frame in range(5):
+        bola.x = 10.0 * frame
+        buffer.gravar(placar=frame)
+
+    assert buffer.quantidade == 5
+    assert buffer.primeiro_disponivel() == 2
+    assert [buffer.campo(frame, "placar") for frame in range(2, 5)] == [2.0, 3.0, 4.0]
+
+    copia = SimpleNamespace(x=None, y=None, cor=None)
+    buffer.restaurar_bolas(3, [copia])
+    assert (copia.x, copia.cor) == (30.0, (9, 8, 7))
+    buffer.restaurar_bolas(3, [copia], fracao=0.5)  # Interpola em direção ao frame 4
+    assert copia.x == 35.0
+
+
+@pytest.mark.parametrize("frame", [0, 1, 5])
+def test_buffer_circular_fora_do_buffer(frame):
+    bola = SimpleNamespace(x=0.0, y=0.0, cor=(0, 0, 0))
+    buffer = replay.BufferCircular(3, [bola])
+    for _ in range(5):
+        buffer.gravar()
+    with pytest.raises(IndexError):
+        buffer.restaurar_bolas(frame, [bola])
+
+
+def test_buffer_circular_antes_de_encher():
+    bola = SimpleNamespace(x=1.5, y=2.5, cor=(0, 0, 0))
+    buffer = replay.BufferCircular(10, [bola])
+    buffer.gravar()
+    assert buffer.primeiro_disponivel() == 0
+    with pytest.raises(IndexError):
+        buffer.restaurar_bolas(1, [bola])
+
+
+@pytest.mark.parametrize("tamanho", [(108, 192), (24, 40), (100, 85)])
+def test_redimensionado_com_retangulos_igual_ao_frame_inteiro(tmp_path, tamanho):
+    """Converter só os retângulos alterados (redimensionados) dá o mesmo frame que converter tudo"""
+    gerador = np.random.default_rng(1)
+    tela = pygame.Surface((48, 85))
+    pygame.surfarray.blit_array(tela, gerador.integers(0, 256, (48, 85, 3), dtype=np.uint8))
+
+    parcial = replay.DestinoVideoRedimensionado(str(tmp_path / "parcial.avi"), *tamanho, fps_video=60, fps_jogo=60)
+    inteiro = replay.DestinoVideoRedimensionado(str(tmp_path / "inteiro.avi"), *tamanho, fps_video=60, fps_jogo=60)
+    try:
+        parcial.enviar(tela)
+        retangulos = [pygame.Rect(5, 7, 10, 4), pygame.Rect(30, 60, 3, 20)]
+        for retangulo in retangulos:
+            tela.fill((255, 0, 128), retangulo)
+        parcial.enviar(tela, retangulos)
+        inteiro.enviar(tela)
+        assert (parcial.buffer == inteiro.buffer).all()
+    finally:
+        parcial.fechar()
+        inteiro.fechar()
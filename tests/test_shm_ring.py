@@ -0,0 +1,46 @@
+"""Testes do anel de frames em memória compartilhada"""
+
+import pytest
+
+from shm_ring import AnelEncerrado, AnelFrames
+
+
+@pytest.fixture
+def aneis():
+    gravador = AnelFrames.criar(slots=2, altura=4, largura=3)
+    jogo = AnelFrames.conectar(gravador.nome)
+    yield gravador, jogo
+    jogo.fechar()
+    gravador.fechar()
+
+
+def test_frames_em_ordem(aneis):
+    gravador, jogo = aneis
+    for valor in (1, 2, 3):
+        jogo.reservar()[:] = valor
+        jogo.publicar()
+        sequencia, frame = gravador.proximo(timeout=1)
+        assert frame[0, 0, 0] == valor
+        assert sequencia == valor - 1
+        gravador.liberar()
+    jogo.finalizar()
+    assert gravador.proximo() is None
+
+
+def test_reservar_anel_encerrado(aneis):
+    gravador, jogo = aneis
+    for _ in range(2):
+        jogo.reservar()
+        jogo.publicar()
+    gravador.encerrar()
+    with pytest.raises(AnelEncerrado):
+        jogo.reservar()
+
+
+def test_reservar_timeout(aneis):
+    _, jogo = aneis
+    for _ in range(2):
+        jogo.reservar()
+        jogo.publicar()
+    with pytest.raises(TimeoutError):
+        jogo.reservar(timeout=0.01)
@@ -0,0 +1,66 @@
+"""Testes do simulate(seed, params) dos jogos (linha do tempo sem desenho)"""
+
+import pytest
+
+import ball_circles
+import img_coliseum
+import render_mode
+import simulation
+import two_balls_circles
+
+
+@pytest.mark.parametrize("jogo", [ball_circles, two_balls_circles, img_coliseum])
+def test_simulate_deterministico(jogo):
+    """A mesma semente gera a mesma linha do tempo, evento a evento"""
+    primeira = jogo.simulate(5)
+    segunda = jogo.simulate(5)
+    assert primeira.frames == segunda.frames
+    assert primeira.eventos == segunda.eventos
+    assert primeira.resultado == segunda.resultado
+
+
+def test_simulate_sementes_diferentes():
+    """Sementes diferentes mudam a partida"""
+    assert two_balls_circles.simulate(1).eventos != two_balls_circles.simulate(2).eventos
+
+
+def test_simulate_params():
+    """Os params sobrescrevem as constantes (inclusive as sorteadas) só durante a simulação"""
+    duracao = two_balls_circles.GAME_DURATION
+    linha = two_balls_circles.simulate(0, {"ESPESSURA_CONTORNO": 9, "GAME_DURATION": 2})
+    assert linha.resultado["espessura_contorno"] == 9
+    assert linha.frames == 2 * render_mode.FPS_JOGO
+    assert two_balls_circles.GAME_DURATION == duracao
+
+
+def test_params_desconhecido():
+    with pytest.raises(KeyError):
+        with simulation.parametros_jogo(two_balls_circles, {"NAO_EXISTE": 1}):
+            pass
+
+
+def test_quiques_incompativeis_registrados():
+    """Quiques em contornos de outra cor aparecem na linha do tempo (não só as destruições)"""
+    linha = two_balls_circles.simulate(0)
+    quiques = linha.do_tipo("quique_incompativel")
+    assert len(quiques) > 0
+    assert linha.resultado["quiques_incompativeis"] == len(quiques)
+    # Quique incompatível: a cor da bola é diferente da do contorno, então ele não é destruído
+    destruidos = {evento.entidades[1] for evento in linha.do_tipo("contorno_destruido")}
+    criados = {evento.entidades[1]: evento.entidades[0] for evento in linha.do_tipo("contorno_criado")}
+    for evento in quiques:
+        tipo_bola, ordem = evento.entidades
+        assert criados[ordem] != tipo_bola
+    assert destruidos
+
+
+@pytest.mark.parametrize("jogo", [ball_circles, two_balls_circles])
+@pytest.mark.parametrize("parametros", [
+    {"QUANTIDADE_CONTORNOS_SIMULTANEOS": 60, "INTERVALO_CRIACAO": 1},
+    {"QUANTIDADE_CONTORNOS_SIMULTANEOS": 2, "INTERVALO_CRIACAO": 1},
+])
+def test_simulate_mais_contornos(jogo, parametros):
+    """O pool de contornos é dimensionado pelas constantes trocadas, não pelas padrão"""
+    linha = jogo.simulate(1, {**parametros, "GAME_DURATION": 5})
+    assert linha.contar("contorno_criado") > 0
+    assert jogo.QUANTIDADE_CONTORNOS_SIMULTANEOS != parametros["QUANTIDADE_CONTORNOS_SIMULTANEOS"]
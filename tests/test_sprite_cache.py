@@ -0,0 +1,71 @@
+"""Testes do cache de sprites dos contornos em fade"""
+
+import numpy as np
+import pygame
+import pytest
+
+import sprite_cache
+
+
+def _bytes(raio):
+    lado = raio * 2 + sprite_cache.MARGEM * 2
+    return lado * lado * 4
+
+
+def test_descarte_lru():
+    cache = sprite_cache.CacheSprites(limite_bytes=2 * _bytes(10))
+    vermelho, _, _ = cache.anel(10, 2, (255, 0, 0))
+    cache.anel(10, 2, (0, 255, 0))
+    assert cache.anel(10, 2, (255, 0, 0))[0] is vermelho  # Vermelho passa a ser o mais recente
+    cache.anel(10, 2, (0, 0, 255))                         # Descarta o verde
+
+    assert list(cache.sprites) == [(10, 2, (255, 0, 0)), (10, 2, (0, 0, 255))]
+    assert cache.bytes == 2 * _bytes(10)
+    assert (cache.criados, cache.acertos) == (3, 1)
+
+
+def test_sprite_maior_que_o_limite_fica_sozinho():
+    cache = sprite_cache.CacheSprites(limite_bytes=_bytes(10))
+    cache.anel(10, 2, (255, 255, 255))
+    grande, _, _ = cache.anel(50, 2, (255, 255, 255))
+    assert list(cache.sprites) == [(50, 2, (255, 255, 255))]
+    assert cache.anel(50, 2, (255, 255, 255))[0] is grande
+
+
+def test_quantizacao_raio():
+    cache = sprite_cache.CacheSprites(quantizacao_raio=4)
+    sprite, _, raio = cache.anel(41.9, 3, (255, 255, 255))
+    assert raio == 40
+    assert cache.anel(43, 3, (255, 255, 255))[0] is sprite
+    assert cache.anel(44, 3, (255, 255, 255))[0] is not sprite
+
+
+def test_faixas_iguais_ao_blit_inteiro():
+    cache = sprite_cache.CacheSprites()
+    faixas_tela = pygame.Surface((200, 200))
+    inteira = pygame.Surface((200, 200))
+    for tela in (faixas_tela, inteira):
+        tela.fill((30, 60, 90))
+    cache.desenhar_anel(faixas_tela, 100.7, 99.2, 70, 5, (250, 200, 10), 120)
+    sprite, _, _ = cache.anel(70, 5, (250, 200, 10))
+    sprite.set_alpha(120)
+    inteira.blit(sprite, (100 - 70 - sprite_cache.MARGEM, 99 - 70 - sprite_cache.MARGEM))
+    assert pygame.image.tobytes(faixas_tela, "RGB") == pygame.image.tobytes(inteira, "RGB")
+
+
+def _centro_dos_pixels(tela, fundo):
+    """Centro da caixa dos pixels diferentes do fundo"""
+    pixels = pygame.surfarray.array3d(tela)
+    xs, ys = np.nonzero((pixels != fundo).any(axis=2))
+    return (xs.min() + xs.max()) / 2, (ys.min() + ys.max()) / 2
+
+
+@pytest.mark.parametrize("quantizacao, raio", [(1, 60.8), (8, 61.0), (8, 67.9)])
+def test_anel_centrado_como_o_contorno_vivo(quantizacao, raio):
+    """O anel em fade fica no mesmo centro do pygame.draw.circle do contorno vivo"""
+    cache = sprite_cache.CacheSprites(quantizacao_raio=quantizacao)
+    em_fade = pygame.Surface((300, 300))
+    vivo = pygame.Surface((300, 300))
+    cache.desenhar_anel(em_fade, 150.6, 140.3, raio, 4, (255, 255, 255), 255)
+    pygame.draw.circle(vivo, (255, 255, 255), (150, 140), int(raio), 4)
+    assert _centro_dos_pixels(em_fade, 0) == _centro_dos_pixels(vivo, 0)
@@ -0,0 +1,59 @@
+"""Testes da varredura de parâmetros (grade, leitura de --param e tarefas do pool)"""
+
+import importlib
+
+import pytest
+
+import sweep
+
+
+def test_ler_parametro():
+    assert sweep.ler_parametro("GRAVIDADE=0.5,0.7") == ("GRAVIDADE", [0.5, 0.7])
+    assert sweep.ler_parametro(" NOME =1") == ("NOME", [1])
+    assert sweep.ler_parametro("DISTRIBUICAO_PONTOS=[0,1],[2]") == ("DISTRIBUICAO_PONTOS", [[0, 1], [2]])
+    assert sweep.ler_parametro("COR='azul',\"vermelho\"") == ("COR", ["azul", "vermelho"])
+
+
+@pytest.mark.parametrize("texto", ["GRAVIDADE", "GRAVIDADE=", "GRAVIDADE=abc", "GRAVIDADE=1,,2"])
+def test_ler_parametro_invalido(texto):
+    with pytest.raises(ValueError):
+        sweep.ler_parametro(texto)
+
+
+def test_montar_grade():
+    grade = sweep.montar_grade([("A", [1, 2]), ("B", ["x", "y", "z"])])
+    assert len(grade) == 6
+    assert grade[0] == {"A": 1, "B": "x"}
+    assert grade[-1] == {"A": 2, "B": "z"}
+    assert sweep.montar_grade([]) == [{}]
+
+
+def test_colisoes_incluem_quiques_incompativeis():
+    """colisoes conta as batidas nos contornos, não só os destruídos"""
+    _, metricas, erros = sweep.simular_tarefa("two_balls_circles", 0, {}, [0])
+    assert erros == []
+    assert metricas[0]["colisoes"] == metricas[0]["contornos_destruidos"] + metricas[0]["quiques_incompativeis"]
+    assert metricas[0]["quiques_incompativeis"] > 0
+
+
+def test_simular_tarefa_erro_por_semente():
+    """Uma configuração que falha registra o erro de cada semente, sem exceção"""
+    indice, metricas, erros = sweep.simular_tarefa("two_balls_circles", 3, {"GAME_DURATION": "x"}, [0, 1])
+    assert indice == 3
+    assert metricas == []
+    assert [semente for semente, _ in erros] == [0, 1]
+    assert erros[0][1].startswith("TypeError")
+
+
+def test_agregar():
+    agregado = sweep.agregar([{"colisoes_s": 1.0, "duracao_s": 10.0}, {"colisoes_s": 3.0, "duracao_s": 20.0}])
+    assert agregado["partidas"] == 2
+    assert agregado["duracao_s"] == 15.0
+    assert agregado["colisoes_s"] == 2.0
+    assert agregado["colisoes_s_desvio"] == 1.0
+
+
+def test_colunas_metricas():
+    modulo = importlib.import_module("img_coliseum")
+    colunas = sweep.colunas_metricas(modulo, {}, 0)
+    assert {"partidas", "colisoes_s", "colisoes_s_desvio", "taxa_empate"} <= set(colunas)
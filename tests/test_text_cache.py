@@ -0,0 +1,52 @@
+"""Testes do cache de fontes e textos"""
+
+import pygame
+import pytest
+
+import text_cache
+
+
+@pytest.fixture
+def pygame_iniciado():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def test_descarte_lru(pygame_iniciado):
+    cache = text_cache.CacheTextos(limite=2)
+    a = cache.renderizar("a", 20, (255, 255, 255))
+    cache.renderizar("b", 20, (255, 255, 255))
+    assert cache.renderizar("a", 20, (255, 255, 255)) is a  # "a" passa a ser o mais recente
+    cache.renderizar("c", 20, (255, 255, 255))              # descarta "b"
+    assert cache.renderizar("a", 20, (255, 255, 255)) is a
+    assert cache.acertos == 2
+    assert cache.renderizados == 3
+    cache.renderizar("b", 20, (255, 255, 255))
+    assert cache.renderizados == 4
+    assert len(cache.textos) == 2
+
+
+def test_chave_inclui_cor_e_tamanho(pygame_iniciado):
+    cache = text_cache.CacheTextos()
+    branco = cache.renderizar("1:00", 20, (255, 255, 255))
+    assert cache.renderizar("1:00", 20, [255, 255, 255]) is branco
+    assert cache.renderizar("1:00", 20, (255, 0, 0)) is not branco
+    assert cache.renderizar("1:00", 30, (255, 255, 255)).get_height() > branco.get_height()
+
+
+def test_reinicio_do_pygame():
+    """Fontes e textos de antes do pygame.quit() não são reutilizados depois do novo init"""
+    pygame.init()
+    fonte = text_cache.fonte(24)
+    text_cache.renderizar("fim", 24, (255, 255, 255))
+    pygame.quit()
+    assert not text_cache._fontes and not text_cache.TEXTOS.textos
+
+    pygame.init()
+    try:
+        assert text_cache.fonte(24) is not fonte
+        assert text_cache.renderizar("fim", 24, (255, 255, 255)).get_width() > 0
+    finally:
+        pygame.quit()
+    assert not text_cache._fontes